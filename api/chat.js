@@ -635,9 +635,15 @@ async function executeTool(req, toolName, args) {
     case 'calculate_equipment_cost':
     case 'get_historical_unit_prices':
     case 'lookup_heavybid_crew':
+    case 'get_crew_cost':
+    case 'price_with_crew':
     case 'estimate_from_bid_history':
     case 'load_rate_library':
     case 'get_production_benchmark':
+    case 'trench_volume_batch':
+    case 'thrust_block_batch':
+    case 'asphalt_tonnage_batch':
+    case 'concrete_volume_batch':
       return callPythonTool(req, normalized, args);
     default:
       throw new Error(`Tool '${toolName}' is not supported`);
@@ -10,6 +10,7 @@ from http.server import BaseHTTPRequestHandler
 ROOT = os.path.join(os.path.dirname(__file__), '..', '..')
 sys.path.insert(0, ROOT)
 
+from tools.schedule.production import production_schedule  # noqa: E402
 from tools.schedule.schedule_tools import build_schedule, parse_phases  # noqa: E402
 
 
@@ -44,12 +45,30 @@ class handler(BaseHTTPRequestHandler):
             else:
                 phases = parse_phases(phases_input)
 
-            result = build_schedule(
-                project_name=project_name,
-                duration_days=duration_days,
-                start_date=start_date or None,
-                phases=phases or None,
-            )
+            if body.get('bid_items'):
+                # Durations from bid-history production rates, then CPM
+                result = production_schedule(
+                    project_name,
+                    body['bid_items'],
+                    start_date=start_date or None,
+                    workdays=body.get('workdays') or None,
+                    holidays=body.get('holidays') or None,
+                    crew_size=int(body.get('crew_size', 4)),
+                    hours_per_day=float(body.get('hours_per_day', 10)),
+                )
+            else:
+                result = build_schedule(
+                    project_name=project_name,
+                    duration_days=duration_days,
+                    start_date=start_date or None,
+                    phases=phases or None,
+                    activities=body.get('activities') or None,  # CPM network; see tools/schedule/cpm.py
+                    workdays=body.get('workdays') or None,
+                    holidays=body.get('holidays') or None,
+                    capacities=body.get('capacities') or None,  # resource leveling; see tools/schedule/leveling.py
+                    priority=body.get('priority') or 'lft',
+                    resource_costs=body.get('resource_costs') or None,
+                )
             self._json(200, result)
 
         except Exception as exc:
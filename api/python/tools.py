@@ -24,13 +24,23 @@ from tools.estimating.estimating_tools import (  # noqa: E402
     estimate_project_cost,
     estimate_from_bid_history,
     get_historical_unit_prices,
+    get_crew_cost,
     get_production_benchmark,
     load_rate_library,
     lookup_heavybid_crew,
+    price_with_crew,
 )
+from tools.field.trench import quantity_table  # noqa: E402
 
 API_VERSION = "1.0"
 
+BATCH_QUANTITY_TOOLS = {
+    'trench_volume_batch': 'trench_volume',
+    'thrust_block_batch': 'thrust_block',
+    'asphalt_tonnage_batch': 'asphalt_tonnage',
+    'concrete_volume_batch': 'concrete_volume',
+}
+
 
 def _cors(h):
     h.send_header('Access-Control-Allow-Origin', '*')
@@ -97,6 +107,25 @@ def _run_tool(tool_name, args):
             limit=int(args.get('limit', 10)),
         )
 
+    if tool_name == 'get_crew_cost':
+        return get_crew_cost(
+            crew_code=args.get('crew_code', ''),
+            estimate_code=args.get('estimate_code', ''),
+            region=args.get('region', ''),
+            hours_per_day=float(args.get('hours_per_day', 10)),
+        )
+
+    if tool_name == 'price_with_crew':
+        return price_with_crew(
+            crew_code=args.get('crew_code', ''),
+            production_rate_per_day=float(args.get('production_rate_per_day', 0)),
+            total_quantity=float(args.get('total_quantity', 0)),
+            unit=args.get('unit', 'LF'),
+            estimate_code=args.get('estimate_code', ''),
+            region=args.get('region', ''),
+            hours_per_day=float(args.get('hours_per_day', 10)),
+        )
+
     if tool_name == 'estimate_from_bid_history':
         return estimate_from_bid_history(
             description=args.get('description', ''),
@@ -116,6 +145,14 @@ def _run_tool(tool_name, args):
             limit=int(args.get('limit', 5)),
         )
 
+    if tool_name in BATCH_QUANTITY_TOOLS:
+        return quantity_table(
+            BATCH_QUANTITY_TOOLS[tool_name],
+            columns=args.get('columns'),
+            rows=args.get('rows'),
+            csv_text=args.get('csv'),
+        )
+
     raise ValueError(f"Unsupported tool '{tool_name}'")
 
 
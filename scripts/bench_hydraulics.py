@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Compare the batch Manning's functions against a loop over the scalar ones.
+
+Usage: python scripts/bench_hydraulics.py [segments] [slopes_per_segment]
+"""
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from tools.field.hydraulics import (  # noqa: E402
+    flow_to_slope,
+    flow_to_slope_batch,
+    pipe_flow_full,
+    pipe_flow_full_batch,
+    pipe_flow_partial,
+    pipe_flow_partial_batch,
+)
+from tools.field.pipe_sizing import size_pipe_batch  # noqa: E402
+from tools.field.sewer_network import analyze_sewer_network  # noqa: E402
+
+STANDARD_DIAMETERS = [8, 10, 12, 15, 18, 21, 24, 30, 36]
+
+
+def build_plan(segments, slopes_per_segment):
+    rng = random.Random(42)
+    diameters, slopes, ratios, flows = [], [], [], []
+    for _ in range(segments):
+        diameter = rng.choice(STANDARD_DIAMETERS)
+        for _ in range(slopes_per_segment):
+            diameters.append(diameter)
+            slopes.append(rng.uniform(0.002, 0.02))
+            ratios.append(rng.uniform(0.2, 0.95))
+            flows.append(rng.uniform(50, 3000))
+    return diameters, slopes, ratios, flows
+
+
+def build_network(segments):
+    """Random tree draining to one outfall, with positive slopes on every segment."""
+    rng = random.Random(7)
+    manholes = [{"id": "OUT"}]
+    inverts = {"OUT": 100.0}
+    pipes = []
+    for index in range(segments):
+        parent = rng.choice(manholes)["id"]
+        node = f"MH{index}"
+        length = rng.uniform(150, 400)
+        inverts[node] = inverts[parent] + length * rng.uniform(0.004, 0.02)
+        manholes.append({"id": node, "inflow_gpm": rng.uniform(1, 20)})
+        pipes.append({
+            "id": f"P{index}", "upstream": node, "downstream": parent,
+            "diameter_in": rng.choice(STANDARD_DIAMETERS), "length_ft": length,
+            "upstream_invert": inverts[node], "downstream_invert": inverts[parent], "material": "pvc",
+        })
+    return manholes, pipes
+
+
+def best_of(fn, repeat=5):
+    return min(timeit.repeat(fn, number=1, repeat=repeat))
+
+
+def main():
+    segments = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    slopes_per_segment = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    diameters, slopes, ratios, flows = build_plan(segments, slopes_per_segment)
+    cases = [
+        (
+            "pipe_flow_full",
+            lambda: [pipe_flow_full(d, s) for d, s in zip(diameters, slopes)],
+            lambda: pipe_flow_full_batch(diameters, slopes),
+        ),
+        (
+            "pipe_flow_partial",
+            lambda: [pipe_flow_partial(d, s, r) for d, s, r in zip(diameters, slopes, ratios)],
+            lambda: pipe_flow_partial_batch(diameters, slopes, ratios),
+        ),
+        (
+            "partial (table)",
+            lambda: [pipe_flow_partial(d, s, r) for d, s, r in zip(diameters, slopes, ratios)],
+            lambda: pipe_flow_partial_batch(diameters, slopes, ratios, use_table=True),
+        ),
+        (
+            "flow_to_slope",
+            lambda: [flow_to_slope(d, q, 0.013, r) for d, q, r in zip(diameters, flows, ratios)],
+            lambda: flow_to_slope_batch(diameters, flows, 0.013, ratios),
+        ),
+    ]
+    print(f"{len(diameters)} pipe evaluations ({segments} segments x {slopes_per_segment} slopes)")
+    for name, scalar, batch in cases:
+        scalar_s = best_of(scalar)
+        batch_s = best_of(batch)
+        print(f"  {name:<18} scalar loop {scalar_s * 1000:8.1f} ms   batch {batch_s * 1000:8.1f} ms   "
+              f"x{scalar_s / batch_s:.1f}")
+
+    manholes, pipes = build_network(segments * 10)
+    network_s = best_of(lambda: analyze_sewer_network(manholes, pipes), repeat=1)
+    print(f"  sewer network      {len(pipes)} segments analyzed in {network_s:.2f} s")
+
+    flows = analyze_sewer_network(manholes, pipes)["segments"]
+    design = [
+        {"id": seg_id, "flow_gpm": flow, "length_ft": pipe["length_ft"]}
+        for seg_id, flow, pipe in zip(flows["id"], flows["flow_gpm"], pipes)
+    ][:segments]
+    sizing_s = best_of(lambda: size_pipe_batch(design, min_diameter_in=8), repeat=1)
+    print(f"  pipe sizing        {len(design)} segments sized in {sizing_s:.2f} s "
+          f"({sizing_s / len(design) * 1000:.2f} ms/segment)")
+
+
+if __name__ == "__main__":
+    main()
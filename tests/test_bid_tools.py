@@ -7,6 +7,7 @@ from tools.calculations.bid_tools import (
     change_order_tm,
     production_rate,
     crew_day_cost,
+    bid_sensitivity,
 )
 
 
@@ -129,3 +130,66 @@ class TestCrewDayCost:
             overhead_burden_pct=0,
         )
         assert abs(result["total_day_cost"] - 800) < 0.01
+
+
+ITEMS = [
+    {"material_per_unit": 40, "labor_per_unit": 18, "equipment_per_unit": 12, "quantity": 1200},
+    {"material_per_unit": 2500, "labor_per_unit": 900, "equipment_per_unit": 400, "quantity": 6},
+    {"direct_cost": 30000, "material_cost": 10000},
+]
+
+
+class TestBidSensitivity:
+    def test_default_grid_shape(self):
+        result = bid_sensitivity(ITEMS)
+        assert result["shape"] == [11, 11, 1]
+        assert len(result["grid"]["bid_total"]) == 121
+        assert result["overhead_pct"][0] == 8 and result["overhead_pct"][-1] == 18
+
+    def test_grid_point_matches_markup_bid_price(self):
+        result = bid_sensitivity(ITEMS, overhead_pct=[12], profit_pct=[10])
+        single = markup_bid_price(result["direct_cost"], overhead_pct=12, profit_pct=10)
+        assert round(result["grid"]["bid_total"][0], 2) == single["bid_price"]
+        assert result["grid"]["margin_on_bid_pct"][0] == single["margin_on_bid_pct"]
+
+    def test_total_matches_unit_price_extensions(self):
+        result = bid_sensitivity(ITEMS[:2], overhead_pct=10, profit_pct=8)
+        extended = sum(unit_price(i["material_per_unit"], i["labor_per_unit"], i["equipment_per_unit"],
+                                  overhead_pct=10, profit_pct=8, quantity=i["quantity"])["extended_total"]
+                       for i in ITEMS[:2])
+        assert result["grid"]["bid_total"][0] == pytest.approx(extended, abs=0.05)
+
+    def test_escalation_raises_material_only(self):
+        result = bid_sensitivity(ITEMS, overhead_pct=0, profit_pct=0, escalation_pct=[0, 10])
+        low, high = result["grid"]["bid_total"]
+        assert high - low == pytest.approx(result["material_cost"] * 0.10)
+
+    def test_range_spec(self):
+        result = bid_sensitivity(ITEMS, escalation_pct={"start": 0, "stop": 6, "step": 0.5})
+        assert result["escalation_pct"] == [i * 0.5 for i in range(13)]
+        assert len(result["grid"]["bid_total"]) == 11 * 11 * 13
+
+    def test_range_spec_never_passes_stop(self):
+        result = bid_sensitivity(ITEMS, escalation_pct={"start": 0, "stop": 1.3, "step": 0.5})
+        assert result["escalation_pct"] == [0.0, 0.5, 1.0]
+        result = bid_sensitivity(ITEMS, escalation_pct={"start": 0, "stop": 0.3, "step": 0.1})
+        assert result["escalation_pct"] == [0.0, 0.1, 0.2, 0.3]
+
+    def test_break_even_and_target_contours(self):
+        base = bid_sensitivity(ITEMS, overhead_pct=12, profit_pct=10)
+        reference = base["grid"]["bid_total"][0]
+        result = bid_sensitivity(ITEMS, overhead_pct=[10, 12], profit_pct=10, escalation_pct=[0, 5],
+                                 reference_bid=reference, target_margin_pct=5)
+        for point, target in zip(result["break_even"], result["target_margin"]):
+            escalated = result["direct_cost"] + result["material_cost"] * point["escalation_pct"] / 100
+            assert escalated * (1 + point["overhead_pct"] / 100) == pytest.approx(reference, rel=1e-5)
+            assert target["escalation_pct"] < point["escalation_pct"]
+        assert 0 < result["under_reference_count"] < 4
+
+    def test_invalid_inputs_raise(self):
+        with pytest.raises(ValueError):
+            bid_sensitivity([])
+        with pytest.raises(ValueError):
+            bid_sensitivity(ITEMS, target_margin_pct=5)
+        with pytest.raises(ValueError):
+            bid_sensitivity(ITEMS, overhead_pct={"start": 10, "stop": 5})
@@ -0,0 +1,103 @@
+"""Tests for the append-only change-order ledger."""
+import json
+
+import pytest
+
+from tools.calculations import change_orders
+from tools.calculations.bid_tools import change_order_tm
+from tools.calculations.change_orders import (
+    change_order_total,
+    ledger_summary,
+    record_change_order,
+    record_tm_tickets,
+)
+
+OPERATOR = {"description": "Operator", "hours": 8, "rate": 95}
+LABORER = {"description": "Laborer", "hours": 8, "rate": 55}
+EXCAVATOR = {"description": "Excavator", "hours": 8, "rate": 120}
+
+
+def _ticket(co, day, ticket_id=None, material=0):
+    return {"co_number": co, "date": day, "ticket_id": ticket_id, "labor_items": [OPERATOR, LABORER],
+            "equipment_items": [EXCAVATOR], "material_cost": material}
+
+
+@pytest.fixture
+def ledger(tmp_path, monkeypatch):
+    monkeypatch.setattr(change_orders, "_LEDGERS", {})
+    path = tmp_path / "co-ledger.jsonl"
+    record_change_order(path, "CO-001", "Extra manhole", overhead_profit_pct=15, bond_pct=1)
+    record_change_order(path, "CO-002", "Utility conflict", overhead_profit_pct=10, bond_pct=0)
+    record_tm_tickets(path, [
+        _ticket("CO-001", "2026-03-02", "T1", material=500),
+        _ticket("CO-001", "2026-03-03", "T2"),
+        _ticket("CO-002", "2026-03-03", "T3", material=200),
+    ])
+    return path
+
+
+class TestChangeOrderLedger:
+    def test_total_matches_change_order_tm(self, ledger):
+        total = change_order_total(ledger, "CO-001")
+        expected = change_order_tm([OPERATOR, LABORER] * 2, [EXCAVATOR] * 2, material_cost=500,
+                                   overhead_profit_pct=15, bond_pct=1)
+        for key in ("labor_total", "equipment_total", "subtotal", "overhead_profit", "bond", "change_order_total"):
+            assert total[key] == expected[key]
+        assert total["ticket_count"] == 2
+
+    def test_as_of_date(self, ledger):
+        first_day = change_order_total(ledger, "CO-001", as_of="2026-03-02")
+        assert first_day["ticket_count"] == 1
+        assert first_day["last_date"] == "2026-03-02"
+        assert first_day["change_order_total"] < change_order_total(ledger, "CO-001")["change_order_total"]
+        before = change_order_total(ledger, "CO-001", as_of="2026-03-01")
+        assert before["ticket_count"] == 0 and before["change_order_total"] == 0
+
+    def test_job_totals_sum_change_orders(self, ledger):
+        summary = ledger_summary(ledger)
+        assert summary["change_order_count"] == 2
+        assert summary["totals"]["ticket_count"] == 3
+        assert summary["totals"]["change_order_total"] == pytest.approx(
+            sum(row["change_order_total"] for row in summary["change_orders"]))
+        assert ledger_summary(ledger, as_of="2026-03-02")["totals"]["ticket_count"] == 1
+
+    def test_backdated_ticket_updates_running_totals(self, ledger):
+        change_order_total(ledger, "CO-001")
+        record_tm_tickets(ledger, [_ticket("CO-001", "2026-02-27", "T0")])
+        assert change_order_total(ledger, "CO-001", as_of="2026-02-28")["ticket_count"] == 1
+        assert change_order_total(ledger, "CO-001")["ticket_count"] == 3
+
+    def test_duplicate_ticket_ids_are_skipped(self, ledger):
+        tickets = [_ticket("CO-001", "2026-03-04", "T2"), _ticket("CO-001", "2026-03-04", "T4")]
+        result = record_tm_tickets(ledger, tickets)
+        assert result["appended"] == 1
+        assert result["duplicates"] == ["T2"]
+
+    def test_reads_only_appended_records(self, ledger, monkeypatch):
+        change_order_total(ledger, "CO-001")
+        folded = []
+        original = change_orders._apply
+        monkeypatch.setattr(change_orders, "_apply",
+                            lambda state, record: folded.append(record) or original(state, record))
+        with ledger.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps({"type": "ticket", "co_number": "CO-002", "date": "2026-03-05", "ticket_id": "X1",
+                                     "labor_cost": 100.0, "equipment_cost": 0.0, "material_cost": 0.0}) + "\n")
+        assert change_order_total(ledger, "CO-002")["labor_total"] == pytest.approx(8 * 95 + 8 * 55 + 100)
+        assert [record["ticket_id"] for record in folded] == ["X1"]
+
+    def test_new_process_rebuilds_from_file(self, ledger, monkeypatch):
+        before = ledger_summary(ledger)
+        monkeypatch.setattr(change_orders, "_LEDGERS", {})
+        assert ledger_summary(ledger) == before
+
+    def test_revised_header_and_status_filter(self, ledger):
+        record_change_order(ledger, "CO-002", "Utility conflict", overhead_profit_pct=10, bond_pct=0, status="approved")
+        approved = ledger_summary(ledger, status="approved")
+        assert [row["co_number"] for row in approved["change_orders"]] == ["CO-002"]
+
+    def test_invalid_inputs(self, ledger):
+        with pytest.raises(ValueError):
+            record_tm_tickets(ledger, [_ticket("CO-001", "03/04/2026")])
+        with pytest.raises(ValueError):
+            record_tm_tickets(ledger, [_ticket("", "2026-03-04")])
+        assert "error" in change_order_total(ledger, "CO-999")
@@ -0,0 +1,99 @@
+"""Tests for the cut/fill earthwork engine."""
+import pytest
+
+from tools.calculations.unit_converter import EARTHWORK
+from tools.field.earthwork import earthwork_volumes, grid_from_points, read_grid_rows
+
+
+def _plane(rows, columns, z):
+    return [[z(i, j) for j in range(columns)] for i in range(rows)]
+
+
+class TestEarthworkVolumes:
+    @pytest.mark.parametrize("method", ["grid", "end_area"])
+    def test_uniform_cut(self, method):
+        # 90 ft × 90 ft pad cut 2 ft = 16,200 CF = 600 BCY
+        result = earthwork_volumes(_plane(10, 10, lambda i, j: 102.0), 100.0, 10, method=method)
+        assert result["cut_bcy"] == 600.0
+        assert result["fill_ccy"] == 0.0
+        assert result["cut_lcy"] == pytest.approx(600 * EARTHWORK["lcy_25"])
+        assert result["export_lcy"] == pytest.approx(750.0)
+
+    @pytest.mark.parametrize("method", ["grid", "end_area"])
+    def test_sloped_plane_splits_at_daylight_line(self, method):
+        # Existing rises 0.1 ft/ft across a 100 ft × 100 ft area; design grade crosses it at x = 50
+        result = earthwork_volumes(_plane(11, 11, lambda i, j: 95 + j), 100.0, 10, method=method)
+        wedge = 0.5 * 50 * 5 * 100 / 27
+        assert result["cut_bcy"] == pytest.approx(wedge, abs=0.01)
+        assert result["fill_ccy"] == pytest.approx(wedge, abs=0.01)
+
+    def test_shrink_raises_bank_yards_needed(self):
+        rows = _plane(5, 5, lambda i, j: 98.0)
+        tight = earthwork_volumes(rows, 100.0, 10, shrink="ccy_20")
+        loose = earthwork_volumes(rows, 100.0, 10, shrink="ccy_10")
+        assert tight["fill_ccy"] == loose["fill_ccy"]
+        assert tight["fill_bcy_required"] > loose["fill_bcy_required"]
+        assert tight["import_bcy"] == tight["fill_bcy_required"]
+
+    def test_mass_haul_balances_between_cut_and_fill(self):
+        # Cut at the start of the alignment, fill at the end
+        rows = _plane(11, 3, lambda i, j: 100 + (5 - i) * 0.5)
+        result = earthwork_volumes(rows, 100.0, 10, shrink="ccy_15", start_station=1000)
+        haul = result["mass_haul"]
+        assert haul["station_ft"][0] == 1000 and haul["station_ft"][-1] == 1100
+        assert haul["ordinate_bcy"][0] == 0.0
+        assert result["max_ordinate_bcy"] > 0
+        assert len(result["balance_stations_ft"]) == 1
+        assert 1050 < result["balance_stations_ft"][0] < 1100
+        assert haul["ordinate_bcy"][-1] == pytest.approx(result["net_bcy"], abs=0.01)
+
+    def test_proposed_grid_and_missing_cells(self):
+        existing = _plane(3, 3, lambda i, j: 101.0)
+        proposed = _plane(3, 3, lambda i, j: 100.0)
+        full = earthwork_volumes(existing, proposed, 10)
+        existing[0][0] = None
+        holed = earthwork_volumes(existing, proposed, 10)
+        assert holed["cut_bcy"] == pytest.approx(full["cut_bcy"] * 3 / 4, abs=0.01)
+
+    def test_streams_rows_from_a_generator(self):
+        rows = ([101.0] * 50 for _ in range(200))
+        result = earthwork_volumes(rows, 100.0, 5, row_spacing_ft=2)
+        assert result["rows"] == 200
+        assert result["cut_bcy"] == pytest.approx(49 * 5 * 199 * 2 / 27, abs=0.01)
+
+    def test_invalid_inputs_raise(self):
+        rows = _plane(3, 3, lambda i, j: 101.0)
+        with pytest.raises(ValueError):
+            earthwork_volumes(rows, 100.0, 10, method="simpson")
+        with pytest.raises(ValueError):
+            earthwork_volumes(rows, 100.0, 10, swell="lcy_99")
+        with pytest.raises(ValueError):
+            earthwork_volumes([[101.0, 101.0], [101.0]], 100.0, 10)
+        with pytest.raises(ValueError):
+            earthwork_volumes(rows, _plane(3, 2, lambda i, j: 100.0), 10)
+
+    def test_row_count_mismatch_raises(self):
+        existing = _plane(4, 3, lambda i, j: 101.0)
+        with pytest.raises(ValueError, match="rows"):
+            earthwork_volumes(existing, existing[:3], 10)
+        with pytest.raises(ValueError, match="rows"):
+            earthwork_volumes(existing[:3], existing, 10)
+
+
+class TestSurfaceInputs:
+    def test_read_esri_ascii_grid(self, tmp_path):
+        path = tmp_path / "existing.asc"
+        path.write_text(
+            "ncols 3\nnrows 2\nxllcorner 0\nyllcorner 0\ncellsize 10\nNODATA_value -9999\n"
+            "101 101 -9999\n101 101 101\n",
+            encoding="utf-8",
+        )
+        rows = list(read_grid_rows(path))
+        assert rows == [[101.0, 101.0, None], [101.0, 101.0, 101.0]]
+
+    def test_grid_from_points_averages_nearest_node(self):
+        points = [(0, 0, 100), (0.4, 0.2, 102), (10, 0, 104), (0, 10, 106), (10.2, 9.9, 108)]
+        grid = grid_from_points(points, 10)
+        assert grid["origin"] == (0.0, 0.0)
+        assert grid["rows"] == [[101.0, 104.0], [106.0, 108.0]]
+        assert earthwork_volumes(grid["rows"], 100.0, 10)["cut_bcy"] > 0
@@ -121,3 +121,157 @@ class TestUnitConverter:
         from tools.calculations.unit_converter import convert
         with pytest.raises(ValueError):
             convert(1, "furlongs", "cf", "volume")
+
+    def test_matrix_round_trips(self):
+        from tools.calculations.unit_converter import MATRICES
+        for matrix in MATRICES.values():
+            for src, row in matrix.items():
+                for dst, factor in row.items():
+                    assert factor * matrix[dst][src] == pytest.approx(1.0)
+
+    def test_material_cy_to_tons(self):
+        from tools.calculations.unit_converter import convert
+        from tools.field.trench import BEDDING_TONS_PER_CY, asphalt_tonnage
+        rock = convert(10, "cy", "ton_short", "material", material="crushed_rock")
+        assert rock["result"] == pytest.approx(10 * BEDDING_TONS_PER_CY)
+        hma = asphalt_tonnage(270, 12, waste_pct=0)  # 10 CY of mat
+        asphalt = convert(10, "cy", "ton_short", "material", material="asphalt")
+        assert asphalt["result"] == pytest.approx(hma["net_tons"], abs=0.01)
+
+    def test_material_path_needs_density(self):
+        from tools.calculations.unit_converter import conversion_factor
+        assert conversion_factor("ton_short", "cy", material="soil") == pytest.approx(1 / 1.4)
+        with pytest.raises(ValueError):
+            conversion_factor("cy", "ton_short")
+        with pytest.raises(ValueError):
+            conversion_factor("cy", "psi", material="soil")
+
+    def test_convert_array_matches_convert(self):
+        from tools.calculations.unit_converter import convert, convert_array
+        values = [0.5, 12.0, 300.0]
+        expected = [convert(v, "cy", "cf", "volume")["result"] for v in values]
+        assert convert_array(values, "cy", "cf") == pytest.approx(expected)
+        mixed = convert_array([1, 27, 1], ["cy", "cf", "m3"], "cy")
+        assert mixed == pytest.approx([1.0, 1.0, 1 / 0.764555])
+        with pytest.raises(ValueError):
+            convert_array([1, 2], ["cy"], "cf")
+
+    def test_bulk_convert_uses_matrix_row(self):
+        from tools.calculations.unit_converter import bulk_convert
+        assert bulk_convert(2, "psi", "pressure")["psf"] == 288.0
+
+
+class TestCrewCost:
+    @pytest.fixture
+    def crew_data(self, tmp_path, monkeypatch):
+        from tools.estimating import estimating_tools
+        from tools.heavybid.paths import write_jsonl
+
+        monkeypatch.setattr(estimating_tools, "HEAVYBID_NORMALIZED_DIR", tmp_path)
+        monkeypatch.setattr(estimating_tools, "_CREW_INDEX", {})
+        monkeypatch.setattr(estimating_tools, "_CREW_COSTS", {})
+        write_jsonl(tmp_path / "crew_library.jsonl", [
+            {"estimate_code": "JOB1", "crew_code": "P1", "description": "Pipe crew"},
+        ])
+        write_jsonl(tmp_path / "labor_rates.jsonl", [
+            {"estimate_code": "JOB1", "labor_code": "OP1", "description": "Operator", "rate": 50,
+             "tax_percent": 10, "fringe": 15},
+            {"estimate_code": "JOB1", "labor_code": "LB1", "description": "Laborer", "rate": 30,
+             "tax_percent": 10, "fringe": 7},
+        ])
+        write_jsonl(tmp_path / "equipment_rates.jsonl", [
+            {"estimate_code": "JOB1", "equipment_code": "EX320", "description": "Excavator 320",
+             "units": "HR", "rent_rate": 60, "eoe_total_per_hour": 25},
+            {"estimate_code": "JOB1", "equipment_code": "BOX", "description": "Trench box",
+             "units": "WK", "rent_rate": 500, "eoe_total_per_hour": 0},
+        ])
+        crew_rows = [
+            {"Crew Code": "P1", "Resource Code": "OP1", "Description": "Operator", "Quantity": 1, "Type": "L"},
+            {"Crew Code": "P1", "Resource Code": "LB1", "Description": "Laborer", "Quantity": 3},
+            {"Crew Code": "P1", "Resource Code": "EX320", "Description": "Excavator 320", "Quantity": 1},
+            {"Crew Code": "P1", "Resource Code": "BOX", "Description": "Trench box", "Quantity": 1, "Type": "E"},
+        ]
+        write_jsonl(tmp_path / "codebooks.jsonl", [
+            dict(row, estimate_code="JOB1", workbook_name="Crew Resources.xlsx") for row in crew_rows
+        ] + [{"Code": "X", "estimate_code": "JOB1", "workbook_name": "Activity Codebook.xlsx"}])
+        return estimating_tools
+
+    def test_joins_members_to_estimate_rates(self, crew_data):
+        crew = crew_data.get_crew_cost("p1", hours_per_day=8)
+        operator = 50 * 1.1 + 15
+        laborer = 30 * 1.1 + 7
+        assert crew["crew_size"] == 4
+        assert crew["labor_hourly"] == pytest.approx(operator + 3 * laborer)
+        assert crew["equipment_daily"] == pytest.approx((60 + 25) * 8 + 500 / 5)
+        assert crew["daily_cost"] == pytest.approx((operator + 3 * laborer) * 8 + 780)
+        assert crew["unpriced"] == []
+        assert crew["description"] == "Pipe crew"
+
+    def test_result_feeds_crew_day_cost(self, crew_data):
+        from tools.calculations.bid_tools import crew_day_cost
+        crew = crew_data.get_crew_cost("P1")
+        day = crew_day_cost(crew["labor_items"], crew["equipment_items"], small_tools_consumables=0,
+                            overhead_burden_pct=0)
+        assert day["total_day_cost"] == pytest.approx(crew["daily_cost"], abs=0.05)
+
+    def test_cost_is_cached_per_rate_library(self, crew_data):
+        first = crew_data.get_crew_cost("P1")
+        assert crew_data.get_crew_cost("P1") is first
+        national = crew_data.get_crew_cost("P1", region="national")
+        assert national is not first
+        assert national["rate_library"] == "national"
+        rates = crew_data.RATE_TABLES["national"]
+        assert national["labor_hourly"] == pytest.approx(
+            rates["labor"]["operator"]["hourly"] + 3 * rates["labor"]["laborer"]["hourly"])
+        assert national["unpriced"] == []
+
+    def test_price_with_crew_uses_production_rate(self, crew_data):
+        crew = crew_data.get_crew_cost("P1")
+        priced = crew_data.price_with_crew("P1", 200, 1000)
+        assert priced["duration_days"] == 5.0
+        assert priced["total_day_cost"] == pytest.approx(crew["daily_cost"], abs=0.05)
+        assert priced["crew_code"] == "P1"
+
+    def test_unknown_crew(self, crew_data):
+        assert "error" in crew_data.get_crew_cost("ZZ")
+        assert "error" in crew_data.get_crew_cost("P1", estimate_code="JOB9")
+
+
+class TestProductionBenchmarks:
+    ROWS = [
+        {"estimate_code": "JOB1", "item_code": "10", "description": "8 IN PVC SEWER MAIN", "unit": "LF",
+         "quantity": 1200, "manhours": 300, "unit_price": 48},
+        {"estimate_code": "JOB2", "item_code": "11", "description": "8 IN PVC SEWER MAIN", "unit": "LF",
+         "quantity": 800, "manhours": 160, "unit_price": 52},
+        {"estimate_code": "JOB1", "item_code": "20", "description": "MANHOLE 48 IN", "unit": "EA",
+         "quantity": 6, "manhours": 96, "unit_price": 5200},
+        {"estimate_code": "JOB1", "item_code": "30", "description": "ASPHALT PATCH", "unit": "SY",
+         "quantity": 340, "manhours": 68, "unit_price": 62},
+    ]
+
+    @pytest.fixture
+    def history(self, tmp_path, monkeypatch):
+        from tools.estimating import estimating_tools
+        from tools.heavybid.paths import write_jsonl
+
+        monkeypatch.setattr(estimating_tools, "HEAVYBID_NORMALIZED_DIR", tmp_path)
+        monkeypatch.setattr(estimating_tools, "_BID_ITEM_COLUMNS", {})
+        write_jsonl(tmp_path / "bid_items.jsonl", self.ROWS)
+        return estimating_tools
+
+    def test_batch_matches_single_lookups(self, history):
+        queries = [{"description": "8 inch PVC sewer", "unit": "LF"},
+                   {"description": "manhole 48 in", "unit": "EA"},
+                   {"description": "asphalt patch", "unit": ""}]
+        batch = history.get_production_benchmarks(queries)
+        single = [history.get_production_benchmark(q["description"], q["unit"]) for q in queries]
+        assert batch == single
+        assert batch[0]["average_units_per_manhour"] == pytest.approx((4 + 5) / 2)
+
+    def test_batch_reads_history_once(self, history, monkeypatch):
+        calls = []
+        original = history._iter_bid_items
+        monkeypatch.setattr(history, "_iter_bid_items", lambda unit="": calls.append(unit) or original(unit))
+        history.get_production_benchmarks([{"description": "8 inch PVC sewer", "unit": "LF"},
+                                           {"description": "manhole 48 in", "unit": "EA"}])
+        assert calls == [{"lf", "ea"}]
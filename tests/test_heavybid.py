@@ -0,0 +1,429 @@
+"""Tests for the HeavyBid extraction pipeline using a synthetic export tree."""
+import struct
+
+import pytest
+
+from tools.heavybid.binary_decoder import decode_binary_tables
+from tools.heavybid.record_decoder import compile_record_layout, iter_table_records
+from tools.heavybid.schema_registry import parse_int_file
+
+BIDITEM_INT = """
+HEADER_SIZE 4
+FIELD_NUMBER 1
+FIELD_NAME BIDITEM
+FIELD_TYPE STRING
+FIELD_SIZE 8
+FIELD_NUMBER 2
+FIELD_NAME DESC
+FIELD_TYPE STRING
+FIELD_SIZE 24
+FIELD_NUMBER 3
+FIELD_NAME QUAN
+FIELD_TYPE FLOAT
+FIELD_SIZE 8
+FIELD_NUMBER 4
+FIELD_NAME UNIT
+FIELD_TYPE STRING
+FIELD_SIZE 4
+FIELD_NUMBER 5
+FIELD_NAME PRICE
+FIELD_TYPE FLOAT
+FIELD_SIZE 8
+"""
+
+BIDITEM_ROWS = [
+    (b"0100", b"8 IN PVC SEWER MAIN", 1200.0, b"LF", 48.5),
+    (b"0200", b"MANHOLE 48 IN", 6.0, b"EA", 5200.0),
+    (b"0300", b"ASPHALT PATCH", 340.0, b"SY", 62.25),
+]
+
+
+def _write_biditem(path, rows):
+    record = struct.Struct("<8s24sd4sd")
+    payload = struct.pack("<I", len(rows)) + b"".join(record.pack(*row) for row in rows)
+    path.write_bytes(payload)
+
+
+@pytest.fixture
+def heavybid_tree(tmp_path):
+    int_dir = tmp_path / "BIN" / "SQL" / "INT"
+    int_dir.mkdir(parents=True)
+    (int_dir / "BIDITEM.INT").write_text(BIDITEM_INT, encoding="utf-8")
+    (tmp_path / "BIN" / "BIDITEM.TAG").write_text("BIDITEM\nDESC\nQUAN\nUNIT\nPRICE\n", encoding="utf-8")
+    estimate_dir = tmp_path / "EST" / "JOB1"
+    estimate_dir.mkdir(parents=True)
+    _write_biditem(estimate_dir / "BIDITEM.DAT", BIDITEM_ROWS)
+    return tmp_path
+
+
+class TestRecordDecoder:
+    def test_layout_matches_int_fields(self, heavybid_tree):
+        meta = parse_int_file(heavybid_tree / "BIN" / "SQL" / "INT" / "BIDITEM.INT")
+        layout = compile_record_layout(meta)
+        assert layout["record_size"] == 52
+        assert layout["names"] == ["BIDITEM", "DESC", "QUAN", "UNIT", "PRICE"]
+
+    def test_rows_stream_lazily(self, heavybid_tree):
+        meta = parse_int_file(heavybid_tree / "BIN" / "SQL" / "INT" / "BIDITEM.INT")
+        layout = compile_record_layout(meta)
+        rows = iter_table_records(heavybid_tree / "EST" / "JOB1" / "BIDITEM.DAT", layout, data_offset=4)
+        first = next(rows)
+        assert first["DESC"] == "8 IN PVC SEWER MAIN"
+        assert first["QUAN"] == 1200.0
+        rows.close()
+
+    def test_empty_layout_returns_none(self):
+        assert compile_record_layout({"fields": []}) is None
+
+
+class TestDecodeBinaryTables:
+    def test_biditem_records_are_high_confidence(self, heavybid_tree):
+        payload = decode_binary_tables(str(heavybid_tree))
+        hints = payload["merged_bid_hints"]
+        assert len(hints) == 3
+        assert all(hint["confidence"] == "high" for hint in hints)
+        manhole = next(hint for hint in hints if hint["item_code"] == "0200")
+        assert manhole["quantity"] == 6.0
+        assert manhole["unit_price"] == 5200.0
+        assert manhole["amount"] == 31200.0
+
+    def test_other_tables_report_count_and_sample(self, heavybid_tree):
+        int_dir = heavybid_tree / "BIN" / "SQL" / "INT"
+        (int_dir / "CREW.INT").write_text(BIDITEM_INT, encoding="utf-8")
+        _write_biditem(heavybid_tree / "EST" / "JOB1" / "CREW.DAT", BIDITEM_ROWS * 20)
+        payload = decode_binary_tables(str(heavybid_tree))
+        crew = next(t for t in payload["decoded_estimates"][0]["tables"] if t["table"] == "CREW")
+        assert crew["decoded_record_count"] == 60
+        assert len(crew["sample_records"]) == 25
+        assert crew["sample_records"][1]["DESC"] == "MANHOLE 48 IN"
+        assert len(payload["merged_bid_hints"]) == 3
+
+    def test_guessed_layout_emits_no_priced_items(self, heavybid_tree):
+        int_path = heavybid_tree / "BIN" / "SQL" / "INT" / "BIDITEM.INT"
+        int_path.write_text(BIDITEM_INT.replace("HEADER_SIZE 4\n", ""), encoding="utf-8")
+        payload = decode_binary_tables(str(heavybid_tree))
+        assert payload["decoded_estimates"][0]["tables"][0]["record_location"]["confidence"] == "medium"
+        hints = payload["merged_bid_hints"]
+        assert all(hint["confidence"] == "low" and "unit_price" not in hint for hint in hints)
+
+    def test_declared_count_alone_is_medium_confidence(self, heavybid_tree):
+        from tools.heavybid.record_decoder import locate_records
+
+        meta = parse_int_file(heavybid_tree / "BIN" / "SQL" / "INT" / "BIDITEM.INT")
+        layout = dict(compile_record_layout(meta), header_size=0)
+        location = locate_records(layout, 4 + 3 * layout["record_size"], [3])
+        assert (location["data_offset"], location["record_count"]) == (4, 3)
+        assert location["confidence"] == "medium"
+        assert locate_records(dict(layout, header_size=4), 4 + 3 * layout["record_size"], [3])["confidence"] == "high"
+
+    def test_table_reports_record_layout(self, heavybid_tree):
+        payload = decode_binary_tables(str(heavybid_tree))
+        table = payload["decoded_estimates"][0]["tables"][0]
+        assert table["decoded_record_count"] == 3
+        assert table["record_location"]["data_offset"] == 4
+
+
+class TestSchemaRegistryCache:
+    def test_registry_reused_until_bin_changes(self, heavybid_tree, tmp_path, monkeypatch):
+        from tools.heavybid import schema_registry
+
+        monkeypatch.setattr(schema_registry, "REGISTRY_PATH", tmp_path / "schema-registry.json")
+        monkeypatch.setattr(schema_registry, "_REGISTRY_CACHE", {})
+        first = schema_registry.build_schema_registry(str(heavybid_tree))
+        assert schema_registry.build_schema_registry(str(heavybid_tree)) is first
+
+        tag_path = heavybid_tree / "BIN" / "BIDITEM.TAG"
+        tag_path.write_text("BIDITEM\nDESC\nQUAN\nUNIT\nPRICE\nTOTAL\n", encoding="utf-8")
+        rebuilt = schema_registry.build_schema_registry(str(heavybid_tree))
+        assert rebuilt is not first
+        assert rebuilt["fingerprint"] != first["fingerprint"]
+
+    def test_registry_loads_from_disk(self, heavybid_tree, tmp_path, monkeypatch):
+        from tools.heavybid import schema_registry
+
+        monkeypatch.setattr(schema_registry, "REGISTRY_PATH", tmp_path / "schema-registry.json")
+        monkeypatch.setattr(schema_registry, "SCHEMA_ROOT", tmp_path)
+        monkeypatch.setattr(schema_registry, "_REGISTRY_CACHE", {})
+        built = schema_registry.build_schema_registry(str(heavybid_tree), write_outputs=True)
+        schema_registry._REGISTRY_CACHE.clear()
+        loaded = schema_registry.load_schema_registry(str(heavybid_tree))
+        assert loaded["fingerprint"] == built["fingerprint"]
+
+
+class TestSourceInventory:
+    def test_inventory_feeds_discovery(self, heavybid_tree):
+        from tools.heavybid import build_discovery_manifest, build_source_inventory
+
+        (heavybid_tree / "EST" / "EMPTY").mkdir()
+        inventory = build_source_inventory(heavybid_tree)
+        assert inventory["file_count"] == 3
+        manifest = build_discovery_manifest(str(heavybid_tree), inventory=inventory)
+        assert manifest["estimate_directory_count"] == 1
+        assert {"name": ".dat", "count": 1} in manifest["extension_counts"]
+
+
+BIDFORM_XML = """<REPORT><JOB><CODE>{code}</CODE><DESC>Sewer job {code}</DESC><JOBTOTAL>1000</JOBTOTAL>
+<ITEMS>
+<ITEM><CODE>0100</CODE><DESC>8 IN PVC SEWER</DESC><QUAN>100</QUAN><UNIT>LF</UNIT><PRICE>50</PRICE></ITEM>
+<ITEM><CODE>0200</CODE><DESC>MANHOLE</DESC><QUAN>2</QUAN><UNIT>EA</UNIT><TOTAL>9000</TOTAL></ITEM>
+</ITEMS></JOB></REPORT>"""
+
+
+@pytest.fixture
+def bidform_tree(tmp_path):
+    for code in ("JOB1", "JOB2"):
+        estimate_dir = tmp_path / "EST" / code
+        estimate_dir.mkdir(parents=True)
+        (estimate_dir / "BIDFORM.xml").write_text(BIDFORM_XML.format(code=code), encoding="utf-8")
+    # A second report for JOB1 repeats the same bid header.
+    (tmp_path / "EST" / "JOB1" / "BIDFORM2.xml").write_text(BIDFORM_XML.format(code="JOB1"), encoding="utf-8")
+    return tmp_path
+
+
+class TestStructuredRecords:
+    def test_yields_estimate_by_estimate(self, bidform_tree, monkeypatch):
+        from tools.heavybid import extract
+
+        parsed = []
+        original = extract._parse_job_xml
+        monkeypatch.setattr(extract, "_parse_job_xml", lambda path: parsed.append(path.parent.name) or original(path))
+        records = extract.iter_structured_records(str(bidform_tree))
+        first_kind, first = next(records)
+        assert (first_kind, first["estimate_code"]) == ("bids", "JOB1")
+        assert parsed == ["JOB1"]
+        rest = list(records)
+        assert [record["estimate_code"] for kind, record in rest if kind == "bids"] == ["JOB1", "JOB2"]
+        assert sum(1 for kind, _ in rest if kind == "bid_items") == 6
+
+    def test_extract_collects_and_dedupes(self, bidform_tree):
+        from tools.heavybid.extract import extract_structured_assets
+
+        payload = extract_structured_assets(str(bidform_tree))
+        assert [bid["estimate_code"] for bid in payload["bids"]] == ["JOB1", "JOB2"]
+        assert len(payload["bid_items"]) == 6
+        manhole = payload["bid_items"][1]
+        assert manhole["unit_price"] == 4500.0
+        assert payload["dedupe"]["by_source_kind"] == {"bidform": 1}
+
+
+class TestStreamingDedupe:
+    RECORDS = [
+        ("crew_library", {"estimate_code": "JOB1", "crew_code": "P1", "source_kind": "crew"}),
+        ("crew_library", {"estimate_code": "JOB1", "crew_code": "P2"}),
+        ("crew_library", {"estimate_code": "JOB1", "crew_code": " P1 ", "source_kind": "crew"}),
+        ("labor_rates", {"estimate_code": "JOB1", "labor_code": "P1"}),
+        ("formulas", {"template_name": "T"}),
+        ("formulas", {"template_name": "T"}),
+        ("crew_library", {"estimate_code": "JOB1", "crew_code": "P2"}),
+    ]
+    KEYS = {"crew_library": ["estimate_code", "crew_code"], "labor_rates": ["estimate_code", "labor_code"]}
+
+    @pytest.mark.parametrize("threshold", [1000, 1])
+    def test_drops_repeats_inline(self, tmp_path, threshold):
+        from tools.heavybid.dedupe import dedupe_stream, new_dedupe_stats
+
+        stats = new_dedupe_stats()
+        unique = list(dedupe_stream(iter(self.RECORDS), self.KEYS, spill_threshold=threshold,
+                                    spill_dir=tmp_path, stats=stats))
+        assert [record for _, record in unique] == [record for _, record in self.RECORDS[:2] + self.RECORDS[3:6]]
+        assert stats["duplicates"] == 2 and stats["unique"] == 3
+        assert stats["by_source_kind"] == {"crew": 1, "unknown": 1}
+        assert stats["spilled"] is (threshold == 1)
+        assert list(tmp_path.iterdir()) == []
+
+    def test_digest_is_fixed_size_and_collection_scoped(self):
+        from tools.heavybid.dedupe import DIGEST_SIZE, record_digest
+
+        record = {"estimate_code": "JOB1", "code": "P1"}
+        assert len(record_digest("crew_library", record, ["estimate_code", "code"])) == DIGEST_SIZE
+        assert record_digest("crew_library", record, ["code"]) != record_digest("labor_rates", record, ["code"])
+
+
+class TestJsonlWriter:
+    def test_round_trip(self, tmp_path):
+        from tools.heavybid.paths import read_jsonl, write_jsonl
+
+        rows = [{"item_code": "1010", "quantity": 120.0}, {"item_code": "1020", "unit": "LF"}]
+        target = write_jsonl(tmp_path / "bid_items.jsonl", iter(rows))
+        assert list(read_jsonl(target)) == rows
+        assert target.read_text(encoding="utf-8").count("\n") == 2
+
+    def test_failed_write_keeps_previous_file(self, tmp_path):
+        from tools.heavybid.paths import read_jsonl, write_jsonl
+
+        target = write_jsonl(tmp_path / "bid_items.jsonl", [{"item_code": "1010"}])
+
+        def broken_rows():
+            yield {"item_code": "2010"}
+            raise RuntimeError("source went away")
+
+        with pytest.raises(RuntimeError):
+            write_jsonl(target, broken_rows())
+        assert list(read_jsonl(target)) == [{"item_code": "1010"}]
+        assert [path.name for path in tmp_path.iterdir()] == ["bid_items.jsonl"]
+
+    def test_artifacts_get_umask_default_mode(self, tmp_path):
+        import os
+        import stat
+
+        from tools.heavybid.paths import write_jsonl
+
+        mask = os.umask(0o022)
+        os.umask(mask)
+        target = write_jsonl(tmp_path / "bid_items.jsonl", [{"item_code": "1010"}])
+        assert stat.S_IMODE(target.stat().st_mode) == 0o666 & ~mask
+
+
+class TestColumnarBidItems:
+    ROWS = [
+        {"estimate_code": "JOB1", "item_code": "1010", "description": "8\" PVC sewer", "unit": "LF",
+         "quantity": 120.0, "unit_price": 42.5, "amount": 5100.0, "manhours": 60.0},
+        {"estimate_code": "JOB1", "item_code": "1020", "description": "Manhole 48\u00f8", "unit": "EA",
+         "quantity": 3, "unit_price": 4200.0, "amount": 12600.0},
+        {"estimate_code": "JOB2", "item_code": "1010", "description": "8\" PVC sewer", "unit": "lf",
+         "quantity": 80.0, "unit_price": None, "notes": "no price"},
+    ]
+
+    def test_round_trip(self, tmp_path):
+        from tools.heavybid.columnar import (
+            close_columnar,
+            iter_columnar_rows,
+            open_columnar_bid_items,
+            write_columnar_bid_items,
+        )
+
+        store = open_columnar_bid_items(write_columnar_bid_items(self.ROWS, tmp_path / "bid_items.columns"))
+        try:
+            rows = list(iter_columnar_rows(store))
+            assert store["row_count"] == 3
+            assert rows[1]["description"] == "Manhole 48\u00f8"
+            assert rows[1]["quantity"] == 3.0 and rows[2]["unit_price"] == 0.0
+            assert rows[0]["notes"] == "" and rows[2]["notes"] == "no price"
+            assert list(store["numeric"]["amount"]) == [5100.0, 12600.0, 0.0]
+            # Repeated strings share one dictionary entry.
+            assert store["codes"]["description"][0] == store["codes"]["description"][2]
+        finally:
+            close_columnar(store)
+
+    def test_unit_filter_runs_on_codes(self, tmp_path):
+        from tools.heavybid.columnar import (
+            close_columnar,
+            matching_codes,
+            open_columnar_bid_items,
+            select_rows,
+            write_columnar_bid_items,
+        )
+
+        store = open_columnar_bid_items(write_columnar_bid_items(self.ROWS, tmp_path / "bid_items.columns"))
+        try:
+            codes = matching_codes(store, "unit", lambda value: value.lower() == "lf")
+            assert select_rows(store, "unit", codes) == [0, 2]
+        finally:
+            close_columnar(store)
+
+    def test_rejects_foreign_file(self, tmp_path):
+        from tools.heavybid.columnar import open_columnar_bid_items
+
+        path = tmp_path / "bid_items.columns"
+        path.write_bytes(b"not a columnar file")
+        assert open_columnar_bid_items(path) is None
+
+    def test_history_search_reads_columns(self, tmp_path, monkeypatch):
+        from tools.estimating import estimating_tools
+        from tools.heavybid.columnar import write_columnar_bid_items
+
+        monkeypatch.setattr(estimating_tools, "HEAVYBID_NORMALIZED_DIR", tmp_path)
+        monkeypatch.setattr(estimating_tools, "_BID_ITEM_COLUMNS", {})
+        write_columnar_bid_items(self.ROWS, tmp_path / "bid_items.columns")
+        result = estimating_tools.get_historical_unit_prices("8 inch PVC sewer", unit="LF")
+        assert [item["estimate_code"] for item in result["matches"]] == ["JOB1"]
+        assert result["average_unit_price"] == 42.5
+
+
+class TestPipeline:
+    @pytest.fixture
+    def pipeline(self, heavybid_tree, tmp_path_factory, monkeypatch):
+        from pathlib import Path
+
+        from tools.heavybid import binary_decoder, discover, extract, importer, paths, schema_registry
+
+        # Point every artifact path (roots and files under data/heavybid) at a scratch directory.
+        real_root, data_root = paths.DATA_ROOT, tmp_path_factory.mktemp("heavybid-data")
+        for module in (paths, discover, schema_registry, extract, binary_decoder, importer):
+            for name, value in list(vars(module).items()):
+                if isinstance(value, Path) and value.is_relative_to(real_root):
+                    monkeypatch.setattr(module, name, data_root / value.relative_to(real_root))
+        monkeypatch.setattr(schema_registry, "_REGISTRY_CACHE", {})
+        return importer
+
+    def test_second_run_is_served_from_cache(self, pipeline, heavybid_tree):
+        first = pipeline.run_heavybid_pipeline(str(heavybid_tree))
+        second = pipeline.run_heavybid_pipeline(str(heavybid_tree))
+        cached = {record["stage"]: record["cached"] for record in second["timings"]}
+        assert not any(record["cached"] for record in first["timings"])
+        assert cached["binary"] and cached["structured"] and not cached["snapshot"]
+        assert second["stages"]["snapshot"]["counts"] == first["stages"]["snapshot"]["counts"]
+        assert second["stages"]["snapshot"]["counts"]["bid_items"] == 3
+
+    def test_cache_points_at_artifacts(self, pipeline, heavybid_tree):
+        import json
+
+        pipeline.run_heavybid_pipeline(str(heavybid_tree))
+        entry = json.loads((pipeline.CACHE_ROOT / "binary.json").read_text(encoding="utf-8"))
+        assert set(entry) == {"fingerprint", "artifact", "stamp"}
+        assert entry["artifact"].endswith("binary-tables.json")
+        pipeline.binary_decoder.BINARY_TABLES_PATH.write_text("{}", encoding="utf-8")
+        run = pipeline.run_heavybid_pipeline(str(heavybid_tree))
+        cached = {record["stage"]: record["cached"] for record in run["timings"]}
+        assert not cached["binary"] and cached["structured"]
+
+    def test_no_write_runs_do_not_cache(self, pipeline, heavybid_tree):
+        pipeline.run_heavybid_pipeline(str(heavybid_tree), write_outputs=False)
+        assert not list(pipeline.CACHE_ROOT.glob("*.json"))
+
+    def test_only_reruns_named_stage(self, pipeline, heavybid_tree):
+        pipeline.run_heavybid_pipeline(str(heavybid_tree))
+        run = pipeline.run_heavybid_pipeline(str(heavybid_tree), only=["binary"])
+        assert set(run["stages"]) == {"schema", "binary"}
+        cached = {record["stage"]: record["cached"] for record in run["timings"]}
+        assert cached["schema"] and not cached["binary"]
+
+    def test_from_reruns_downstream(self, pipeline, heavybid_tree):
+        pipeline.run_heavybid_pipeline(str(heavybid_tree))
+        run = pipeline.run_heavybid_pipeline(str(heavybid_tree), start_from="schema")
+        cached = {record["stage"]: record["cached"] for record in run["timings"]}
+        assert not cached["schema"] and not cached["binary"]
+        assert cached["discovery"] and cached["structured"]
+
+    def test_partial_rerun_refreshes_normalized_artifacts(self, pipeline, heavybid_tree):
+        normalized = pipeline.NORMALIZED_ROOT
+        pipeline.run_heavybid_pipeline(str(heavybid_tree), only=["snapshot"])
+        for name in ("snapshot.json", "bid_items.jsonl", "bid_items.columns"):
+            assert (normalized / name).exists()
+        (normalized / "bid_items.jsonl").write_text("", encoding="utf-8")
+        pipeline.run_heavybid_pipeline(str(heavybid_tree), start_from="binary")
+        assert len((normalized / "bid_items.jsonl").read_text(encoding="utf-8").splitlines()) == 3
+
+    def test_unknown_stage_rejected(self, pipeline, heavybid_tree):
+        with pytest.raises(ValueError):
+            pipeline.run_heavybid_pipeline(str(heavybid_tree), write_outputs=False, only=["nope"])
+
+    def test_snapshot_links_jsonl_collections(self, pipeline, heavybid_tree):
+        import json
+
+        pipeline.build_heavybid_snapshot(str(heavybid_tree))
+        normalized = pipeline.NORMALIZED_ROOT
+        written = json.loads((normalized / "snapshot.json").read_text(encoding="utf-8"))
+        assert "bid_items" not in written and "bids" not in written
+        assert written["artifacts"]["bids"] == "bids.jsonl"
+        assert written["artifacts"]["bid_items"] == "bid_items.jsonl"
+        assert len((normalized / "bid_items.jsonl").read_text(encoding="utf-8").splitlines()) == 3
+
+    def test_snapshot_file_records_timings(self, pipeline, heavybid_tree):
+        import json
+
+        snapshot = pipeline.build_heavybid_snapshot(str(heavybid_tree))
+        written = json.loads((pipeline.NORMALIZED_ROOT / "snapshot.json").read_text(encoding="utf-8"))
+        assert written["pipeline"] == snapshot["pipeline"]
+        assert written["pipeline"]["timings"][0]["stage"] == "inventory"
+        assert "snapshot" in {record["stage"] for record in written["pipeline"]["timings"]}
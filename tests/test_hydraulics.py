@@ -2,7 +2,21 @@
 import math
 import pytest
 
-from tools.field.hydraulics import pipe_flow_full, pipe_flow_partial, minimum_slope, flow_to_slope
+from tools.field.hydraulics import (
+    pipe_flow_full,
+    pipe_flow_partial,
+    minimum_slope,
+    flow_to_slope,
+    pipe_flow_full_batch,
+    pipe_flow_partial_batch,
+    minimum_slope_batch,
+    flow_to_slope_batch,
+    normal_depth,
+    normal_depth_batch,
+    PEAK_FLOW_RATIO,
+    partial_flow_ratios,
+    depth_ratio_from_flow_ratio,
+)
 
 
 class TestPipeFlowFull:
@@ -102,3 +116,128 @@ class TestFlowToSlope:
         s1 = flow_to_slope(12, 500)
         s2 = flow_to_slope(12, 1000)
         assert s2["required_slope_ft_per_ft"] > s1["required_slope_ft_per_ft"]
+
+
+class TestBatchManning:
+    DIAMETERS = [8, 12, 12, 24]
+    SLOPES = [0.004, 0.005, 0.01, 0.002]
+
+    def test_full_matches_scalar(self):
+        batch = pipe_flow_full_batch(self.DIAMETERS, self.SLOPES, n=0.013)
+        for i, (d, s) in enumerate(zip(self.DIAMETERS, self.SLOPES)):
+            scalar = pipe_flow_full(d, s, n=0.013)
+            assert round(batch["flow_cfs"][i], 4) == scalar["flow_cfs"]
+            assert round(batch["velocity_fps"][i], 3) == scalar["velocity_fps"]
+
+    def test_partial_matches_scalar(self):
+        ratios = [0.25, 0.5, 0.8, 1.0]
+        batch = pipe_flow_partial_batch(self.DIAMETERS, self.SLOPES, ratios)
+        for i, (d, s, r) in enumerate(zip(self.DIAMETERS, self.SLOPES, ratios)):
+            scalar = pipe_flow_partial(d, s, depth_ratio=r)
+            assert round(batch["partial_flow_cfs"][i], 4) == scalar["partial"]["flow_cfs"]
+            assert batch["meets_min_velocity"][i] == scalar["meets_min_velocity"]
+
+    def test_scalars_broadcast(self):
+        batch = pipe_flow_full_batch(12, [0.001, 0.004, 0.009])
+        assert batch["pipe_diameter_in"] == [12, 12, 12]
+        # Q scales with sqrt(S): tripling sqrt(S) triples Q.
+        assert abs(batch["flow_cfs"][2] / batch["flow_cfs"][0] - 3.0) < 1e-9
+
+    def test_length_mismatch_rejected(self):
+        with pytest.raises(ValueError):
+            pipe_flow_full_batch([8, 12], [0.004, 0.005, 0.006])
+
+    def test_invalid_depth_ratio_in_batch(self):
+        with pytest.raises(ValueError):
+            pipe_flow_partial_batch([8, 12], 0.005, [0.5, 1.5])
+
+    def test_minimum_slope_and_flow_to_slope(self):
+        mins = minimum_slope_batch([8, 24], 2.5)
+        assert round(mins["minimum_slope_ft_per_ft"][0], 6) == minimum_slope(8, 2.5)["minimum_slope_ft_per_ft"]
+        required = flow_to_slope_batch(12, [500, 1000], depth_ratio=[1.0, 0.5])
+        assert round(required["required_slope_ft_per_ft"][1], 6) == \
+            flow_to_slope(12, 1000, depth_ratio=0.5)["required_slope_ft_per_ft"]
+
+
+class TestNormalDepth:
+    @pytest.mark.parametrize("depth_ratio", [0.05, 0.25, 0.5, 0.75, 0.9])
+    def test_inverts_partial_flow(self, depth_ratio):
+        # Feed the unrounded partial flow back in and recover d/D.
+        flow_gpm = pipe_flow_partial_batch(15, 0.004, depth_ratio, 0.013)["partial_flow_cfs"][0] * 448.831
+        result = normal_depth(15, flow_gpm, 0.004, n=0.013)
+        assert abs(result["depth_ratio"] - depth_ratio) < 1e-4
+        expected = pipe_flow_partial(15, 0.004, depth_ratio=depth_ratio, n=0.013)
+        assert abs(result["velocity_fps"] - expected["partial"]["velocity_fps"]) < 0.002
+
+    def test_surcharged_when_flow_exceeds_peak(self):
+        full = pipe_flow_full(8, 0.004)
+        result = normal_depth(8, full["flow_gpm"] * (PEAK_FLOW_RATIO + 0.05), 0.004)
+        assert result["surcharged"]
+        assert result["depth_ratio"] == 1.0
+
+    def test_between_full_and_peak_uses_rising_limb(self):
+        full = pipe_flow_full(8, 0.004)
+        result = normal_depth(8, full["flow_gpm"] * 1.02, 0.004)
+        assert not result["surcharged"]
+        assert 0.8 < result["depth_ratio"] < 0.94
+
+    def test_batch_matches_scalar(self):
+        flows = [50, 200, 400, 800]
+        batch = normal_depth_batch(12, flows, 0.005)
+        for i, flow in enumerate(flows):
+            assert round(batch["depth_ratio"][i], 4) == normal_depth(12, flow, 0.005)["depth_ratio"]
+
+    def test_zero_slope_rejected(self):
+        with pytest.raises(ValueError):
+            normal_depth(12, 100, 0.0)
+
+
+def _exact_ratios(depth_ratio):
+    theta = 2 * math.acos(1 - 2 * depth_ratio)
+    area = (theta - math.sin(theta)) / (2 * math.pi)
+    radius = 1 - math.sin(theta) / theta
+    return {
+        "area_ratio": area,
+        "radius_ratio": radius,
+        "flow_ratio": area * radius ** (2 / 3),
+        "velocity_ratio": radius ** (2 / 3),
+    }
+
+
+class TestPartialFlowTable:
+    # Dense sweep including both ends of the pipe, where R/R_full is steepest.
+    DEPTHS = [i / 2000 for i in range(1, 2001)] + [1e-6, 0.9999, 0.99999]
+
+    def test_forward_lookup_accuracy(self):
+        for y in self.DEPTHS:
+            exact = _exact_ratios(y)
+            looked_up = partial_flow_ratios(y)
+            for key, value in exact.items():
+                assert abs(looked_up[key] - value) < 2e-6
+                if y >= 0.01:
+                    assert abs(looked_up[key] - value) / value < 5e-5
+
+    def test_inverse_lookup_accuracy(self):
+        for y in [i / 1000 for i in range(5, 938)]:
+            flow_ratio = _exact_ratios(y)["flow_ratio"]
+            assert abs(depth_ratio_from_flow_ratio(flow_ratio) - y) < (1e-6 if flow_ratio < 1.07 else 2e-5)
+
+    def test_end_points(self):
+        assert partial_flow_ratios(0.0)["flow_ratio"] == 0.0
+        assert abs(partial_flow_ratios(1.0)["flow_ratio"] - 1.0) < 1e-9
+        assert depth_ratio_from_flow_ratio(0.0) == 0.0
+        assert depth_ratio_from_flow_ratio(PEAK_FLOW_RATIO) == 1.0
+
+    def test_out_of_range_depth_rejected(self):
+        with pytest.raises(ValueError):
+            partial_flow_ratios(1.2)
+
+    def test_table_mode_matches_exact_batches(self):
+        exact = pipe_flow_partial_batch([8, 12, 24], 0.005, [0.3, 0.6, 0.9])
+        table = pipe_flow_partial_batch([8, 12, 24], 0.005, [0.3, 0.6, 0.9], use_table=True)
+        for a, b in zip(exact["partial_flow_cfs"], table["partial_flow_cfs"]):
+            assert abs(a - b) / a < 1e-5
+        solved = normal_depth_batch(12, [100, 400, 700], 0.005)
+        looked_up = normal_depth_batch(12, [100, 400, 700], 0.005, use_table=True)
+        for a, b in zip(solved["depth_ratio"], looked_up["depth_ratio"]):
+            assert abs(a - b) < 1e-6
@@ -0,0 +1,120 @@
+"""Tests for the cost-based gravity pipe sizing optimizer."""
+import pytest
+
+from tools.field.hydraulics import normal_depth
+from tools.field.pipe_sizing import pipe_catalog, size_pipe, size_pipe_batch
+from tools.field.trench import trench_volume
+
+
+class TestPipeCatalog:
+    def test_parses_material_and_size_from_keys(self):
+        catalog = pipe_catalog()
+        row = catalog["key"].index("pvc_sdr35_8")
+        assert catalog["material"][row] == "pvc"
+        assert catalog["diameter_in"][row] == 8.0
+        assert catalog["mannings_n"][row] == 0.012
+        assert catalog["outside_diameter_in"][row] > 8.0
+        assert set(catalog["material"]) == {"pvc", "dip", "hdpe", "rcp"}
+
+    def test_material_filter_accepts_prefix_or_base_material(self):
+        assert set(pipe_catalog(materials=["rcp"])["material"]) == {"rcp"}
+        sdr35 = pipe_catalog(materials=["pvc_sdr35"])["key"]
+        assert sdr35 and all(key.startswith("pvc_sdr35_") for key in sdr35)
+        assert min(pipe_catalog(min_diameter_in=8)["diameter_in"]) == 8.0
+
+
+class TestSizePipe:
+    def test_best_candidate_meets_every_limit(self):
+        result = size_pipe(300, length_ft=300, min_velocity_fps=2.0, max_depth_ratio=0.75)
+        best = result["best"]
+        assert best["depth_ratio"] <= 0.75
+        assert best["velocity_fps"] >= 2.0
+        assert best["capacity_gpm"] > 300
+        assert result["feasible_count"] > 1
+        assert result["candidates_evaluated"] == result["feasible_count"] + sum(result["rejected"].values())
+
+    def test_best_is_cheapest_and_alternatives_are_ranked(self):
+        result = size_pipe(300, length_ft=300, alternatives=4)
+        costs = [result["best"]["total_cost"]] + [alt["total_cost"] for alt in result["alternatives"]]
+        assert costs == sorted(costs)
+        assert len(result["alternatives"]) == 4
+
+    def test_hydraulics_match_normal_depth(self):
+        best = size_pipe(300, length_ft=300)["best"]
+        check = normal_depth(best["diameter_in"], 300, best["slope_ft_per_ft"], best["mannings_n"])
+        assert best["depth_ratio"] == pytest.approx(check["depth_ratio"], abs=1e-3)
+        assert best["velocity_fps"] == pytest.approx(check["velocity_fps"], abs=0.01)
+
+    def test_trench_quantities_match_trench_volume(self):
+        best = size_pipe(300, length_ft=300, slopes=[0.01])["best"]
+        catalog = pipe_catalog()
+        od_in = catalog["outside_diameter_in"][catalog["key"].index(best["catalog_key"])]
+        takeoff = trench_volume(300, best["trench_width_ft"], best["avg_trench_depth_ft"], pipe_od_in=od_in)
+        assert best["excavation_cy"] == pytest.approx(takeoff["excavation_cy"], abs=0.02)
+        assert best["bedding_tons"] == pytest.approx(takeoff["bedding_tons"], abs=0.02)
+
+    def test_larger_flow_needs_larger_pipe(self):
+        small = size_pipe(200, length_ft=300)["best"]
+        large = size_pipe(3000, length_ft=300)["best"]
+        assert large["diameter_in"] > small["diameter_in"]
+
+    def test_higher_velocity_floor_rejects_flat_candidates(self):
+        sanitary = size_pipe(300, length_ft=300, min_velocity_fps=2.0)
+        storm = size_pipe(300, length_ft=300, min_velocity_fps=2.5)
+        assert storm["best"]["velocity_fps"] >= 2.5
+        assert storm["rejected"]["low_velocity"] > sanitary["rejected"]["low_velocity"]
+
+    def test_min_cover_deepens_trench_and_raises_cost(self):
+        shallow = size_pipe(300, length_ft=300, slopes=[0.01], materials=["pvc_sdr35"], min_cover_ft=3)["best"]
+        deep = size_pipe(300, length_ft=300, slopes=[0.01], materials=["pvc_sdr35"], min_cover_ft=8)["best"]
+        assert deep["avg_trench_depth_ft"] == pytest.approx(shallow["avg_trench_depth_ft"] + 5, abs=0.01)
+        assert deep["total_cost"] > shallow["total_cost"]
+
+    def test_slope_matching_ground_keeps_trench_shallow(self):
+        result = size_pipe(300, length_ft=400, ground_slope=0.02, slopes=[0.005, 0.02], materials=["pvc_sdr35"])
+        assert result["best"]["slope_ft_per_ft"] == 0.02
+
+    def test_max_trench_depth_rejects_steep_runs(self):
+        result = size_pipe(300, length_ft=600, max_trench_depth_ft=8)
+        assert result["best"]["max_trench_depth_ft"] <= 8
+        assert result["rejected"]["too_deep"] > 0
+
+    def test_no_feasible_candidate_returns_none(self):
+        result = size_pipe(50000, length_ft=100)
+        assert result["best"] is None
+        assert result["feasible_count"] == 0
+
+    def test_invalid_inputs_raise(self):
+        with pytest.raises(ValueError):
+            size_pipe(0)
+        with pytest.raises(ValueError):
+            size_pipe(300, slopes=[0.0, 0.01])
+        with pytest.raises(ValueError):
+            size_pipe(300, materials=["clay"])
+
+
+class TestSizePipeBatch:
+    def test_batch_matches_single_segment_sizing(self):
+        segments = [
+            {"id": "P1", "flow_gpm": 150, "length_ft": 250},
+            {"id": "P2", "flow_gpm": 900, "length_ft": 300, "ground_slope": 0.01},
+            {"id": "P3", "flow_gpm": 3000, "length_ft": 400},
+        ]
+        batch = size_pipe_batch(segments, min_diameter_in=8)
+        for i, segment in enumerate(segments):
+            single = size_pipe(segment["flow_gpm"], segment["length_ft"], ground_slope=segment.get("ground_slope", 0),
+                               min_diameter_in=8)["best"]
+            assert batch["segments"]["catalog_key"][i] == single["catalog_key"]
+            assert batch["segments"]["slope_ft_per_ft"][i] == single["slope_ft_per_ft"]
+            assert round(batch["segments"]["total_cost"][i], 2) == single["total_cost"]
+        assert batch["unsized"] == []
+        assert batch["total_cost"] == pytest.approx(sum(batch["segments"]["total_cost"]))
+
+    def test_unsizable_segments_are_reported(self):
+        batch = size_pipe_batch([
+            {"id": "ok", "flow_gpm": 200, "length_ft": 100},
+            {"id": "huge", "flow_gpm": 50000, "length_ft": 100},
+        ])
+        assert batch["unsized"] == ["huge"]
+        assert batch["segments"]["catalog_key"][1] is None
+        assert batch["total_cost"] == pytest.approx(batch["segments"]["total_cost"][0])
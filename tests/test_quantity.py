@@ -0,0 +1,93 @@
+"""Tests for unit-aware quantities and the accepts_units decorator."""
+import pytest
+
+from tools.calculations.quantity import Quantity, accepts_units, canonical_unit, magnitude, parse_quantity
+from tools.calculations.unit_converter import conversion_factor, convert
+from tools.field.earthwork import earthwork_volumes
+from tools.field.hydraulics import normal_depth, normal_depth_batch, pipe_flow_full_batch
+from tools.field.pipe_sizing import size_pipe
+from tools.field.trench import asphalt_tonnage, trench_volume
+
+
+class TestQuantity:
+    def test_aliases_resolve_to_converter_units(self):
+        assert canonical_unit("LF") == ("ft", "length")
+        assert canonical_unit("tons") == ("ton_short", "weight")
+        with pytest.raises(ValueError):
+            canonical_unit("furlong")
+
+    def test_conversion_matches_convert(self):
+        assert Quantity(30, "m").magnitude("ft") == pytest.approx(convert(30, "m", "ft", "length")["result"])
+        assert Quantity(1, "cfs").to("gpm").value == pytest.approx(448.83, abs=0.01)
+
+    def test_arithmetic_converts_to_left_unit(self):
+        total = Quantity(10, "ft") + Quantity(12, "in")
+        assert total.unit == "ft" and total.value == pytest.approx(11)
+        assert (Quantity(3, "ft") * 2).value == 6
+        assert Quantity(1, "yd") / Quantity(1, "ft") == pytest.approx(3)
+        assert Quantity(1, "m") > Quantity(3, "ft")
+
+    def test_mixed_dimensions_raise(self):
+        with pytest.raises(ValueError):
+            Quantity(10, "ft") + Quantity(5, "gpm")
+        with pytest.raises(ValueError):
+            Quantity(10, "ft") + 5
+        with pytest.raises(ValueError):
+            Quantity(10, "ft").magnitude("cy")
+
+    def test_array_quantities(self):
+        lengths = Quantity([1, 2, 3], "m")
+        assert lengths.magnitude("mm") == pytest.approx([1000, 2000, 3000])
+        assert (lengths + Quantity(1, "m")).value == pytest.approx([2, 3, 4])
+
+    def test_parse_and_magnitude_forms(self):
+        assert parse_quantity("1,200 LF").value == 1200
+        assert magnitude(8, "in") == 8
+        assert magnitude("12", "in") == 12.0
+        assert magnitude("1 ft", "in") == pytest.approx(12)
+        assert magnitude({"value": 2, "unit": "ft"}, "in") == pytest.approx(24)
+        with pytest.raises(ValueError):
+            parse_quantity("deep")
+
+
+class TestAcceptsUnits:
+    def test_tools_accept_any_length_unit(self):
+        metric = trench_volume("30 m", 3, Quantity(1.5, "m"), pipe_od_in="200 mm")
+        m_ft, mm_in = conversion_factor("m", "ft"), conversion_factor("mm", "in")
+        imperial = trench_volume(30 * m_ft, 3, 1.5 * m_ft, pipe_od_in=200 * mm_in)
+        assert metric == imperial
+
+    def test_hydraulics_accept_metric_pipe_and_flow(self):
+        metric = normal_depth("300 mm", Quantity(20, "lps"), 0.005)
+        mm_in = conversion_factor("mm", "in")
+        imperial = normal_depth(300 * mm_in, 20 * conversion_factor("lps", "gpm"), 0.005)
+        assert metric["depth_ratio"] == pytest.approx(imperial["depth_ratio"])
+        batch = normal_depth_batch(Quantity([200, 300], "mm"), 300, 0.005)
+        assert batch["pipe_diameter_in"] == pytest.approx([200 * mm_in, 300 * mm_in], abs=1e-4)
+
+    def test_wrong_dimension_is_rejected(self):
+        with pytest.raises(ValueError):
+            trench_volume("30 gpm", 3, 5)
+        with pytest.raises(ValueError):
+            size_pipe(Quantity(300, "ft"))
+        with pytest.raises(ValueError):
+            earthwork_volumes([[1, 1], [1, 1]], 0, "10 psi")
+
+    def test_batch_lists_convert_element_wise(self):
+        mm_in = conversion_factor("mm", "in")
+        mixed = pipe_flow_full_batch(["8 in", Quantity(300, "mm"), {"value": 15, "unit": "in"}], [0.01] * 3)
+        plain = pipe_flow_full_batch([8, 300 * mm_in, 15], [0.01] * 3)
+        assert mixed == plain
+        numbers = [8.0, 12.0]
+        assert magnitude(numbers, "in") is numbers
+        with pytest.raises(ValueError):
+            pipe_flow_full_batch(["8 gpm"], [0.01])
+
+    def test_plain_numbers_pass_through(self):
+        assert asphalt_tonnage(1000, 3) == asphalt_tonnage(Quantity(1000, "sf"), "3 in")
+
+    def test_unknown_parameter_fails_at_decoration(self):
+        with pytest.raises(TypeError):
+            @accepts_units(depth_ft="ft")
+            def _tool(length_ft):
+                return length_ft
@@ -0,0 +1,252 @@
+"""Tests for schedule building, the CPM engine and resource leveling."""
+import pytest
+
+from tools.schedule.cpm import cpm_schedule, working_dates
+from tools.schedule.leveling import level_resources
+from tools.schedule.schedule_tools import build_schedule
+
+NETWORK = [
+    {"id": "A", "name": "Mobilize", "duration": 2},
+    {"id": "B", "name": "Trench", "duration": 5, "predecessors": ["A"]},
+    {"id": "C", "name": "Order structures", "duration": 3, "predecessors": ["A"]},
+    {"id": "D", "name": "Set structures", "duration": 2, "predecessors": ["B", "C"]},
+    {"id": "E", "name": "Restore", "duration": 1, "predecessors": ["D"]},
+]
+
+CREWS = {"excavator_crew": 2, "paving_crew": 1}
+STREETS = [
+    {"id": "MOB", "duration": 2},
+    {"id": "T1", "duration": 5, "predecessors": ["MOB"], "resources": {"excavator_crew": 1}},
+    {"id": "T2", "duration": 5, "predecessors": ["MOB"], "resources": {"excavator_crew": 1}},
+    {"id": "T3", "duration": 4, "predecessors": ["MOB"], "resources": {"excavator_crew": 1}},
+    {"id": "P1", "duration": 3, "predecessors": ["T1"], "resources": {"paving_crew": 1}},
+    {"id": "P2", "duration": 3, "predecessors": ["T2"], "resources": {"paving_crew": 1}},
+    {"id": "P3", "duration": 2, "predecessors": ["T3"], "resources": {"paving_crew": 1}},
+]
+
+
+def _by_id(result):
+    return {row["id"]: row for row in result["activities"]}
+
+
+class TestWorkingDates:
+    def test_skips_weekends_and_holidays(self):
+        days = working_dates("2026-07-02", 3, holidays=["2026-07-03"])
+        assert [d.isoformat() for d in days] == ["2026-07-02", "2026-07-06", "2026-07-07"]
+
+    def test_custom_workweek(self):
+        days = working_dates("2026-07-03", 3, workdays=["mon", "tue", "wed", "thu", "fri", "sat"])
+        assert [d.isoformat() for d in days] == ["2026-07-03", "2026-07-04", "2026-07-06"]
+
+
+class TestCPM:
+    def test_forward_backward_pass(self):
+        rows = _by_id(cpm_schedule(NETWORK, start_date="2026-03-02"))
+        assert (rows["B"]["es"], rows["B"]["ef"]) == (2, 7)
+        assert (rows["D"]["es"], rows["D"]["ef"]) == (7, 9)
+        assert (rows["C"]["ls"], rows["C"]["lf"]) == (4, 7)
+        assert rows["C"]["total_float"] == 2 and rows["C"]["free_float"] == 2
+        assert rows["B"]["total_float"] == 0
+
+    def test_critical_path_and_dates(self):
+        result = cpm_schedule(NETWORK, start_date="2026-03-02")
+        assert result["critical_path"] == ["A", "B", "D", "E"]
+        assert result["duration_workdays"] == 10
+        assert result["project_finish"] == "2026-03-13"
+        assert result["duration_calendar_days"] == 12
+        assert _by_id(result)["B"]["early_start"] == "2026-03-04"
+
+    def test_link_types_and_lags(self):
+        result = cpm_schedule([
+            {"id": "T", "duration": 10},
+            {"id": "P", "duration": 10, "predecessors": [{"id": "T", "type": "SS", "lag": 2}]},
+            {"id": "B", "duration": 4, "predecessors": [{"id": "P", "type": "FF", "lag": 1}]},
+            {"id": "S", "duration": 3, "predecessors": [{"id": "T", "type": "FS", "lag": -2}]},
+        ], start_date="2026-03-02")
+        rows = _by_id(result)
+        assert rows["P"]["es"] == 2
+        assert rows["B"]["ef"] == rows["P"]["ef"] + 1
+        assert rows["S"]["es"] == 8
+        assert result["duration_workdays"] == 13
+
+    def test_free_float_differs_from_total_float(self):
+        rows = _by_id(cpm_schedule([
+            {"id": "A", "duration": 5},
+            {"id": "X", "duration": 1},
+            {"id": "Y", "duration": 1, "predecessors": ["X"]},
+            {"id": "Z", "duration": 1, "predecessors": ["A", "Y"]},
+        ]))
+        assert rows["X"]["total_float"] == 3 and rows["X"]["free_float"] == 0
+        assert rows["Y"]["free_float"] == 3
+
+    def test_milestone_dates(self):
+        rows = _by_id(cpm_schedule([
+            {"id": "A", "duration": 3},
+            {"id": "M", "duration": 0, "predecessors": ["A"]},
+        ], start_date="2026-03-02"))
+        assert rows["M"]["early_start"] == rows["M"]["early_finish"] == "2026-03-05"
+
+    def test_invalid_networks(self):
+        with pytest.raises(ValueError, match="loop"):
+            cpm_schedule([{"id": "A", "duration": 1, "predecessors": ["B"]},
+                          {"id": "B", "duration": 1, "predecessors": ["A"]}])
+        with pytest.raises(ValueError):
+            cpm_schedule([{"id": "A", "duration": 1, "predecessors": ["Z"]}])
+        with pytest.raises(ValueError):
+            cpm_schedule([{"id": "A", "duration": 1}, {"id": "A", "duration": 2}])
+        with pytest.raises(ValueError):
+            cpm_schedule([{"id": "A", "duration": 1, "predecessors": [{"id": "A", "type": "XX"}]}])
+
+    def test_large_network(self):
+        activities = [{"id": "0", "duration": 1}]
+        for i in range(1, 10000):
+            preds = [str(i - 1)] + ([str(i - 7)] if i >= 7 else [])
+            activities.append({"id": str(i), "duration": 1 + i % 3, "predecessors": preds})
+        result = cpm_schedule(activities, start_date="2026-01-05")
+        assert result["activity_count"] == 10000
+        assert result["critical_path"][0] == "0"
+
+
+class TestBuildSchedule:
+    def test_even_split_is_unchanged(self):
+        result = build_schedule("Main St", 30, "2026-03-02", ["Mobilize", "Pipe", "Restore"])
+        assert [row["days"] for row in result["phases"]] == [10, 10, 10]
+        assert result["phases"][0]["start"] == "03/02/2026"
+        assert result["duration"] == 30
+
+    def test_activities_use_cpm(self):
+        result = build_schedule("Main St", 30, "2026-03-02", activities=NETWORK)
+        assert result["phases"][0]["phase"] == "Mobilize"
+        assert result["phases"][-1]["end"] == "03/13/2026"
+        assert result["duration"] == 12
+        assert result["cpm"]["critical_path"] == ["A", "B", "D", "E"]
+        assert "<th>Float</th>" in result["table_html"]
+
+    def test_capacities_level_activities(self):
+        result = build_schedule("Main St", 30, "2026-04-06", activities=STREETS, capacities=CREWS)
+        assert result["leveling"]["duration_workdays"] == 15
+        assert result["phases"][-1]["end"] == "04/24/2026"
+        assert "<th>Delay</th>" in result["table_html"]
+
+
+class TestResourceLeveling:
+    def test_crews_stay_within_capacity(self):
+        result = level_resources(STREETS, CREWS, start_date="2026-04-06")
+        rows = _by_id(result)
+        assert result["unleveled_duration_workdays"] == 10
+        assert result["duration_workdays"] == 15
+        assert rows["T3"]["start"] == 7 and rows["T3"]["delay_days"] == 5
+        assert result["histograms"]["excavator_crew"]["peak"] == 2
+        assert result["histograms"]["paving_crew"]["daily_units"] == [0] * 7 + [1] * 8
+        assert result["project_finish"] == "2026-04-24"
+
+    def test_unconstrained_matches_cpm(self):
+        result = level_resources(STREETS, {}, start_date="2026-04-06")
+        assert result["duration_workdays"] == result["unleveled_duration_workdays"] == 10
+        assert all(row["delay_days"] == 0 for row in result["activities"])
+        assert result["histograms"]["excavator_crew"]["peak"] == 3
+
+    def test_cost_curve_from_crew_day_cost(self):
+        from tools.calculations.bid_tools import crew_day_cost
+        paving = {"labor_items": [{"role": "Operator", "hours": 10, "rate": 80}],
+                  "equipment_items": [{"name": "Paver", "daily_rate": 1500}]}
+        result = level_resources(STREETS, CREWS, resource_costs={"excavator_crew": 2400, "paving_crew": paving})
+        paving_day = crew_day_cost(paving["labor_items"], paving["equipment_items"])["total_day_cost"]
+        assert result["resource_day_costs"]["paving_crew"] == paving_day
+        assert result["daily_cost"][2] == 4800
+        assert result["total_cost"] == pytest.approx(14 * 2400 + 8 * paving_day)
+        assert result["cumulative_cost"][-1] == result["total_cost"]
+        assert len(result["daily_cost"]) == len(result["dates"]) == 15
+
+    def test_links_hold_after_leveling(self):
+        result = level_resources([
+            {"id": "A", "duration": 4, "resources": {"crew": 1}},
+            {"id": "B", "duration": 4, "resources": {"crew": 1}},
+            {"id": "C", "duration": 3, "predecessors": [{"id": "A", "type": "SS", "lag": 1}]},
+            {"id": "D", "duration": 2, "predecessors": [{"id": "B", "type": "FF", "lag": 0}]},
+        ], {"crew": 1})
+        rows = _by_id(result)
+        assert rows["C"]["start"] >= rows["A"]["start"] + 1
+        assert rows["D"]["finish"] >= rows["B"]["finish"]
+        assert {rows["A"]["start"], rows["B"]["start"]} == {0, 4}
+
+    def test_invalid_inputs(self):
+        with pytest.raises(ValueError, match="only 1"):
+            level_resources([{"id": "A", "duration": 1, "resources": {"paving_crew": 2}}], CREWS)
+        with pytest.raises(ValueError):
+            level_resources(STREETS, CREWS, priority="random")
+
+    def test_profile_fit_matches_day_scan(self):
+        from tools.schedule.leveling import _Profile
+        usage = [2, 2, 1, 2, 0, 0, 1, 2, 2, 0, 0, 0]
+        profile = _Profile(4, usage)
+        for start in range(14):
+            for duration in range(1, 5):
+                for limit in (0, 1):
+                    expected = next(t for t in range(start, 40)
+                                    if all(day >= len(usage) or usage[day] <= limit for day in range(t, t + duration)))
+                    assert profile.fit(start, duration, limit) == expected
+        profile = profile.add(10, 20, 1)
+        assert profile.size >= 20 and profile.values()[:21] == usage[:10] + [1, 1] + [1] * 8 + [0]
+
+    def test_large_network_respects_capacity(self):
+        activities = []
+        for i in range(3000):
+            preds = [str(i - 10)] if i >= 10 else []
+            crew = "excavator_crew" if i % 3 else "paving_crew"
+            activities.append({"id": str(i), "duration": 1 + i % 4, "predecessors": preds, "resources": {crew: 1}})
+        result = level_resources(activities, CREWS, start_date="2026-01-05")
+        rows = _by_id(result)
+        for resource, capacity in CREWS.items():
+            assert result["histograms"][resource]["peak"] <= capacity
+        assert all(rows[str(i)]["start"] >= rows[str(i - 10)]["finish"] for i in range(10, 3000))
+        assert result["histograms"]["paving_crew"]["unit_days"] == sum(1 + i % 4 for i in range(0, 3000, 3))
+
+
+class TestProductionSchedule:
+    @pytest.fixture
+    def history(self, tmp_path, monkeypatch):
+        from tools.estimating import estimating_tools
+        from tools.heavybid.paths import write_jsonl
+
+        monkeypatch.setattr(estimating_tools, "HEAVYBID_NORMALIZED_DIR", tmp_path)
+        monkeypatch.setattr(estimating_tools, "_BID_ITEM_COLUMNS", {})
+        write_jsonl(tmp_path / "bid_items.jsonl", [
+            {"estimate_code": "JOB1", "description": "8 IN PVC SEWER MAIN", "unit": "LF", "quantity": 1200,
+             "manhours": 300},
+            {"estimate_code": "JOB1", "description": "MANHOLE 48 IN", "unit": "EA", "quantity": 6,
+             "manhours": 96},
+        ])
+        return estimating_tools
+
+    ITEMS = [
+        {"id": "SEWER", "description": "8 inch PVC sewer main", "quantity": 2000, "unit": "LF"},
+        {"id": "MH", "description": "Manhole 48 in", "quantity": 8, "unit": "EA"},
+        {"id": "PATCH", "description": "Asphalt patch", "quantity": 500, "unit": "SY", "units_per_manhour": 2.5},
+    ]
+
+    def test_durations_follow_history(self, history):
+        from tools.schedule.production import production_activities
+        derived = production_activities(self.ITEMS, crew_size=4, crew_rate_per_hr=60, hours_per_day=10)
+        rows = {row["id"]: row for row in derived["production"]}
+        assert rows["SEWER"]["production_rate_per_day"] == 160  # 4 LF/MH x 4 crew x 10 hr
+        assert rows["SEWER"]["duration_days"] == 13
+        assert rows["MH"]["duration_days"] == 4
+        assert rows["PATCH"]["source"] == "given" and rows["PATCH"]["duration_days"] == 5
+        assert derived["unmatched"] == []
+        assert derived["total_direct_cost"] == pytest.approx(sum(r["total_direct_cost"] for r in rows.values()))
+        assert derived["activities"][1]["predecessors"] == ["SEWER"]
+
+    def test_unmatched_items_keep_given_duration(self, history):
+        from tools.schedule.production import production_activities
+        derived = production_activities([{"id": "X", "description": "Traffic control", "quantity": 1,
+                                          "unit": "LS", "duration": 3}])
+        assert derived["unmatched"] == ["X"]
+        assert derived["activities"][0]["duration"] == 3
+
+    def test_schedule_runs_cpm(self, history):
+        from tools.schedule.production import production_schedule
+        result = production_schedule("Main St", self.ITEMS, start_date="2026-03-02")
+        assert result["cpm"]["duration_workdays"] == 13 + 4 + 5
+        assert result["cpm"]["critical_path"] == ["SEWER", "MH", "PATCH"]
+        assert len(result["production"]) == 3
@@ -0,0 +1,88 @@
+"""Tests for the gravity sewer network engine."""
+import json
+
+import pytest
+
+from tools.field.hydraulics import pipe_flow_full
+from tools.field.sewer_network import analyze_sewer_network
+
+
+def _segment(seg_id, up, down, diameter=8, length=300, up_inv=101.5, down_inv=100.0, material="pvc"):
+    return {
+        "id": seg_id, "upstream": up, "downstream": down, "diameter_in": diameter, "length_ft": length,
+        "upstream_invert": up_inv, "downstream_invert": down_inv, "material": material,
+    }
+
+
+@pytest.fixture
+def branched_network():
+    #  MH-A ─P1─┐
+    #           MH-C ─P3─ OUT
+    #  MH-B ─P2─┘
+    manholes = [
+        {"id": "MH-A", "inflow_gpm": 100},
+        {"id": "MH-B", "inflow_gpm": 150},
+        {"id": "MH-C", "inflow_gpm": 50},
+        {"id": "OUT"},
+    ]
+    segments = [
+        _segment("P3", "MH-C", "OUT", diameter=12, up_inv=100.0, down_inv=98.5),
+        _segment("P1", "MH-A", "MH-C", up_inv=103.0, down_inv=101.5),
+        _segment("P2", "MH-B", "MH-C", up_inv=103.0, down_inv=101.5),
+    ]
+    return manholes, segments
+
+
+class TestSewerNetwork:
+    def test_flows_accumulate_downstream(self, branched_network):
+        result = analyze_sewer_network(*branched_network)
+        flows = dict(zip(result["segments"]["id"], result["segments"]["flow_gpm"]))
+        assert flows == {"P3": 300.0, "P1": 100.0, "P2": 150.0}
+        assert result["segment_order"][-1] == "P3"
+        assert result["outfalls"] == [{"manhole": "OUT", "flow_gpm": 300.0}]
+
+    def test_capacity_uses_material_n(self, branched_network):
+        result = analyze_sewer_network(*branched_network)
+        index = result["segments"]["id"].index("P3")
+        expected = pipe_flow_full(12, 1.5 / 300, n=0.012)["flow_gpm"]
+        assert round(result["segments"]["capacity_gpm"][index], 1) == expected
+        assert result["segments"]["mannings_n"][index] == 0.012
+
+    def test_depth_ratio_and_velocity_in_range(self, branched_network):
+        result = analyze_sewer_network(*branched_network)
+        for y, v in zip(result["segments"]["depth_ratio"], result["segments"]["velocity_fps"]):
+            assert 0 < y < 0.75
+            assert 1.0 < v < 10.0
+
+    def test_surcharge_reported_as_critical(self, branched_network):
+        manholes, segments = branched_network
+        manholes[0]["inflow_gpm"] = 2000
+        result = analyze_sewer_network(manholes, segments, critical_count=1)
+        assert result["critical_segments"][0]["id"] == "P1"
+        assert "surcharged" in result["critical_segments"][0]["flags"]
+        assert result["summary"]["surcharged_count"] >= 1
+
+    def test_flow_splits_evenly_between_outlets(self):
+        manholes = [{"id": "A", "inflow_gpm": 200}, {"id": "B"}, {"id": "C"}]
+        segments = [_segment("AB", "A", "B"), _segment("AC", "A", "C")]
+        result = analyze_sewer_network(manholes, segments)
+        assert result["segments"]["flow_gpm"] == [100.0, 100.0]
+
+    def test_flat_segment_flagged(self):
+        manholes = [{"id": "A", "inflow_gpm": 50}, {"id": "B"}]
+        result = analyze_sewer_network(manholes, [_segment("AB", "A", "B", up_inv=100.0, down_inv=100.0)])
+        assert "adverse_or_flat_slope" in result["segments"]["flags"][0]
+        assert result["segments"]["surcharged"] == [True]
+        assert result["segments"]["utilization"] == [None]
+        json.dumps(result, allow_nan=False)
+
+    def test_loop_rejected(self):
+        manholes = [{"id": "A", "inflow_gpm": 10}, {"id": "B"}]
+        with pytest.raises(ValueError):
+            analyze_sewer_network(manholes, [_segment("AB", "A", "B"), _segment("BA", "B", "A")])
+
+    def test_unknown_material_rejected(self, branched_network):
+        manholes, segments = branched_network
+        segments[0]["material"] = "bamboo"
+        with pytest.raises(ValueError):
+            analyze_sewer_network(manholes, segments)
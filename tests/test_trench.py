@@ -1,7 +1,20 @@
 """Tests for trench and quantity tools."""
 import pytest
 
-from tools.field.trench import trench_volume, thrust_block, asphalt_tonnage, concrete_volume
+from tools.field.trench import (
+    trench_volume,
+    thrust_block,
+    asphalt_tonnage,
+    concrete_volume,
+    iter_trench_reaches,
+    trench_profile,
+    trench_volume_batch,
+    thrust_block_batch,
+    asphalt_tonnage_batch,
+    concrete_volume_batch,
+    quantity_table,
+    read_table_csv_file,
+)
 
 
 class TestTrenchVolume:
@@ -40,6 +53,67 @@ class TestTrenchVolume:
         assert result["backfill_cy"] >= 0
 
 
+class TestTrenchProfile:
+    def test_flat_profile_matches_trench_volume(self):
+        profile = trench_profile([(0, 105, 100), (250, 105, 100)], 3.0, pipe_od_in=8, method="shield")
+        box = trench_volume(250, 3.0, 5.5, pipe_od_in=8)
+        assert profile["totals"]["excavation_cy"] == pytest.approx(box["excavation_cy"], abs=0.01)
+        assert profile["totals"]["bedding_tons"] == pytest.approx(box["bedding_tons"], abs=0.01)
+        assert profile["totals"]["length_ft"] == 250
+
+    def test_reaches_break_at_station_interval(self):
+        reaches = list(iter_trench_reaches([(50, 104, 100), (320, 104, 100)], 3.0, reach_length_ft=100))
+        assert [(r["start_station"], r["end_station"]) for r in reaches] == [
+            (50, 100), (100, 200), (200, 300), (300, 320)
+        ]
+
+    def test_reaches_break_on_soil_change(self):
+        points = [(0, 108, 100, "A"), (60, 108, 100, "C"), (90, 108, 100)]
+        reaches = list(iter_trench_reaches(points, 3.0, reach_length_ft=0))
+        assert [r["soil_type"] for r in reaches] == ["A", "C"]
+        assert [r["length_ft"] for r in reaches] == [60, 30]
+
+    def test_osha_top_width_uses_soil_ratio(self):
+        # 8.5 ft deep (8 ft to invert + 6 in bedding): top width = 3 + 2 × h_ratio × 8.5
+        for soil, ratio in (("A", 0.75), ("B", 1.0), ("C", 1.5)):
+            result = trench_profile([(0, 108, 100), (100, 108, 100)], 3.0, soil_type=soil)
+            assert result["totals"]["max_top_width_ft"] == pytest.approx(3 + 2 * ratio * 8.5)
+            assert result["totals"]["excavation_cy"] == pytest.approx(100 * 8.5 * (3 + ratio * 8.5) / 27, abs=0.01)
+
+    def test_shallow_trench_keeps_vertical_walls(self):
+        result = trench_profile([(0, 103, 100), (100, 103, 100)], 3.0, soil_type="C")
+        assert result["totals"]["protective_system_required"] is False
+        assert result["totals"]["max_top_width_ft"] == 3.0
+
+    def test_varying_depth_matches_fine_integration(self):
+        points = [(0, 103, 100, "B"), (150, 110, 100, "B"), (220, 108, 101, "C"), (400, 104, 100, "C")]
+        expected_cf = 0.0
+        for (s0, g0, i0, soil), (s1, g1, i1, _) in zip(points, points[1:]):
+            ratio = {"B": 1.0, "C": 1.5}[soil]
+            steps = 4000
+            for j in range(steps):
+                t = (j + 0.5) / steps
+                depth = (g0 - i0) + ((g1 - i1) - (g0 - i0)) * t + 0.5
+                expected_cf += (s1 - s0) / steps * depth * (3.0 + (ratio * depth if depth > 4 else 0))
+        result = trench_profile(points, 3.0)
+        assert result["totals"]["excavation_cy"] == pytest.approx(expected_cf / 27, rel=1e-4)
+
+    def test_streams_from_a_generator(self):
+        points = ({"station": i * 10.0, "ground_elev": 106.0, "invert_elev": 100.0} for i in range(1001))
+        reaches = iter_trench_reaches(points, 3.0, method="shield")
+        first = next(reaches)
+        assert first["end_station"] == 100
+        assert sum(1 for _ in reaches) == 99
+
+    def test_invalid_profiles_raise(self):
+        with pytest.raises(ValueError):
+            trench_profile([(0, 105, 100), (0, 105, 100)], 3.0)
+        with pytest.raises(ValueError):
+            trench_profile([(0, 99, 100), (10, 105, 100)], 3.0)
+        with pytest.raises(ValueError):
+            trench_profile([(0, 105, 100, "D"), (10, 105, 100)], 3.0)
+
+
 class TestThrustBlock:
     def test_dead_end_higher_than_45_bend(self):
         dead = thrust_block(8, 150, "dead_end")
@@ -121,3 +195,88 @@ class TestConcreteVolume:
     def test_invalid_shape(self):
         with pytest.raises(ValueError):
             concrete_volume("pyramid", length_ft=10)
+
+
+class TestBatchCalculators:
+    def test_trench_batch_rows_match_scalar(self):
+        result = trench_volume_batch([100, 250, 40], [3.0, 3.5, 2.5], [5.0, 7.0, 4.0], pipe_od_in=[8, 0, 12])
+        assert result["count"] == 3
+        for i, (length, width, depth, od) in enumerate([(100, 3.0, 5.0, 8), (250, 3.5, 7.0, 0), (40, 2.5, 4.0, 12)]):
+            scalar = trench_volume(length, width, depth, pipe_od_in=od)
+            for key in ("excavation_cy", "backfill_cy", "bedding_tons", "spoil_cy"):
+                assert result["table"][key][i] == scalar[key]
+        assert result["totals"]["excavation_cy"] == pytest.approx(sum(result["table"]["excavation_cy"]))
+
+    def test_thrust_batch_rows_match_scalar(self):
+        fittings = ["90", "45", "tee", "dead_end", "11.25"]
+        result = thrust_block_batch(8, 150, fittings)
+        for i, fitting in enumerate(fittings):
+            scalar = thrust_block(8, 150, fitting)
+            assert result["table"]["thrust_lbf"][i] == scalar["thrust_lbf"]
+            assert result["table"]["fitting"][i] == scalar["fitting"]
+            assert result["table"]["concrete_volume_cy_18in_thick"][i] == scalar["concrete_volume_cy_18in_thick"]
+
+    def test_asphalt_batch_totals(self):
+        result = asphalt_tonnage_batch([1000, 2500], [3, 4], price_per_ton=[90, 105])
+        first = asphalt_tonnage(1000, 3, price_per_ton=90)
+        second = asphalt_tonnage(2500, 4, price_per_ton=105)
+        assert result["table"]["tons_with_waste"] == [first["tons_with_waste"], second["tons_with_waste"]]
+        assert result["totals"]["material_cost"] == pytest.approx(first["material_cost"] + second["material_cost"])
+
+    def test_concrete_batch_mixes_shapes(self):
+        result = concrete_volume_batch(
+            ["slab", "wall", "cylinder"],
+            length_ft=[10, 20, None], width_ft=[10, None, None], height_ft=[None, 4, 6],
+            od_ft=[None, None, 5], id_ft=[None, None, 4],
+        )
+        assert result["table"]["net_volume_cy"] == [
+            concrete_volume("slab", length_ft=10, width_ft=10)["net_volume_cy"],
+            concrete_volume("wall", length_ft=20, height_ft=4)["net_volume_cy"],
+            concrete_volume("cylinder", od_ft=5, id_ft=4, height_ft=6)["net_volume_cy"],
+        ]
+
+    def test_mismatched_columns_raise(self):
+        with pytest.raises(ValueError):
+            trench_volume_batch([100, 200], [3, 3, 3], 5)
+
+
+class TestQuantityTable:
+    def test_csv_with_blanks_and_passthrough_columns(self):
+        csv_text = "id,length_ft,width_ft,depth_ft,pipe_od_in\nR1,100,3,5,8\nR2,250,3.5,7,\n"
+        result = quantity_table("trench_volume", csv_text=csv_text)
+        assert result["calculator"] == "trench_volume"
+        assert result["table"]["id"] == ["R1", "R2"]
+        assert result["table"]["excavation_cy"][1] == trench_volume(250, 3.5, 7)["excavation_cy"]
+
+    def test_rows_input(self):
+        rows = [
+            {"id": "F1", "pipe_diameter_in": 8, "test_pressure_psi": 150, "fitting_type": "90"},
+            {"id": "F2", "pipe_diameter_in": 12, "test_pressure_psi": 150},
+        ]
+        result = quantity_table("thrust_block", rows=rows)
+        assert result["table"]["thrust_lbf"] == [
+            thrust_block(8, 150, "90")["thrust_lbf"],
+            thrust_block(12, 150)["thrust_lbf"],
+        ]
+
+    def test_csv_file_path(self, tmp_path):
+        path = tmp_path / "paving.csv"
+        path.write_text("area_sf,thickness_in\n1000,3\n500,4\n", encoding="utf-8")
+        result = quantity_table("asphalt_tonnage", columns=read_table_csv_file(path))
+        assert result["count"] == 2
+
+    def test_csv_text_is_never_opened_as_a_path(self, tmp_path):
+        path = tmp_path / "paving.csv"
+        path.write_text("area_sf,thickness_in\n1000,3\n", encoding="utf-8")
+        with pytest.raises(ValueError):
+            quantity_table("asphalt_tonnage", csv_text=str(path))
+
+    def test_invalid_tables_raise(self):
+        with pytest.raises(ValueError):
+            quantity_table("pipe_weight", rows=[{"a": 1}])
+        with pytest.raises(ValueError):
+            quantity_table("trench_volume", rows=[{"length_ft": 100, "width_ft": 3}])
+        with pytest.raises(ValueError):
+            quantity_table("trench_volume", columns={"length_ft": [100, 200], "width_ft": [3], "depth_ft": [5]})
+        with pytest.raises(ValueError):
+            quantity_table("concrete_volume", rows=[{"shape": "slab", "length_ft": 10}])
@@ -17,22 +17,66 @@ from .estimating import (
 )
 
 # Schedule & Proposal
-from .schedule import build_schedule, parse_phases
+from .schedule import (
+    build_schedule,
+    parse_phases,
+    cpm_schedule,
+    working_dates,
+    level_resources,
+    production_activities,
+    production_schedule,
+)
 from .proposal import render_proposal_html
 
 # Field engineering
-from .field.hydraulics import pipe_flow_full, pipe_flow_partial, minimum_slope, flow_to_slope
-from .field.trench import trench_volume, thrust_block, asphalt_tonnage, concrete_volume
+from .field.hydraulics import (
+    pipe_flow_full,
+    pipe_flow_partial,
+    minimum_slope,
+    flow_to_slope,
+    pipe_flow_full_batch,
+    pipe_flow_partial_batch,
+    minimum_slope_batch,
+    flow_to_slope_batch,
+    normal_depth,
+    normal_depth_batch,
+    partial_flow_ratios,
+    depth_ratio_from_flow_ratio,
+)
+from .field.sewer_network import analyze_sewer_network
+from .field.pipe_sizing import pipe_catalog, size_pipe, size_pipe_batch
+from .field.trench import (
+    trench_volume,
+    thrust_block,
+    asphalt_tonnage,
+    concrete_volume,
+    iter_trench_reaches,
+    trench_profile,
+    trench_volume_batch,
+    thrust_block_batch,
+    asphalt_tonnage_batch,
+    concrete_volume_batch,
+    quantity_table,
+)
+from .field.earthwork import earthwork_volumes, grid_from_points, read_grid_rows
 from .field.safety import trench_safety, competent_person_checklist
 
 # Calculations
-from .calculations.unit_converter import convert, bulk_convert, available_units
+from .calculations.unit_converter import convert, bulk_convert, available_units, conversion_factor, convert_array
+from .calculations.quantity import Quantity, parse_quantity, magnitude, accepts_units
 from .calculations.bid_tools import (
     markup_bid_price,
     unit_price,
     change_order_tm,
     production_rate,
     crew_day_cost,
+    bid_sensitivity,
+)
+from .calculations.change_orders import (
+    record_change_order,
+    record_tm_tickets,
+    change_order_total,
+    ledger_summary,
 )
 
 # Registry
@@ -49,6 +93,11 @@ __all__ = [
     "EQUIPMENT_RATES",
     # Schedule & Proposal
     "build_schedule",
+    "cpm_schedule",
+    "working_dates",
+    "level_resources",
+    "production_activities",
+    "production_schedule",
     "parse_phases",
     "render_proposal_html",
     # Field engineering
@@ -56,21 +105,54 @@ __all__ = [
     "pipe_flow_partial",
     "minimum_slope",
     "flow_to_slope",
+    "pipe_flow_full_batch",
+    "pipe_flow_partial_batch",
+    "minimum_slope_batch",
+    "flow_to_slope_batch",
+    "normal_depth",
+    "normal_depth_batch",
+    "partial_flow_ratios",
+    "depth_ratio_from_flow_ratio",
+    "analyze_sewer_network",
+    "pipe_catalog",
+    "size_pipe",
+    "size_pipe_batch",
     "trench_volume",
     "thrust_block",
     "asphalt_tonnage",
     "concrete_volume",
+    "iter_trench_reaches",
+    "trench_profile",
+    "trench_volume_batch",
+    "thrust_block_batch",
+    "asphalt_tonnage_batch",
+    "concrete_volume_batch",
+    "quantity_table",
+    "earthwork_volumes",
+    "grid_from_points",
+    "read_grid_rows",
     "trench_safety",
     "competent_person_checklist",
     # Calculations
     "convert",
     "bulk_convert",
     "available_units",
+    "conversion_factor",
+    "convert_array",
+    "Quantity",
+    "parse_quantity",
+    "magnitude",
+    "accepts_units",
     "markup_bid_price",
     "unit_price",
     "change_order_tm",
     "production_rate",
     "crew_day_cost",
+    "bid_sensitivity",
+    "record_change_order",
+    "record_tm_tickets",
+    "change_order_total",
+    "ledger_summary",
     # Registry
     "get_all_tools",
     "get_tool_schema",
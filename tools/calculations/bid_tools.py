@@ -3,6 +3,8 @@ Bid & Cost Calculation Tools
 Markup, unit price building, production rates, change orders, crew day costs.
 """
 
+import math
+
 
 def markup_bid_price(
     direct_cost: float,
@@ -89,6 +91,13 @@ def unit_price(
     }
 
 
+def _tm_markup(subtotal: float, overhead_profit_pct: float, bond_pct: float) -> tuple:
+    """(O&P, bond, total) on a T&M subtotal: O&P on cost, bond on cost plus O&P."""
+    op = subtotal * (overhead_profit_pct / 100)
+    bond = (subtotal + op) * (bond_pct / 100)
+    return op, bond, subtotal + op + bond
+
+
 def change_order_tm(
     labor_items: list,
     equipment_items: list,
@@ -119,10 +128,7 @@ def change_order_tm(
     labor_total = sum(item["hours"] * item["rate"] for item in labor_items)
     equip_total = sum(item["hours"] * item["rate"] for item in equipment_items)
     subtotal = labor_total + equip_total + material_cost
-    op = subtotal * (overhead_profit_pct / 100)
-    subtotal_plus_op = subtotal + op
-    bond = subtotal_plus_op * (bond_pct / 100)
-    total = subtotal_plus_op + bond
+    op, bond, total = _tm_markup(subtotal, overhead_profit_pct, bond_pct)
 
     return {
         "labor_items": [
@@ -232,3 +238,138 @@ def crew_day_cost(
         "overhead": round(overhead, 2),
         "total_day_cost": round(total, 2),
     }
+
+
+def _sweep_values(spec, name: str) -> list:
+    """A swept parameter as a list: a scalar, a list of values, or {"start", "stop", "step"}."""
+    if isinstance(spec, dict):
+        start, stop, step = float(spec["start"]), float(spec["stop"]), float(spec.get("step", 1))
+        if step <= 0 or stop < start:
+            raise ValueError(f"{name} range needs step > 0 and stop >= start")
+        return [round(start + i * step, 6) for i in range(math.floor((stop - start) / step + 1e-9) + 1)]
+    values = [float(v) for v in spec] if isinstance(spec, (list, tuple, range)) else [float(spec)]
+    if not values:
+        raise ValueError(f"{name} needs at least one value")
+    return values
+
+
+def _item_costs(item: dict) -> tuple:
+    """Extended (direct, material) cost of one bid item, from unit costs or a lump direct_cost."""
+    if "direct_cost" in item:
+        return float(item["direct_cost"]), float(item.get("material_cost", 0))
+    quantity = float(item.get("quantity", 1))
+    material = float(item.get("material_per_unit", 0))
+    direct = (material + float(item.get("labor_per_unit", 0)) + float(item.get("equipment_per_unit", 0))
+              + float(item.get("subcontractor_per_unit", 0)))
+    return direct * quantity, material * quantity
+
+
+def _contour(overheads: list, base: float, material: float, price: float) -> list:
+    """Material escalation (%) at which overhead-loaded cost reaches ``price``, for each overhead."""
+    points = []
+    for oh in overheads:
+        escalation = (price / (1 + oh / 100) - base) / material * 100 if material > 0 else None
+        points.append({
+            "overhead_pct": oh,
+            "escalation_pct": None if escalation is None else round(escalation, 3),
+        })
+    return points
+
+
+def bid_sensitivity(
+    items: list,
+    overhead_pct=None,
+    profit_pct=None,
+    escalation_pct=0,
+    reference_bid: float = None,
+    target_margin_pct: float = None,
+) -> dict:
+    """
+    Sweep overhead, profit and material escalation over a whole bid.
+
+    Every item carries the same markups as unit_price and markup_bid_price;
+    escalation raises material cost only. Because the bid total is linear in
+    item cost, the items are summed once and the grid is priced from the two
+    sums, so a 10,000-point sweep costs the same for 5 items or 5,000.
+
+    Args:
+        items: Bid items, each either unit costs like unit_price (material_per_unit,
+            labor_per_unit, equipment_per_unit, subcontractor_per_unit, quantity) or
+            {"direct_cost", "material_cost"} lump sums
+        overhead_pct: Overhead % values — a scalar, a list, or {"start", "stop", "step"}
+            (default 8–18% by 1)
+        profit_pct: Profit % values in the same forms (default 5–15% by 1)
+        escalation_pct: Material escalation % values in the same forms (default 0)
+        reference_bid: Optional price to measure against (engineer's estimate or expected low bid)
+        target_margin_pct: Margin on the reference bid for the target contour (needs reference_bid)
+
+    Returns:
+        dict with item totals, the swept values, a flat grid (one row per
+        overhead × profit × escalation point, escalation fastest) of bid totals,
+        profit and margins, and — with a reference bid — break-even and
+        target-margin contours as escalation % for each overhead %
+    """
+    if not items:
+        raise ValueError("items must contain at least one bid item")
+    overheads = _sweep_values({"start": 8, "stop": 18} if overhead_pct is None else overhead_pct, "overhead_pct")
+    profits = _sweep_values({"start": 5, "stop": 15} if profit_pct is None else profit_pct, "profit_pct")
+    escalations = _sweep_values(escalation_pct, "escalation_pct")
+    if target_margin_pct is not None and reference_bid is None:
+        raise ValueError("target_margin_pct needs a reference_bid")
+
+    base = material = 0.0
+    for item in items:
+        direct, item_material = _item_costs(item)
+        base += direct
+        material += item_material
+    costs = [base + material * e / 100 for e in escalations]
+
+    oh_col, profit_col, esc_col, cost_col, bid_col, profit_amt, margin_col = [], [], [], [], [], [], []
+    for oh in overheads:
+        loaded = [cost * (1 + oh / 100) for cost in costs]
+        for p in profits:
+            rate = p / 100
+            margin = round(rate / (1 + rate) * 100, 2)
+            for e, cost, loaded_cost in zip(escalations, costs, loaded):
+                bid = loaded_cost * (1 + rate)
+                oh_col.append(oh)
+                profit_col.append(p)
+                esc_col.append(e)
+                cost_col.append(cost)
+                bid_col.append(bid)
+                profit_amt.append(bid - loaded_cost)
+                margin_col.append(margin)
+
+    result = {
+        "item_count": len(items),
+        "direct_cost": round(base, 2),
+        "material_cost": round(material, 2),
+        "overhead_pct": overheads,
+        "profit_pct": profits,
+        "escalation_pct": escalations,
+        "shape": [len(overheads), len(profits), len(escalations)],
+        "grid": {
+            "overhead_pct": oh_col,
+            "profit_pct": profit_col,
+            "escalation_pct": esc_col,
+            "direct_cost": cost_col,
+            "bid_total": bid_col,
+            "profit": profit_amt,
+            "margin_on_bid_pct": margin_col,
+        },
+        "min_bid": round(min(bid_col), 2),
+        "max_bid": round(max(bid_col), 2),
+    }
+    if reference_bid is not None:
+        if reference_bid <= 0:
+            raise ValueError("reference_bid must be greater than 0")
+        result["reference_bid"] = reference_bid
+        result["grid"]["reference_margin_pct"] = [
+            (reference_bid - (bid - gain)) / reference_bid * 100 for bid, gain in zip(bid_col, profit_amt)
+        ]
+        result["under_reference_count"] = sum(1 for bid in bid_col if bid <= reference_bid)
+        result["break_even"] = _contour(overheads, base, material, reference_bid)
+        if target_margin_pct is not None:
+            result["target_margin_pct"] = target_margin_pct
+            result["target_margin"] = _contour(overheads, base, material, reference_bid * (1 - target_margin_pct / 100))
+    return result
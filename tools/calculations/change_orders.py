@@ -0,0 +1,278 @@
+"""
+Change-Order Ledger
+An append-only JSONL file of change-order headers and daily T&M tickets, priced
+with the same O&P and bond rules as change_order_tm.
+
+Each ledger file is folded into per-CO daily sums once per process; later calls
+read only the bytes appended since, so "CO total as of a date" is a binary
+search over cached running totals rather than a rescan of every ticket.
+"""
+import json
+from bisect import bisect_left, bisect_right, insort
+from datetime import date
+from pathlib import Path
+
+from .bid_tools import _tm_markup
+
+DEFAULT_OVERHEAD_PROFIT_PCT = 15.0
+DEFAULT_BOND_PCT = 1.0
+
+_LEDGERS: dict = {}
+
+
+def _iso_date(value) -> str:
+    if isinstance(value, date):
+        return value.isoformat()
+    try:
+        return date.fromisoformat(str(value)).isoformat()
+    except ValueError:
+        raise ValueError(f"Dates must be ISO YYYY-MM-DD, got '{value}'") from None
+
+
+def _items_cost(items) -> float:
+    return sum(float(item["hours"]) * float(item["rate"]) for item in items or [])
+
+
+def _new_change_order() -> dict:
+    return {"header": {}, "dates": [], "daily": {}, "running": [], "dirty": 0, "tickets": 0}
+
+
+def _apply(state: dict, record: dict) -> None:
+    """Fold one ledger record into the cached per-CO aggregates."""
+    co = state["change_orders"].setdefault(record["co_number"], _new_change_order())
+    if record["type"] == "change_order":
+        co["header"] = record
+        return
+    ticket_id = record.get("ticket_id")
+    if ticket_id:
+        if ticket_id in state["ticket_ids"]:
+            return
+        state["ticket_ids"].add(ticket_id)
+    day = record["date"]
+    sums = co["daily"].get(day)
+    if sums is None:
+        sums = co["daily"][day] = [0.0, 0.0, 0.0, 0]
+        position = bisect_right(co["dates"], day)
+        insort(co["dates"], day)
+        co["dirty"] = min(co["dirty"], position)
+    else:
+        co["dirty"] = min(co["dirty"], bisect_left(co["dates"], day))
+    sums[0] += record["labor_cost"]
+    sums[1] += record["equipment_cost"]
+    sums[2] += record["material_cost"]
+    sums[3] += 1
+    co["tickets"] += 1
+
+
+def _load(path) -> dict:
+    """Cached aggregates for a ledger file, catching up on any records appended since the last call."""
+    path = Path(path)
+    key = str(path.resolve())
+    try:
+        stat = path.stat()
+    except OSError:
+        stat = None
+    state = _LEDGERS.get(key)
+    if state is None or stat is None or stat.st_ino != state["inode"] or stat.st_size < state["offset"]:
+        state = _LEDGERS[key] = {
+            "inode": stat.st_ino if stat else None,
+            "offset": 0,
+            "change_orders": {},
+            "ticket_ids": set(),
+        }
+    if stat is None or stat.st_size == state["offset"]:
+        return state
+    with path.open("rb") as handle:
+        handle.seek(state["offset"])
+        for line in handle:
+            if not line.endswith(b"\n"):
+                break  # a write in progress; pick it up next time
+            state["offset"] += len(line)
+            if line.strip():
+                _apply(state, json.loads(line))
+    return state
+
+
+def _append(path, records: list) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a", encoding="utf-8") as handle:
+        for record in records:
+            handle.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+
+def _running_totals(co: dict) -> list:
+    """Cumulative [labor, equipment, material, tickets] through each date, refreshed from the first changed date."""
+    dates, running = co["dates"], co["running"]
+    start = co["dirty"]
+    del running[start:]
+    labor, equipment, material, tickets = running[-1] if running else (0.0, 0.0, 0.0, 0)
+    for day in dates[start:]:
+        sums = co["daily"][day]
+        labor += sums[0]
+        equipment += sums[1]
+        material += sums[2]
+        tickets += sums[3]
+        running.append((labor, equipment, material, tickets))
+    co["dirty"] = len(dates)
+    return running
+
+
+def _priced(co_number: str, co: dict, as_of: str | None) -> dict:
+    header = co["header"]
+    running = _running_totals(co)
+    index = len(running) if as_of is None else bisect_right(co["dates"], as_of)
+    labor, equipment, material, tickets = running[index - 1] if index else (0.0, 0.0, 0.0, 0)
+    overhead_profit_pct = header.get("overhead_profit_pct", DEFAULT_OVERHEAD_PROFIT_PCT)
+    bond_pct = header.get("bond_pct", DEFAULT_BOND_PCT)
+    subtotal = labor + equipment + material
+    op, bond, total = _tm_markup(subtotal, overhead_profit_pct, bond_pct)
+    return {
+        "co_number": co_number,
+        "description": header.get("description", ""),
+        "status": header.get("status", "pending"),
+        "ticket_count": tickets,
+        "first_date": co["dates"][0] if index else None,
+        "last_date": co["dates"][index - 1] if index else None,
+        "labor_total": round(labor, 2),
+        "equipment_total": round(equipment, 2),
+        "material_cost": round(material, 2),
+        "subtotal": round(subtotal, 2),
+        "overhead_profit_pct": overhead_profit_pct,
+        "overhead_profit": round(op, 2),
+        "bond_pct": bond_pct,
+        "bond": round(bond, 2),
+        "change_order_total": round(total, 2),
+    }
+
+
+def record_change_order(
+    ledger_path,
+    co_number: str,
+    description: str = "",
+    overhead_profit_pct: float = DEFAULT_OVERHEAD_PROFIT_PCT,
+    bond_pct: float = DEFAULT_BOND_PCT,
+    status: str = "pending",
+) -> dict:
+    """
+    Open a change order, or append a revised header (status, markups) for an existing one.
+
+    Args:
+        ledger_path: JSONL ledger file (created if missing)
+        co_number: Change order number, e.g. "CO-012"
+        description: Scope description
+        overhead_profit_pct: Combined O&P percentage for this CO's tickets
+        bond_pct: Bond premium percentage
+        status: "pending", "approved", "rejected", etc.
+
+    Returns:
+        dict with the CO's priced totals under the new header
+    """
+    co_number = str(co_number).strip()
+    if not co_number:
+        raise ValueError("co_number is required")
+    record = {
+        "type": "change_order",
+        "co_number": co_number,
+        "description": description,
+        "overhead_profit_pct": float(overhead_profit_pct),
+        "bond_pct": float(bond_pct),
+        "status": status,
+    }
+    _append(ledger_path, [record])
+    state = _load(ledger_path)
+    return _priced(co_number, state["change_orders"][co_number], None)
+
+
+def record_tm_tickets(ledger_path, tickets: list) -> dict:
+    """
+    Append daily T&M tickets to the ledger.
+
+    Args:
+        ledger_path: JSONL ledger file (created if missing)
+        tickets: List of dicts: {"co_number", "date" (YYYY-MM-DD), "ticket_id" (optional),
+            "labor_items", "equipment_items", "material_cost"}; items use the
+            change_order_tm form [{"description", "hours", "rate"}]
+
+    Returns:
+        dict with appended and duplicate counts (tickets whose ticket_id is
+        already in the ledger are skipped) and the CO numbers touched
+    """
+    state = _load(ledger_path)
+    seen = set(state["ticket_ids"])
+    records, duplicates = [], []
+    for ticket in tickets:
+        co_number = str(ticket.get("co_number", "")).strip()
+        if not co_number:
+            raise ValueError("Every ticket needs a co_number")
+        ticket_id = ticket.get("ticket_id")
+        if ticket_id:
+            ticket_id = str(ticket_id)
+            if ticket_id in seen:
+                duplicates.append(ticket_id)
+                continue
+            seen.add(ticket_id)
+        records.append({
+            "type": "ticket",
+            "co_number": co_number,
+            "date": _iso_date(ticket["date"]),
+            "ticket_id": ticket_id,
+            "labor_cost": _items_cost(ticket.get("labor_items")),
+            "equipment_cost": _items_cost(ticket.get("equipment_items")),
+            "material_cost": float(ticket.get("material_cost", 0) or 0),
+            "labor_items": ticket.get("labor_items") or [],
+            "equipment_items": ticket.get("equipment_items") or [],
+        })
+    if records:
+        _append(ledger_path, records)
+        _load(ledger_path)
+    return {
+        "appended": len(records),
+        "duplicates": duplicates,
+        "change_orders": sorted({record["co_number"] for record in records}),
+    }
+
+
+def change_order_total(ledger_path, co_number: str, as_of=None) -> dict:
+    """
+    Priced T&M total of one change order from its tickets dated on or before ``as_of``.
+
+    Args:
+        ledger_path: JSONL ledger file
+        co_number: Change order number
+        as_of: ISO date or datetime.date (default: all tickets)
+
+    Returns:
+        dict in the change_order_tm shape (labor, equipment, material, O&P, bond, total)
+        plus ticket count and date span
+    """
+    co = _load(ledger_path)["change_orders"].get(str(co_number).strip())
+    if co is None:
+        return {"co_number": co_number, "error": f"Change order '{co_number}' not found."}
+    return _priced(str(co_number).strip(), co, None if as_of is None else _iso_date(as_of))
+
+
+def ledger_summary(ledger_path, as_of=None, status: str = "") -> dict:
+    """
+    Per-CO and job totals for every change order in the ledger as of a date.
+
+    Args:
+        ledger_path: JSONL ledger file
+        as_of: ISO date or datetime.date (default: all tickets)
+        status: Only include change orders with this status (default: all)
+
+    Returns:
+        dict with a row per change order and job-wide sums of each total
+    """
+    as_of = None if as_of is None else _iso_date(as_of)
+    rows = []
+    for co_number, co in sorted(_load(ledger_path)["change_orders"].items()):
+        row = _priced(co_number, co, as_of)
+        if status and row["status"] != status:
+            continue
+        rows.append(row)
+    keys = ("labor_total", "equipment_total", "material_cost", "subtotal", "overhead_profit", "bond",
+            "change_order_total")
+    totals = {key: round(sum(row[key] for row in rows), 2) for key in keys}
+    totals["ticket_count"] = sum(row["ticket_count"] for row in rows)
+    return {"as_of": as_of, "change_order_count": len(rows), "change_orders": rows, "totals": totals}
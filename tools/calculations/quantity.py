@@ -0,0 +1,209 @@
+"""
+Unit-Aware Quantities
+A small quantity type over the unit_converter tables. Tools keep their bare-float
+parameters (diameter_in, length_ft, flow_gpm, ...) for the numeric path; the
+accepts_units decorator lets callers pass a Quantity, a {"value", "unit"} dict or
+a string like "30 m" instead, converting it once at the boundary and rejecting
+units of the wrong dimension.
+"""
+import functools
+import inspect
+import re
+
+from .unit_converter import UNIT_CATEGORIES, conversion_factor
+
+# Spellings seen in takeoffs and chat that map onto unit_converter keys.
+UNIT_ALIASES = {
+    "lf": "ft", "feet": "ft", "foot": "ft", "'": "ft",
+    "inch": "in", "inches": "in", '"': "in",
+    "yard": "yd", "yards": "yd",
+    "meter": "m", "meters": "m", "metre": "m", "metres": "m",
+    "sqft": "sf", "sq_ft": "sf", "ft2": "sf", "sqyd": "sy", "sq_yd": "sy", "m2": "sm",
+    "cuyd": "cy", "cu_yd": "cy", "yd3": "cy", "cuft": "cf", "ft3": "cf",
+    "gallon": "gal", "gallons": "gal", "liters": "liter", "l": "liter",
+    "lbs": "lb", "pound": "lb", "pounds": "lb",
+    "ton": "ton_short", "tons": "ton_short", "tn": "ton_short", "tonne": "ton_metric", "t": "ton_metric",
+}
+
+_QUANTITY_PATTERN = re.compile(r"^\s*([-+]?[\d,]*\.?\d+(?:[eE][-+]?\d+)?)\s*(.+?)\s*$")
+
+
+def canonical_unit(unit: str) -> tuple:
+    """Resolve a unit spelling to (unit_converter key, category)."""
+    key = str(unit).strip().lower().replace(" ", "_")
+    key = UNIT_ALIASES.get(key, key)
+    category = UNIT_CATEGORIES.get(key)
+    if category is None:
+        raise ValueError(f"Unknown or ambiguous unit '{unit}'")
+    return key, category
+
+
+@functools.lru_cache(maxsize=None)
+def _factor(from_unit: str, to_unit: str, category: str) -> float:
+    return conversion_factor(from_unit, to_unit, category)
+
+
+class Quantity:
+    """
+    A value (or a list of values) with a unit.
+
+    Adding or subtracting converts the right-hand side into the left-hand
+    unit; mixing dimensions (a length plus a flow) raises ValueError.
+    Multiplying or dividing by a plain number scales the value.
+    """
+
+    __slots__ = ("value", "unit", "category")
+
+    def __init__(self, value, unit: str):
+        self.unit, self.category = canonical_unit(unit)
+        self.value = list(value) if isinstance(value, (list, tuple, range)) else value
+
+    @property
+    def is_array(self) -> bool:
+        return isinstance(self.value, list)
+
+    def magnitude(self, unit: str):
+        """The bare value in ``unit``; a list for array quantities."""
+        target, category = canonical_unit(unit)
+        if category != self.category:
+            raise ValueError(f"Cannot express {self.category} '{self.unit}' in {category} '{target}'")
+        if target == self.unit:
+            return list(self.value) if self.is_array else self.value
+        factor = _factor(self.unit, target, category)
+        return [v * factor for v in self.value] if self.is_array else self.value * factor
+
+    def to(self, unit: str) -> "Quantity":
+        return Quantity(self.magnitude(unit), unit)
+
+    def as_dict(self) -> dict:
+        return {"value": self.value, "unit": self.unit}
+
+    def _combine(self, other, sign: int) -> "Quantity":
+        if not isinstance(other, Quantity):
+            raise ValueError(f"Cannot combine a {self.category} quantity with a bare number; give it a unit")
+        theirs = other.magnitude(self.unit)
+        if self.is_array or isinstance(theirs, list):
+            left = self.value if self.is_array else [self.value] * len(theirs)
+            right = theirs if isinstance(theirs, list) else [theirs] * len(left)
+            if len(left) != len(right):
+                raise ValueError("Array quantities must have matching lengths")
+            return Quantity([a + sign * b for a, b in zip(left, right)], self.unit)
+        return Quantity(self.value + sign * theirs, self.unit)
+
+    def __add__(self, other):
+        return self._combine(other, 1)
+
+    def __sub__(self, other):
+        return self._combine(other, -1)
+
+    def __mul__(self, scale):
+        if isinstance(scale, Quantity):
+            return NotImplemented
+        return Quantity([v * scale for v in self.value] if self.is_array else self.value * scale, self.unit)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, scale):
+        if isinstance(scale, Quantity):
+            ratio = scale.magnitude(self.unit)
+            if self.is_array or isinstance(ratio, list):
+                raise ValueError("Divide array quantities element-wise with magnitude()")
+            return self.value / ratio
+        return self * (1 / scale)
+
+    def __neg__(self):
+        return self * -1
+
+    def __eq__(self, other):
+        if not isinstance(other, Quantity) or other.category != self.category:
+            return NotImplemented
+        return self.value == other.magnitude(self.unit)
+
+    def __lt__(self, other):
+        return self.value < other.magnitude(self.unit)
+
+    def __le__(self, other):
+        return self.value <= other.magnitude(self.unit)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Quantity({self.value!r}, {self.unit!r})"
+
+
+def parse_quantity(text: str) -> Quantity:
+    """Parse text like '30 m', '12in' or '1,200 LF' into a Quantity."""
+    match = _QUANTITY_PATTERN.match(str(text))
+    if not match:
+        raise ValueError(f"Cannot read a quantity from '{text}'")
+    return Quantity(float(match.group(1).replace(",", "")), match.group(2))
+
+
+def magnitude(value, unit: str):
+    """
+    Bare number (or list) in ``unit`` for any accepted quantity form.
+
+    Plain numbers and lists of numbers are assumed to already be in ``unit``
+    and pass straight through. Quantities, {"value", "unit"} dicts and strings
+    such as "30 m" are converted, including element by element inside a list.
+    """
+    if isinstance(value, (list, tuple)):
+        if any(isinstance(item, (Quantity, dict, str)) for item in value):
+            return [magnitude(item, unit) for item in value]
+        return value
+    if isinstance(value, Quantity):
+        return value.magnitude(unit)
+    if isinstance(value, dict) and "unit" in value:
+        return Quantity(value["value"], value["unit"]).magnitude(unit)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return parse_quantity(value).magnitude(unit)
+    return value
+
+
+def accepts_units(**units):
+    """
+    Let a float-based tool take quantities in any compatible unit.
+
+    Map each parameter to the unit its bare-float value is in, e.g.
+    ``@accepts_units(length_ft="ft", pipe_od_in="in")``. Numbers and numeric
+    lists pass through untouched, so the numeric path is unchanged; anything
+    else, including lists holding quantities or strings, is converted with
+    ``magnitude`` before the call.
+    """
+    for unit in units.values():
+        canonical_unit(unit)
+
+    def decorate(function):
+        names = list(inspect.signature(function).parameters)
+        missing = set(units) - set(names)
+        if missing:
+            raise TypeError(f"{function.__name__} has no parameter(s) {sorted(missing)}")
+        positions = [(index, name, units[name]) for index, name in enumerate(names) if name in units]
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if args:
+                converted = None
+                for index, name, unit in positions:
+                    if index >= len(args):
+                        break
+                    arg = args[index]
+                    if arg.__class__ not in (int, float):
+                        if converted is None:
+                            converted = list(args)
+                        converted[index] = magnitude(arg, unit)
+                if converted is not None:
+                    args = tuple(converted)
+            for name, value in kwargs.items():
+                unit = units.get(name)
+                if unit is not None and value.__class__ not in (int, float):
+                    kwargs[name] = magnitude(value, unit)
+            return function(*args, **kwargs)
+
+        wrapper.units = dict(units)
+        return wrapper
+
+    return decorate
@@ -1,6 +1,8 @@
 """
 Construction Unit Converter
 Common unit conversions for heavy civil: volume, area, weight, pressure, length, flow rate, earthwork.
+Factors are compiled into a from→to matrix per category at import; volume and
+weight are bridged by material densities for CY↔ton takeoffs.
 """
 
 # Conversion factors — all relative to a base unit for each category
@@ -87,7 +89,98 @@ CATEGORIES = {
 }
 
 
-def convert(value: float, from_unit: str, to_unit: str, category: str) -> dict:
+# Material densities (short tons per CY) for volume↔weight conversions, shared
+# with the trench takeoff; asphalt is dense-graded HMA at its in-place density.
+ASPHALT_DENSITY_LBCF = 145
+CRUSHED_ROCK_TONS_PER_CY = 1.35  # approx for crushed rock
+SOIL_TONS_PER_CY = 1.4  # approximate, excavated native
+MATERIAL_DENSITIES = {
+    "crushed_rock": CRUSHED_ROCK_TONS_PER_CY,
+    "aggregate": CRUSHED_ROCK_TONS_PER_CY,
+    "bedding": CRUSHED_ROCK_TONS_PER_CY,
+    "soil": SOIL_TONS_PER_CY,
+    "spoil": SOIL_TONS_PER_CY,
+    "asphalt": ASPHALT_DENSITY_LBCF * 27 / 2000,
+    "hma": ASPHALT_DENSITY_LBCF * 27 / 2000,
+}
+
+
+def _compile(units: dict) -> dict:
+    """from→to factor matrix for one category: result = value × matrix[from][to]."""
+    return {src: {dst: units[dst] / units[src] for dst in units} for src in units}
+
+
+MATRICES = {category: _compile(units) for category, units in CATEGORIES.items()}
+
+# Unit → category for units that belong to exactly one category, so the category can be omitted.
+UNIT_CATEGORIES = {}
+for _category, _units in CATEGORIES.items():
+    for _unit in _units:
+        UNIT_CATEGORIES[_unit] = None if _unit in UNIT_CATEGORIES else _category
+
+_LB_PER_SHORT_TON = 2000.0
+
+
+def _category_units(category: str) -> dict:
+    cat = category.lower()
+    if cat not in MATRICES:
+        raise ValueError(f"Unknown category '{category}'. Choose from: {list(CATEGORIES.keys())}")
+    return MATRICES[cat]
+
+
+def _unit_category(unit: str) -> str:
+    category = UNIT_CATEGORIES.get(unit)
+    if category is None:
+        raise ValueError(f"Unknown or ambiguous unit '{unit}'; pass a category")
+    return category
+
+
+def conversion_factor(from_unit: str, to_unit: str, category: str = None, material: str = None) -> float:
+    """
+    Multiplier that converts from_unit to to_unit.
+
+    Within a category the factor comes straight from the compiled matrix. A
+    volume↔weight pair (e.g. 'cy' → 'ton_short') goes through the material's
+    density from MATERIAL_DENSITIES.
+
+    Args:
+        from_unit: Unit key to convert from
+        to_unit: Unit key to convert to
+        category: Category of both units; inferred from the units when omitted
+        material: MATERIAL_DENSITIES key, required for volume↔weight conversions
+
+    Returns:
+        float factor such that result = value × factor
+    """
+    src = from_unit.lower()
+    dst = to_unit.lower()
+    if category is not None:
+        matrix = _category_units(category)
+        row = matrix.get(src)
+        if row is None:
+            raise ValueError(f"Unknown unit '{from_unit}' in category '{category}'. Available: {list(matrix.keys())}")
+        if dst not in row:
+            raise ValueError(f"Unknown unit '{to_unit}' in category '{category}'. Available: {list(matrix.keys())}")
+        return row[dst]
+
+    src_category = _unit_category(src)
+    dst_category = _unit_category(dst)
+    if src_category == dst_category:
+        return MATRICES[src_category][src][dst]
+    if {src_category, dst_category} != {"volume", "weight"}:
+        raise ValueError(f"No conversion path from {src_category} '{from_unit}' to {dst_category} '{to_unit}'")
+    if material is None:
+        raise ValueError(f"Converting {src_category} to {dst_category} needs a material: {list(MATERIAL_DENSITIES)}")
+    density = MATERIAL_DENSITIES.get(str(material).lower())
+    if density is None:
+        raise ValueError(f"Unknown material '{material}'. Available: {list(MATERIAL_DENSITIES.keys())}")
+    lb_per_cy = density * _LB_PER_SHORT_TON
+    if src_category == "volume":
+        return MATRICES["volume"][src]["cy"] * lb_per_cy * MATRICES["weight"]["lb"][dst]
+    return MATRICES["weight"][src]["lb"] / lb_per_cy * MATRICES["volume"]["cy"][dst]
+
+
+def convert(value: float, from_unit: str, to_unit: str, category: str, material: str = None) -> dict:
     """
     Convert a value between units within a category.
 
@@ -95,7 +188,9 @@ def convert(value: float, from_unit: str, to_unit: str, category: str) -> dict:
         value: Numeric value to convert
         from_unit: Unit key to convert from (e.g. 'cy', 'gpm', 'psi')
         to_unit: Unit key to convert to
-        category: 'volume', 'area', 'weight', 'pressure', 'length', 'flow', 'earthwork'
+        category: 'volume', 'area', 'weight', 'pressure', 'length', 'flow', 'earthwork',
+            or 'material' for a volume↔weight conversion through a density
+        material: MATERIAL_DENSITIES key when category is 'material' (e.g. 'crushed_rock', 'asphalt')
 
     Returns:
         dict with converted value and metadata
@@ -104,29 +199,53 @@ def convert(value: float, from_unit: str, to_unit: str, category: str) -> dict:
         >>> convert(10, 'cy', 'cf', 'volume')
         {'value': 10, 'from_unit': 'cy', 'to_unit': 'cf', 'result': 270.0, ...}
     """
-    cat = category.lower()
-    if cat not in CATEGORIES:
-        raise ValueError(f"Unknown category '{category}'. Choose from: {list(CATEGORIES.keys())}")
-    units = CATEGORIES[cat]
-    from_unit = from_unit.lower()
-    to_unit = to_unit.lower()
-    if from_unit not in units:
-        raise ValueError(f"Unknown unit '{from_unit}' in category '{category}'. Available: {list(units.keys())}")
-    if to_unit not in units:
-        raise ValueError(f"Unknown unit '{to_unit}' in category '{category}'. Available: {list(units.keys())}")
-
-    # Convert to base unit, then to target
-    value_in_base = value / units[from_unit]
-    result = value_in_base * units[to_unit]
-
-    return {
+    if category.lower() == "material":
+        factor = conversion_factor(from_unit, to_unit, material=material)
+    else:
+        factor = conversion_factor(from_unit, to_unit, category)
+    result = value * factor
+
+    converted = {
         "value": value,
-        "from_unit": from_unit,
-        "to_unit": to_unit,
+        "from_unit": from_unit.lower(),
+        "to_unit": to_unit.lower(),
         "category": category,
         "result": round(result, 6),
         "result_rounded": round(result, 4),
     }
+    if material is not None:
+        converted["material"] = material
+    return converted
+
+
+def convert_array(values, from_unit, to_unit: str, category: str = None, material: str = None) -> list:
+    """
+    Convert a whole column of quantities at once.
+
+    Args:
+        values: Sequence of numbers
+        from_unit: One unit key for the column, or a sequence of unit keys (one per value)
+            for takeoffs that mix units
+        to_unit: Unit key to convert every value to
+        category: Category of the units; inferred when omitted
+        material: MATERIAL_DENSITIES key for volume↔weight columns
+
+    Returns:
+        list of unrounded converted values, in input order
+    """
+    if isinstance(from_unit, str):
+        factor = conversion_factor(from_unit, to_unit, category, material)
+        return [value * factor for value in values]
+    if len(from_unit) != len(values):
+        raise ValueError("from_unit must be one unit or one unit per value")
+    factors = {}
+    converted = []
+    for value, unit in zip(values, from_unit):
+        factor = factors.get(unit)
+        if factor is None:
+            factor = factors[unit] = conversion_factor(unit, to_unit, category, material)
+        converted.append(value * factor)
+    return converted
 
 
 def available_units(category: str) -> list:
@@ -139,14 +258,7 @@ def available_units(category: str) -> list:
 
 def bulk_convert(value: float, from_unit: str, category: str) -> dict:
     """Convert a value to all units in a category at once."""
-    cat = category.lower()
-    units = CATEGORIES.get(cat, {})
-    from_key = from_unit.lower()
-    if from_key not in units:
+    row = MATRICES.get(category.lower(), {}).get(from_unit.lower())
+    if row is None:
         raise ValueError(f"Unknown unit '{from_unit}'")
-
-    value_in_base = value / units[from_key]
-    return {
-        to_unit: round(value_in_base * factor, 6)
-        for to_unit, factor in units.items()
-    }
+    return {to_unit: round(value * factor, 6) for to_unit, factor in row.items()}
@@ -13,10 +13,13 @@ Updated: 2025 Q1 — contribute better regional data at github.com/masonearl/ope
 """
 
 from copy import deepcopy
+from itertools import islice
 import json
 import re
 from pathlib import Path
 
+from ..calculations.bid_tools import production_rate
+
 # ─── Region Definitions ────────────────────────────────────────────────────────
 # Each region is a self-contained rate table. Keys are lowercase slugs.
 # Add new regions by adding a new dict here or via load_rates_from_json().
@@ -478,6 +481,7 @@ def load_rates_from_json(region_key: str, data: dict) -> None:
         data: Dict matching the RATE_TABLES structure
     """
     RATE_TABLES[region_key] = data
+    _CREW_COSTS.clear()
 
 
 HEAVYBID_NORMALIZED_DIR = Path(__file__).resolve().parents[2] / "data" / "heavybid" / "normalized"
@@ -490,6 +494,57 @@ def _safe_load_json(path: Path):
     return json.loads(path.read_text(encoding="utf-8"))
 
 
+def _iter_heavybid_rows(name: str):
+    """Stream a normalized HeavyBid collection, preferring the JSONL artifact over legacy JSON."""
+    jsonl_path = HEAVYBID_NORMALIZED_DIR / f"{name}.jsonl"
+    if jsonl_path.exists():
+        from ..heavybid.paths import read_jsonl
+
+        return read_jsonl(jsonl_path)
+    legacy = _safe_load_json(HEAVYBID_NORMALIZED_DIR / f"{name}.json")
+    if legacy is None:
+        legacy = _load_heavybid_snapshot().get(name)
+    return iter(legacy or [])
+
+
+_BID_ITEM_COLUMNS: dict = {}
+
+
+def _load_bid_item_columns():
+    """Map the columnar bid item cache once per process and reuse it until the file changes."""
+    path = HEAVYBID_NORMALIZED_DIR / "bid_items.columns"
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    if _BID_ITEM_COLUMNS.get("key") != key:
+        from ..heavybid.columnar import close_columnar, open_columnar_bid_items
+
+        if _BID_ITEM_COLUMNS.get("store"):
+            close_columnar(_BID_ITEM_COLUMNS["store"])
+        _BID_ITEM_COLUMNS.clear()
+        _BID_ITEM_COLUMNS.update({"key": key, "store": open_columnar_bid_items(path)})
+    return _BID_ITEM_COLUMNS["store"]
+
+
+def _iter_bid_items(unit=""):
+    """Stream bid items, narrowing to an exact unit (or set of units) on the columnar cache before building any rows."""
+    units = {unit} if isinstance(unit, str) else set(unit)
+    store = _load_bid_item_columns()
+    if store is None:
+        rows = _iter_heavybid_rows("bid_items")
+        if not unit:
+            return rows
+        return (row for row in rows if str(row.get("unit", "")).strip().lower() in units)
+    from ..heavybid.columnar import iter_columnar_rows, matching_codes, select_rows
+
+    if not unit:
+        return iter_columnar_rows(store)
+    codes = matching_codes(store, "unit", lambda value: value.strip().lower() in units)
+    return iter_columnar_rows(store, select_rows(store, "unit", codes))
+
+
 def _slugify(text: str) -> str:
     return re.sub(r"[^a-z0-9]+", "_", str(text or "").strip().lower()).strip("_")
 
@@ -625,9 +680,9 @@ def _apply_bucketed_materials(rate_table: dict, material_rows: list) -> None:
 
 
 def _build_heavybid_rate_library() -> dict | None:
-    labor_rows = _safe_load_json(HEAVYBID_NORMALIZED_DIR / "labor_rates.json") or []
-    equipment_rows = _safe_load_json(HEAVYBID_NORMALIZED_DIR / "equipment_rates.json") or []
-    material_rows = _safe_load_json(HEAVYBID_NORMALIZED_DIR / "material_library.json") or []
+    labor_rows = list(_iter_heavybid_rows("labor_rates"))
+    equipment_rows = list(_iter_heavybid_rows("equipment_rates"))
+    material_rows = list(_iter_heavybid_rows("material_library"))
 
     if not labor_rows and not equipment_rows and not material_rows:
         return None
@@ -706,6 +761,7 @@ def _load_external_rate_tables(force: bool = False) -> None:
     heavybid_derived = _build_heavybid_rate_library()
     if heavybid_derived:
         RATE_TABLES["heavybid_derived"] = heavybid_derived
+    _CREW_COSTS.clear()
 
     _EXTERNAL_LIBRARIES_LOADED = True
 
@@ -745,41 +801,52 @@ def _extract_size_tokens(text: str) -> set:
     return tokens
 
 
-def _score_bid_item_match(item: dict, description: str = "", unit: str = "") -> int:
-    haystack_parts = [
-        str(item.get("description", "")),
-        str(item.get("item_code", "")),
-        str(item.get("cost_code_1", "")),
-        str(item.get("cost_code_2", "")),
-        str(item.get("crew_code", "")),
-        str(item.get("project_name", "")),
-    ]
-    haystack = " ".join(haystack_parts).lower()
+def _compile_history_query(description: str = "", unit: str = "") -> dict:
+    """Tokenize a bid-history query once so it can be scored against many items."""
     raw_tokens = _tokenize(description)
     query_tokens = [token for token in raw_tokens if token not in HISTORY_STOPWORDS]
-    significant_tokens = set(query_tokens or raw_tokens)
-    phrase = " ".join(query_tokens).strip()
-    score = 0
+    overlap_tokens = query_tokens or raw_tokens
+    return {
+        "description": description,
+        "unit": str(unit or "").strip().lower(),
+        "phrase": " ".join(query_tokens).strip(),
+        "tokens": set(overlap_tokens),
+        "overlap_tokens": overlap_tokens,
+        "required_overlap": 1 if len(overlap_tokens) <= 1 else 2,
+        "sizes": _extract_size_tokens(description),
+    }
 
-    if phrase and phrase in haystack:
+
+def _history_haystack(item: dict) -> str:
+    return " ".join(
+        [
+            str(item.get("description", "")),
+            str(item.get("item_code", "")),
+            str(item.get("cost_code_1", "")),
+            str(item.get("cost_code_2", "")),
+            str(item.get("crew_code", "")),
+            str(item.get("project_name", "")),
+        ]
+    ).lower()
+
+
+def _score_bid_item_match(query: dict, item: dict, haystack: str, item_sizes: set) -> int:
+    score = 0
+    if query["phrase"] and query["phrase"] in haystack:
         score += 8
 
-    for token in significant_tokens:
+    for token in query["tokens"]:
         if token in haystack:
             score += 3
 
-    unit_text = str(unit or "").strip().lower()
-    item_unit = str(item.get("unit", "")).strip().lower()
-    if unit_text:
-        if unit_text == item_unit:
+    if query["unit"]:
+        if query["unit"] == str(item.get("unit", "")).strip().lower():
             score += 4
         else:
             score -= 3
 
-    query_sizes = _extract_size_tokens(description)
-    item_sizes = _extract_size_tokens(haystack)
-    if query_sizes:
-        if query_sizes & item_sizes:
+    if query["sizes"]:
+        if query["sizes"] & item_sizes:
             score += 5
         else:
             score -= 6
@@ -797,52 +864,7 @@ def _score_bid_item_match(item: dict, description: str = "", unit: str = "") ->
     return score
 
 
-def _token_overlap_count(item: dict, description: str = "") -> int:
-    haystack = " ".join(
-        [
-            str(item.get("description", "")),
-            str(item.get("item_code", "")),
-            str(item.get("cost_code_1", "")),
-            str(item.get("cost_code_2", "")),
-            str(item.get("crew_code", "")),
-            str(item.get("project_name", "")),
-        ]
-    ).lower()
-    raw_tokens = _tokenize(description)
-    significant_tokens = [token for token in raw_tokens if token not in HISTORY_STOPWORDS]
-    tokens = significant_tokens or raw_tokens
-    return sum(1 for token in tokens if token in haystack)
-
-
-def _search_bid_items(
-    description: str = "",
-    unit: str = "",
-    min_score: int = 4,
-    exact_unit_only: bool = False,
-) -> list:
-    snapshot = _load_heavybid_snapshot()
-    items = snapshot.get("bid_items", [])
-    if not items:
-        return []
-    raw_tokens = _tokenize(description)
-    significant_tokens = [token for token in raw_tokens if token not in HISTORY_STOPWORDS]
-    required_overlap = 1 if len(significant_tokens or raw_tokens) <= 1 else 2
-    unit_text = str(unit or "").strip().lower()
-
-    matches = []
-    for item in items:
-        item_unit = str(item.get("unit", "")).strip().lower()
-        if exact_unit_only and unit_text and item_unit != unit_text:
-            continue
-        overlap = _token_overlap_count(item, description)
-        if overlap < required_overlap:
-            continue
-        score = _score_bid_item_match(item, description, unit)
-        if score >= min_score:
-            enriched = dict(item)
-            enriched["_score"] = score
-            enriched["_overlap"] = overlap
-            matches.append(enriched)
+def _rank_matches(matches: list) -> list:
     matches.sort(
         key=lambda row: (
             row.get("_score", 0),
@@ -855,6 +877,51 @@ def _search_bid_items(
     return matches
 
 
+def _search_bid_items_batch(queries: list, min_score: int = 4, exact_unit_only: bool = False) -> list:
+    """
+    Score every query against the bid history in a single pass over the items.
+
+    Each item's haystack and size tokens are built once and shared by all
+    queries. With exact_unit_only, the pass is narrowed to the queries' units
+    on the columnar cache when every query names one.
+
+    Returns:
+        One ranked match list per query, in query order
+    """
+    compiled = [_compile_history_query(query.get("description", ""), query.get("unit", "")) for query in queries]
+    results = [[] for _ in compiled]
+    units = {query["unit"] for query in compiled}
+    items = _iter_bid_items(units if exact_unit_only and "" not in units else "")
+    for item in items:
+        haystack = _history_haystack(item)
+        item_unit = str(item.get("unit", "")).strip().lower()
+        item_sizes = None
+        for query, matches in zip(compiled, results):
+            if exact_unit_only and query["unit"] and query["unit"] != item_unit:
+                continue
+            overlap = sum(1 for token in query["overlap_tokens"] if token in haystack)
+            if overlap < query["required_overlap"]:
+                continue
+            if item_sizes is None:
+                item_sizes = _extract_size_tokens(haystack)
+            score = _score_bid_item_match(query, item, haystack, item_sizes)
+            if score >= min_score:
+                enriched = dict(item)
+                enriched["_score"] = score
+                enriched["_overlap"] = overlap
+                matches.append(enriched)
+    return [_rank_matches(matches) for matches in results]
+
+
+def _search_bid_items(
+    description: str = "",
+    unit: str = "",
+    min_score: int = 4,
+    exact_unit_only: bool = False,
+) -> list:
+    return _search_bid_items_batch([{"description": description, "unit": unit}], min_score, exact_unit_only)[0]
+
+
 def get_historical_unit_prices(description: str, unit: str = "", limit: int = 5) -> dict:
     """Find historical unit prices from HeavyBid-derived bid items."""
     matches = [
@@ -875,7 +942,7 @@ def get_historical_unit_prices(description: str, unit: str = "", limit: int = 5)
 
 def lookup_heavybid_crew(crew_code: str = "", description: str = "", limit: int = 10) -> dict:
     """Search normalized HeavyBid crew exports."""
-    crews = _safe_load_json(HEAVYBID_NORMALIZED_DIR / "crew_library.json") or []
+    crews = _iter_heavybid_rows("crew_library")
     query = " ".join([crew_code, description]).strip().lower()
     query_tokens = set(_tokenize(query))
     matches = []
@@ -893,15 +960,280 @@ def lookup_heavybid_crew(crew_code: str = "", description: str = "", limit: int
     return {"crew_code": crew_code, "description": description, "matches": matches[: max(1, int(limit or 10))]}
 
 
-def get_production_benchmark(description: str, unit: str = "", limit: int = 5) -> dict:
-    """Return productivity benchmarks using quantity and manhours from historical bid items."""
-    measurable_units = {"lf", "cy", "tn", "ton", "sy", "sf", "ea", "m3", "mton"}
-    unit_text = str(unit or "").strip().lower()
-    matches = _search_bid_items(description, unit, min_score=6, exact_unit_only=bool(unit_text))
+# Column spellings seen in HeavyBid "Crew Resources" codebook exports.
+_CREW_RESOURCE_COLUMNS = {
+    "crew_code": ("Crew Code", "Crew", "CrewCode"),
+    "resource_code": ("Resource Code", "Resource", "ResourceCode", "Code"),
+    "description": ("Resource Description", "Description"),
+    "quantity": ("Quantity", "Qty", "Pieces", "Count"),
+    "kind": ("Type", "Resource Type", "Kind"),
+}
+_CREW_SOURCES = ("codebooks", "crew_library", "labor_rates", "equipment_rates")
+# Working days used to spread weekly and monthly equipment rent over a day.
+_RENT_DAYS = {"wk": 5, "week": 5, "mo": 22, "month": 22}
+
+_CREW_INDEX: dict = {}
+_CREW_COSTS: dict = {}
+
+
+def _codebook_value(row: dict, field: str):
+    for column in _CREW_RESOURCE_COLUMNS[field]:
+        value = row.get(column)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def _crew_source_key() -> tuple:
+    """Size and mtime of every artifact the crew index is built from."""
+    key = []
+    for name in _CREW_SOURCES + ("snapshot",):
+        for suffix in (".jsonl", ".json"):
+            path = HEAVYBID_NORMALIZED_DIR / f"{name}{suffix}"
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            key.append((path.name, stat.st_mtime_ns, stat.st_size))
+    return (str(HEAVYBID_NORMALIZED_DIR), tuple(key))
+
+
+def _member_kind(kind, code: str, estimate_code: str, labor: dict, equipment: dict, description: str) -> str | None:
+    text = str(kind or "").strip().lower()
+    if text.startswith("l"):
+        return "labor"
+    if text.startswith("e"):
+        return "equipment"
+    if (estimate_code, code) in labor:
+        return "labor"
+    if (estimate_code, code) in equipment:
+        return "equipment"
+    record = {"description": description, "labor_code": code, "equipment_code": code}
+    if _match_equipment_type(record):
+        return "equipment"
+    if _match_labor_type(record):
+        return "labor"
+    return None
+
+
+def _load_crew_index() -> dict:
+    """Join crew resource codebook rows to crews and rates once per set of HeavyBid artifacts."""
+    key = _crew_source_key()
+    if _CREW_INDEX.get("key") == key:
+        return _CREW_INDEX
+    labor = {
+        (str(row.get("estimate_code", "")), str(row.get("labor_code", "")).strip().lower()): row
+        for row in _iter_heavybid_rows("labor_rates")
+    }
+    equipment = {
+        (str(row.get("estimate_code", "")), str(row.get("equipment_code", "")).strip().lower()): row
+        for row in _iter_heavybid_rows("equipment_rates")
+    }
+    crews = {}
+    for row in _iter_heavybid_rows("crew_library"):
+        crew_key = (str(row.get("estimate_code", "")), str(row.get("crew_code", "")).strip().lower())
+        crews[crew_key] = {
+            "crew_code": row.get("crew_code", ""),
+            "description": row.get("description", ""),
+            "estimate_code": crew_key[0],
+            "members": [],
+        }
+    for row in _iter_heavybid_rows("codebooks"):
+        if str(row.get("workbook_name", "")).lower() != "crew resources.xlsx":
+            continue
+        crew_code = str(_codebook_value(row, "crew_code") or "").strip()
+        code = str(_codebook_value(row, "resource_code") or "").strip()
+        if not crew_code or not code:
+            continue
+        estimate_code = str(row.get("estimate_code", ""))
+        description = str(_codebook_value(row, "description") or "")
+        crew = crews.setdefault((estimate_code, crew_code.lower()), {
+            "crew_code": crew_code,
+            "description": "",
+            "estimate_code": estimate_code,
+            "members": [],
+        })
+        try:
+            quantity = float(_codebook_value(row, "quantity") or 1)
+        except (TypeError, ValueError):
+            quantity = 1.0
+        kind = _member_kind(_codebook_value(row, "kind"), code.lower(), estimate_code, labor, equipment, description)
+        crew["members"].append({
+            "code": code,
+            "description": description,
+            "kind": kind,
+            "quantity": quantity,
+        })
+    by_code = {}
+    for (estimate_code, crew_code), crew in sorted(crews.items()):
+        by_code.setdefault(crew_code, []).append(estimate_code)
+    _CREW_INDEX.clear()
+    _CREW_INDEX.update({"key": key, "crews": crews, "by_code": by_code, "labor": labor, "equipment": equipment})
+    _CREW_COSTS.clear()
+    return _CREW_INDEX
+
+
+def _heavybid_member_rate(member: dict, estimate_code: str, index: dict, hours_per_day: float) -> tuple | None:
+    """(hourly, daily) cost of one crew member from its own estimate's HeavyBid rates."""
+    code = member["code"].lower()
+    if member["kind"] == "labor":
+        row = index["labor"].get((estimate_code, code))
+        if not row:
+            return None
+        hourly = float(row.get("rate", 0) or 0) * (1 + float(row.get("tax_percent", 0) or 0) / 100)
+        hourly += float(row.get("fringe", 0) or 0)
+        return hourly, hourly * hours_per_day
+    row = index["equipment"].get((estimate_code, code))
+    if not row:
+        return None
+    rent = float(row.get("rent_rate", 0) or 0)
+    units = str(row.get("units", "")).strip().lower()
+    operating = float(row.get("eoe_total_per_hour", 0) or 0) * hours_per_day
+    if units.startswith("h"):
+        daily = rent * hours_per_day + operating
+    else:
+        daily = rent / next((days for prefix, days in _RENT_DAYS.items() if units.startswith(prefix)), 1) + operating
+    return daily / hours_per_day, daily
+
+
+def _library_member_rate(member: dict, rates: dict, hours_per_day: float) -> tuple | None:
+    """(hourly, daily) cost of one crew member from a regional rate table, matched by description."""
+    record = {"description": member["description"], "labor_code": member["code"], "equipment_code": member["code"]}
+    if member["kind"] == "labor":
+        entry = rates.get("labor", {}).get(_match_labor_type(record) or "")
+        if not entry:
+            return None
+        return entry["hourly"], entry["hourly"] * hours_per_day
+    entry = rates.get("equipment", {}).get(_match_equipment_type(record) or "")
+    if not entry:
+        return None
+    daily = entry.get("daily") or entry.get("hourly", 0) * hours_per_day
+    return daily / hours_per_day, daily
+
+
+def get_crew_cost(crew_code: str, estimate_code: str = "", region: str = "", hours_per_day: float = 10) -> dict:
+    """
+    Hourly and daily cost of a HeavyBid crew built from its crew resources codebook rows.
+
+    Args:
+        crew_code: HeavyBid crew code
+        estimate_code: Estimate the crew comes from (default: the first estimate that has it)
+        region: Rate library to price members from; default prices each member
+            from its own estimate's HeavyBid labor and equipment rates
+        hours_per_day: Working hours per crew day
+
+    Returns:
+        dict with members and their costs, labor/equipment hourly and daily totals,
+        crew size, and labor_items/equipment_items ready for crew_day_cost.
+        Results are cached per rate library until the HeavyBid artifacts or rate tables change.
+    """
+    if hours_per_day <= 0:
+        raise ValueError("hours_per_day must be greater than 0")
+    index = _load_crew_index()
+    code = str(crew_code or "").strip().lower()
+    estimates = index["by_code"].get(code, [])
+    if not estimates or (estimate_code and estimate_code not in estimates):
+        return {"crew_code": crew_code, "estimate_code": estimate_code, "error": f"Crew '{crew_code}' not found."}
+    estimate_code = estimate_code or estimates[0]
+    library = region or f"heavybid:{estimate_code}"
+    cache_key = (library, estimate_code, code, float(hours_per_day))
+    cached = _CREW_COSTS.get(cache_key)
+    if cached is not None:
+        return cached
+
+    rates = get_rates(region) if region else None
+    crew = index["crews"][(estimate_code, code)]
+    members, unpriced, labor_items, equipment_items = [], [], [], []
+    labor_hourly = equipment_daily = crew_size = 0.0
+    for member in crew["members"]:
+        if region:
+            priced = _library_member_rate(member, rates, hours_per_day) if member["kind"] else None
+        else:
+            priced = _heavybid_member_rate(member, estimate_code, index, hours_per_day) if member["kind"] else None
+        row = dict(member)
+        if priced is None:
+            unpriced.append(member["code"])
+            row.update({"hourly_rate": 0.0, "daily_cost": 0.0})
+            members.append(row)
+            continue
+        hourly, daily = priced
+        row.update({"hourly_rate": round(hourly, 4), "daily_cost": round(daily * member["quantity"], 2)})
+        members.append(row)
+        if member["kind"] == "labor":
+            labor_hourly += hourly * member["quantity"]
+            crew_size += member["quantity"]
+            labor_items.append({
+                "role": member["description"] or member["code"],
+                "hours": hours_per_day * member["quantity"],
+                "rate": round(hourly, 4),
+            })
+        else:
+            equipment_daily += daily * member["quantity"]
+            equipment_items.append({
+                "name": member["description"] or member["code"],
+                "daily_rate": round(daily * member["quantity"], 2),
+            })
+    daily_cost = labor_hourly * hours_per_day + equipment_daily
+    result = {
+        "crew_code": crew["crew_code"],
+        "description": crew["description"],
+        "estimate_code": estimate_code,
+        "rate_library": library,
+        "hours_per_day": hours_per_day,
+        "members": members,
+        "unpriced": unpriced,
+        "crew_size": crew_size,
+        "labor_hourly": round(labor_hourly, 2),
+        "avg_labor_rate_per_hr": round(labor_hourly / crew_size, 4) if crew_size else 0,
+        "equipment_daily": round(equipment_daily, 2),
+        "hourly_cost": round(daily_cost / hours_per_day, 2),
+        "daily_cost": round(daily_cost, 2),
+        "labor_items": labor_items,
+        "equipment_items": equipment_items,
+    }
+    _CREW_COSTS[cache_key] = result
+    return result
+
+
+def price_with_crew(
+    crew_code: str,
+    production_rate_per_day: float,
+    total_quantity: float,
+    unit: str = "LF",
+    estimate_code: str = "",
+    region: str = "",
+    hours_per_day: float = 10,
+) -> dict:
+    """Duration and direct cost of a bid item from a crew code and its daily production (see production_rate)."""
+    crew = get_crew_cost(crew_code, estimate_code=estimate_code, region=region, hours_per_day=hours_per_day)
+    if "error" in crew:
+        return crew
+    result = production_rate(
+        production_rate_per_day,
+        total_quantity,
+        crew_size=crew["crew_size"],
+        crew_rate_per_hr=crew["avg_labor_rate_per_hr"],
+        hours_per_day=hours_per_day,
+        equipment_cost_per_day=crew["equipment_daily"],
+        unit=unit,
+    )
+    result.update({
+        "crew_code": crew["crew_code"],
+        "estimate_code": crew["estimate_code"],
+        "rate_library": crew["rate_library"],
+        "unpriced": crew["unpriced"],
+    })
+    return result
+
+
+_MEASURABLE_UNITS = {"lf", "cy", "tn", "ton", "sy", "sf", "ea", "m3", "mton"}
+
+
+def _benchmark_summary(description: str, unit: str, matches: list, limit: int) -> dict:
     benchmarks = []
     for item in matches:
         item_unit = str(item.get("unit", "")).strip().lower()
-        if item_unit not in measurable_units:
+        if item_unit not in _MEASURABLE_UNITS:
             continue
         quantity = float(item.get("quantity", 0) or 0)
         manhours = float(item.get("manhours", 0) or 0)
@@ -927,6 +1259,33 @@ def get_production_benchmark(description: str, unit: str = "", limit: int = 5) -
     return summary
 
 
+def get_production_benchmark(description: str, unit: str = "", limit: int = 5) -> dict:
+    """Return productivity benchmarks using quantity and manhours from historical bid items."""
+    unit_text = str(unit or "").strip().lower()
+    matches = _search_bid_items(description, unit, min_score=6, exact_unit_only=bool(unit_text))
+    return _benchmark_summary(description, unit, matches, limit)
+
+
+def get_production_benchmarks(queries: list, limit: int = 5) -> list:
+    """
+    Productivity benchmarks for many work items from one pass over the bid history.
+
+    Args:
+        queries: List of {"description", "unit"} dicts
+        limit: Benchmarks kept per query
+
+    Returns:
+        One get_production_benchmark result per query, in order
+    """
+    if not queries:
+        return []
+    matches = _search_bid_items_batch(queries, min_score=6, exact_unit_only=True)
+    return [
+        _benchmark_summary(query.get("description", ""), query.get("unit", ""), found, limit)
+        for query, found in zip(queries, matches)
+    ]
+
+
 def estimate_from_bid_history(description: str, quantity: float, unit: str = "", markup: float = 0.0, limit: int = 5) -> dict:
     """Estimate a line item from HeavyBid historical unit-price matches."""
     historical = get_historical_unit_prices(description=description, unit=unit, limit=limit)
@@ -1001,9 +1360,8 @@ def get_heavybid_calculator_defaults() -> dict:
         ],
     }
 
-    snapshot = _load_heavybid_snapshot()
     formula_templates = []
-    for formula in (snapshot.get("formulas", []) or [])[:20]:
+    for formula in islice(_iter_heavybid_rows("formulas"), 20):
         if formula.get("formula_cells"):
             formula_templates.append({
                 "template_name": formula.get("template_name", ""),
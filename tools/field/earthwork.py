@@ -0,0 +1,245 @@
+"""
+Cut/Fill Earthwork Tools
+Mass earthwork quantities between an existing and a proposed surface by the
+grid-prism and average-end-area methods, with swell/shrink from the unit
+converter's EARTHWORK factors and a mass-haul diagram along the grid rows.
+
+Surfaces are elevation grids read one row at a time, so grids of any size run
+in memory proportional to a single row. Depths are existing minus proposed:
+positive is cut, negative is fill.
+"""
+import math
+from itertools import zip_longest
+from pathlib import Path
+
+from ..calculations.quantity import accepts_units
+from ..calculations.unit_converter import EARTHWORK
+
+DEFAULT_SWELL = "lcy_25"
+DEFAULT_SHRINK = "ccy_10"
+
+
+def _factor(key: str, kind: str) -> float:
+    key = str(key).lower()
+    if key not in EARTHWORK:
+        raise ValueError(f"Unknown {kind} factor '{key}'. Available: {list(EARTHWORK.keys())}")
+    return EARTHWORK[key]
+
+
+def read_grid_rows(path):
+    """
+    Stream an elevation grid from a text file, one row per line.
+
+    Values may be separated by commas or whitespace. Leading header lines (such
+    as an ESRI ASCII grid's ncols/cellsize block) are skipped; a NODATA_value
+    header marks cells that come back as None.
+    """
+    nodata = None
+    with Path(path).open("r", encoding="utf-8-sig") as handle:
+        for line in handle:
+            fields = line.replace(",", " ").split()
+            if not fields:
+                continue
+            if fields[0][0].isalpha():
+                if fields[0].lower() == "nodata_value" and len(fields) > 1:
+                    nodata = float(fields[1])
+                continue
+            row = [float(value) for value in fields]
+            yield [None if value == nodata else value for value in row] if nodata is not None else row
+
+
+@accepts_units(cell_size_ft="ft")
+def grid_from_points(points, cell_size_ft: float, origin=None) -> dict:
+    """
+    Bin a point cloud of (x, y, z) onto grid nodes by averaging the points nearest each node.
+
+    Args:
+        points: Iterable of (x, y, z) in feet
+        cell_size_ft: Node spacing in feet
+        origin: Optional (x, y) of the first node; defaults to the point cloud's minimum corner
+
+    Returns:
+        dict with origin, cell_size_ft and rows (y ascending); nodes with no points are None
+    """
+    if cell_size_ft <= 0:
+        raise ValueError("cell_size_ft must be greater than 0")
+    points = points if isinstance(points, (list, tuple)) or origin is not None else list(points)
+    if origin is None:
+        if not points:
+            raise ValueError("No points to grid")
+        origin = (min(p[0] for p in points), min(p[1] for p in points))
+    x0, y0 = float(origin[0]), float(origin[1])
+    sums = {}
+    for x, y, z in points:
+        node = (round((y - y0) / cell_size_ft), round((x - x0) / cell_size_ft))
+        if node[0] < 0 or node[1] < 0:
+            continue
+        total = sums.get(node)
+        sums[node] = (total[0] + z, total[1] + 1) if total else (float(z), 1)
+    if not sums:
+        raise ValueError("No points fall on or after the grid origin")
+    row_count = max(node[0] for node in sums) + 1
+    column_count = max(node[1] for node in sums) + 1
+    rows = [[None] * column_count for _ in range(row_count)]
+    for (i, j), (total, count) in sums.items():
+        rows[i][j] = total / count
+    return {"origin": (x0, y0), "cell_size_ft": cell_size_ft, "rows": rows}
+
+
+def _depth_rows(existing_rows, proposed):
+    """Pair each existing row with its proposed row (or a flat design grade) and yield depth rows."""
+    if isinstance(proposed, (int, float)):
+        for existing in existing_rows:
+            yield [None if z is None else z - proposed for z in existing]
+        return
+    missing = object()
+    for existing, design in zip_longest(existing_rows, proposed, fillvalue=missing):
+        if existing is missing or design is missing:
+            raise ValueError("Existing and proposed grids must have the same number of rows")
+        if len(design) != len(existing):
+            raise ValueError("Existing and proposed rows must have the same number of columns")
+        yield [None if z is None or p is None else z - p for z, p in zip(existing, design)]
+
+
+def _strip_prisms(upper: list, lower: list, cell_area: float) -> tuple:
+    """Cut and fill volume (cf) of the grid cells between two depth rows."""
+    cut = fill = 0.0
+    for a, b, c, d in zip(upper, upper[1:], lower, lower[1:]):
+        if a is None or b is None or c is None or d is None:
+            continue
+        positive = (a if a > 0 else 0) + (b if b > 0 else 0) + (c if c > 0 else 0) + (d if d > 0 else 0)
+        negative = (a if a < 0 else 0) + (b if b < 0 else 0) + (c if c < 0 else 0) + (d if d < 0 else 0)
+        if negative == 0:
+            cut += cell_area * positive / 4
+        elif positive == 0:
+            fill -= cell_area * negative / 4
+        else:
+            # Transition cell: split the prism at the zero line in proportion to each side's depth.
+            span = positive - negative
+            cut += cell_area * positive * positive / (4 * span)
+            fill += cell_area * negative * negative / (4 * span)
+    return cut, fill
+
+
+def _section_areas(depths: list, dx: float) -> tuple:
+    """Cut and fill end areas (sf) of one cross-section, splitting segments at the zero crossing."""
+    cut = fill = 0.0
+    for a, b in zip(depths, depths[1:]):
+        if a is None or b is None:
+            continue
+        if a >= 0 and b >= 0:
+            cut += dx * (a + b) / 2
+        elif a <= 0 and b <= 0:
+            fill -= dx * (a + b) / 2
+        else:
+            span = abs(a) + abs(b)
+            high, low = (a, b) if a > 0 else (b, a)
+            cut += dx * high * high / (2 * span)
+            fill += dx * low * low / (2 * span)
+    return cut, fill
+
+
+def _balance_stations(stations: list, ordinates: list) -> list:
+    """Stations where the mass-haul curve crosses zero (earthwork balances between them)."""
+    crossings = []
+    for s0, s1, m0, m1 in zip(stations, stations[1:], ordinates, ordinates[1:]):
+        if m0 * m1 < 0:
+            crossings.append(round(s0 + (s1 - s0) * m0 / (m0 - m1), 2))
+        elif m1 == 0 and m0 != 0:
+            crossings.append(round(s1, 2))
+    return crossings
+
+
+@accepts_units(cell_size_ft="ft", row_spacing_ft="ft", start_station="ft")
+def earthwork_volumes(
+    existing_rows,
+    proposed,
+    cell_size_ft: float,
+    row_spacing_ft: float = None,
+    method: str = "grid",
+    swell: str = DEFAULT_SWELL,
+    shrink: str = DEFAULT_SHRINK,
+    start_station: float = 0.0,
+) -> dict:
+    """
+    Cut and fill between two gridded surfaces, with a mass-haul diagram along the rows.
+
+    Args:
+        existing_rows: Iterable of rows of existing elevations (ft); rows run along the
+            stationing axis and may be a generator (e.g. read_grid_rows) of any length
+        proposed: Matching iterable of proposed elevation rows, or one design grade for a flat pad
+        cell_size_ft: Spacing between columns in feet
+        row_spacing_ft: Spacing between rows in feet (default: cell_size_ft)
+        method: "grid" (four-corner prisms) or "end_area" (average end area between row sections)
+        swell: EARTHWORK key for hauling cut (e.g. "lcy_25")
+        shrink: EARTHWORK key for placing fill (e.g. "ccy_10")
+        start_station: Station of the first row in feet
+
+    Returns:
+        dict with cut/fill totals in bank, loose and compacted CY, net import/export,
+        mass-haul ordinates per row and balance stations. Cells with a None corner are skipped.
+    """
+    method = method.lower()
+    if method not in ("grid", "end_area"):
+        raise ValueError(f"method must be 'grid' or 'end_area', got '{method}'")
+    if cell_size_ft <= 0 or (row_spacing_ft is not None and row_spacing_ft <= 0):
+        raise ValueError("Grid spacing must be greater than 0")
+    dy = cell_size_ft if row_spacing_ft is None else row_spacing_ft
+    swell_factor = _factor(swell, "swell")
+    shrink_factor = _factor(shrink, "shrink")
+    cell_area = cell_size_ft * dy
+
+    stations, cut_col, fill_col, ordinates = [float(start_station)], [0.0], [0.0], [0.0]
+    total_cut = total_fill = 0.0
+    previous = previous_area = None
+    for index, depths in enumerate(_depth_rows(existing_rows, proposed)):
+        if method == "end_area":
+            area = _section_areas(depths, cell_size_ft)
+        if previous is not None:
+            if len(depths) != len(previous):
+                raise ValueError(f"Row {index} has {len(depths)} columns; expected {len(previous)}")
+            if method == "grid":
+                cut_cf, fill_cf = _strip_prisms(previous, depths, cell_area)
+            else:
+                cut_cf = (previous_area[0] + area[0]) / 2 * dy
+                fill_cf = (previous_area[1] + area[1]) / 2 * dy
+            cut_bcy = cut_cf / 27
+            fill_ccy = fill_cf / 27
+            total_cut += cut_bcy
+            total_fill += fill_ccy
+            stations.append(stations[-1] + dy)
+            cut_col.append(cut_bcy)
+            fill_col.append(fill_ccy)
+            ordinates.append(ordinates[-1] + cut_bcy - fill_ccy / shrink_factor)
+        previous = depths
+        if method == "end_area":
+            previous_area = area
+    if previous is None:
+        raise ValueError("existing_rows is empty")
+
+    fill_bcy = total_fill / shrink_factor
+    net_bcy = total_cut - fill_bcy
+    peak = max(range(len(ordinates)), key=lambda i: abs(ordinates[i]))
+    return {
+        "method": method,
+        "rows": len(stations),
+        "swell": swell,
+        "shrink": shrink,
+        "cut_bcy": round(total_cut, 2),
+        "cut_lcy": round(total_cut * swell_factor, 2),
+        "fill_ccy": round(total_fill, 2),
+        "fill_bcy_required": round(fill_bcy, 2),
+        "net_bcy": round(net_bcy, 2),
+        "export_lcy": round(max(net_bcy, 0) * swell_factor, 2),
+        "import_bcy": round(max(-net_bcy, 0), 2),
+        "mass_haul": {
+            "station_ft": stations,
+            "cut_bcy": cut_col,
+            "fill_ccy": fill_col,
+            "ordinate_bcy": ordinates,
+        },
+        "max_ordinate_bcy": round(ordinates[peak], 2),
+        "max_ordinate_station_ft": stations[peak],
+        "balance_stations_ft": _balance_stations(stations, ordinates),
+        "balanced": math.isclose(net_bcy, 0, abs_tol=0.5),
+    }
@@ -2,8 +2,16 @@
 Pipe Hydraulics Tools
 Manning's equation, flow capacity, minimum slope, and velocity calculations
 for gravity-flow storm drain, sanitary sewer, and culverts.
+
+Each calculation has a ``*_batch`` form that takes scalars or equal-length
+sequences (scalars broadcast) and returns a dict of lists, for master-plan
+runs over thousands of segments. The scalar functions wrap the batch kernels.
 """
 import math
+from bisect import bisect_left
+from itertools import repeat
+
+from ..calculations.quantity import accepts_units
 
 # Manning's n values for common pipe materials
 MANNINGS_N = {
@@ -20,7 +28,467 @@ MANNINGS_N = {
     "cast_iron": 0.013,
 }
 
+CFS_TO_GPM = 448.831
+CFS_TO_MGD = 0.646317
+_TWO_THIRDS = 2.0 / 3.0
+
+# A circular pipe carries its peak flow, about 1.076 x full-pipe flow, at
+# d/D ~ 0.938. Flows above that surcharge the pipe.
+PEAK_DEPTH_RATIO = 0.9381812
+
+
+def _broadcast(*values) -> tuple:
+    """
+    Line up scalar and sequence inputs for the batch functions.
+
+    Scalars and length-1 sequences repeat against the longest input; any other
+    length mismatch raises ValueError.
+    """
+    columns = [list(value) if isinstance(value, (list, tuple, range)) else [value] for value in values]
+    size = max(len(column) for column in columns)
+    for column in columns:
+        if len(column) not in (1, size):
+            raise ValueError("Array inputs must have matching lengths or length 1")
+    return size, [repeat(column[0], size) if len(column) == 1 else column for column in columns]
+
+
+def _section(diameter_in: float, depth_ratio: float = 1.0) -> tuple:
+    """Flow area (sf), hydraulic radius (ft) and conveyance A·R^(2/3) of a circular section at d/D."""
+    D = diameter_in / 12
+    r = D / 2
+    if depth_ratio >= 1.0:
+        A = math.pi * r * r
+        R = D / 4
+    else:
+        theta = 2 * math.acos(1 - 2 * depth_ratio)
+        A = (r * r / 2) * (theta - math.sin(theta))
+        P = r * theta
+        R = A / P if P > 0 else 0
+    return A, R, A * math.pow(R, _TWO_THIRDS)
+
+
+def _section_lookup():
+    """Memoize section geometry for one batch; plans repeat a few diameters across many segments."""
+    cache = {}
+
+    def section(diameter_in: float, depth_ratio: float = 1.0) -> tuple:
+        key = (diameter_in, depth_ratio)
+        geometry = cache.get(key)
+        if geometry is None:
+            geometry = cache[key] = _section(diameter_in, depth_ratio)
+        return geometry
+
+    return section
+
+
+@accepts_units(diameter_in="in")
+def pipe_flow_full_batch(diameter_in, slope, n=0.013) -> dict:
+    """
+    Full-pipe Manning's flow for many pipes at once.
+
+    Args:
+        diameter_in: Pipe diameter(s) in inches
+        slope: Pipe slope(s) in ft/ft
+        n: Manning's roughness coefficient(s)
+
+    Returns:
+        dict of equal-length, unrounded lists: pipe_diameter_in, slope_ft_per_ft, mannings_n,
+        flow_cfs, flow_gpm, flow_mgd, velocity_fps, area_sf, hydraulic_radius_ft
+    """
+    _, (diameters, slopes, ns) = _broadcast(diameter_in, slope, n)
+    section = _section_lookup()
+    diameter_col, slope_col, n_col = [], [], []
+    flow, velocity, area, radius = [], [], [], []
+    for d, s, rough in zip(diameters, slopes, ns):
+        A, R, K = section(d)
+        Q = K * math.sqrt(s) / rough
+        diameter_col.append(d)
+        slope_col.append(s)
+        n_col.append(rough)
+        flow.append(Q)
+        velocity.append(Q / A)
+        area.append(A)
+        radius.append(R)
+    return {
+        "pipe_diameter_in": diameter_col,
+        "slope_ft_per_ft": slope_col,
+        "mannings_n": n_col,
+        "flow_cfs": flow,
+        "flow_gpm": [Q * CFS_TO_GPM for Q in flow],
+        "flow_mgd": [Q * CFS_TO_MGD for Q in flow],
+        "velocity_fps": velocity,
+        "area_sf": area,
+        "hydraulic_radius_ft": radius,
+    }
+
+
+@accepts_units(diameter_in="in")
+def pipe_flow_partial_batch(diameter_in, slope, depth_ratio=0.8, n=0.013, use_table=False) -> dict:
+    """
+    Partial-depth Manning's flow for many pipes at once.
+
+    Args:
+        diameter_in: Pipe diameter(s) in inches
+        slope: Pipe slope(s) in ft/ft
+        depth_ratio: Flow depth(s) as a fraction of diameter (d/D), 0.01–1.0
+        n: Manning's roughness coefficient(s)
+        use_table: Scale the full-pipe section by the precomputed ratio table
+            (see partial_flow_ratios) instead of evaluating the exact geometry
+
+    Returns:
+        dict of equal-length, unrounded lists: pipe_diameter_in, slope_ft_per_ft, depth_ratio,
+        flow_depth_ft, partial_flow_cfs, partial_velocity_fps, partial_area_sf,
+        full_flow_cfs, full_velocity_fps, meets_min_velocity, meets_recommended_velocity
+    """
+    _, (diameters, slopes, ratios, ns) = _broadcast(diameter_in, slope, depth_ratio, n)
+    section = _section_lookup()
+    diameter_col, slope_col, ratio_col, depth = [], [], [], []
+    partial_flow, partial_velocity, partial_area = [], [], []
+    full_flow, full_velocity = [], []
+    for d, s, ratio, rough in zip(diameters, slopes, ratios, ns):
+        if not 0.01 <= ratio <= 1.0:
+            raise ValueError("depth_ratio must be between 0.01 and 1.0")
+        A_full, _, K_full = section(d)
+        if use_table:
+            ratios_at_depth = partial_flow_ratios(ratio)
+            A_p = A_full * ratios_at_depth["area_ratio"]
+            K_p = K_full * ratios_at_depth["flow_ratio"]
+        else:
+            A_p, _, K_p = section(d, ratio)
+        conveyance_factor = math.sqrt(s) / rough
+        Q_full = K_full * conveyance_factor
+        Q_p = K_p * conveyance_factor
+        diameter_col.append(d)
+        slope_col.append(s)
+        ratio_col.append(ratio)
+        depth.append(ratio * (d / 12))
+        partial_flow.append(Q_p)
+        partial_velocity.append(Q_p / A_p if A_p > 0 else 0)
+        partial_area.append(A_p)
+        full_flow.append(Q_full)
+        full_velocity.append(Q_full / A_full)
+    return {
+        "pipe_diameter_in": diameter_col,
+        "slope_ft_per_ft": slope_col,
+        "depth_ratio": ratio_col,
+        "flow_depth_ft": depth,
+        "partial_flow_cfs": partial_flow,
+        "partial_velocity_fps": partial_velocity,
+        "partial_area_sf": partial_area,
+        "full_flow_cfs": full_flow,
+        "full_velocity_fps": full_velocity,
+        "meets_min_velocity": [V >= 2.0 for V in partial_velocity],
+        "meets_recommended_velocity": [V >= 2.5 for V in partial_velocity],
+    }
+
+
+@accepts_units(diameter_in="in")
+def minimum_slope_batch(diameter_in, target_velocity_fps=2.5, n=0.011) -> dict:
+    """
+    Minimum self-cleaning slope for many pipes at once: S = (V * n / R^(2/3))^2.
+
+    Args:
+        diameter_in: Pipe diameter(s) in inches
+        target_velocity_fps: Target velocity(ies) in ft/s
+        n: Manning's roughness coefficient(s)
+
+    Returns:
+        dict of equal-length, unrounded lists: pipe_diameter_in, target_velocity_fps,
+        mannings_n, minimum_slope_ft_per_ft
+    """
+    _, (diameters, velocities, ns) = _broadcast(diameter_in, target_velocity_fps, n)
+    r23 = {}
+    diameter_col, velocity_col, n_col, slopes = [], [], [], []
+    for d, v, rough in zip(diameters, velocities, ns):
+        root = r23.get(d)
+        if root is None:
+            root = r23[d] = math.pow(d / 12 / 4, _TWO_THIRDS)
+        diameter_col.append(d)
+        velocity_col.append(v)
+        n_col.append(rough)
+        slopes.append(math.pow((v * rough) / root, 2))
+    return {
+        "pipe_diameter_in": diameter_col,
+        "target_velocity_fps": velocity_col,
+        "mannings_n": n_col,
+        "minimum_slope_ft_per_ft": slopes,
+    }
+
+
+@accepts_units(diameter_in="in", target_flow_gpm="gpm")
+def flow_to_slope_batch(diameter_in, target_flow_gpm, n=0.013, depth_ratio=1.0) -> dict:
+    """
+    Slope needed to convey target flows for many pipes at once.
+
+    Args:
+        diameter_in: Pipe diameter(s) in inches
+        target_flow_gpm: Required flow(s) in GPM
+        n: Manning's roughness coefficient(s)
+        depth_ratio: d/D depth ratio(s) (1.0 = full)
+
+    Returns:
+        dict of equal-length, unrounded lists: pipe_diameter_in, target_flow_gpm,
+        target_flow_cfs, required_slope_ft_per_ft, resulting_velocity_fps, depth_ratio
+    """
+    _, (diameters, flows, ns, ratios) = _broadcast(diameter_in, target_flow_gpm, n, depth_ratio)
+    section = _section_lookup()
+    diameter_col, flow_col, cfs_col, slopes, velocities, ratio_col = [], [], [], [], [], []
+    for d, gpm, rough, ratio in zip(diameters, flows, ns, ratios):
+        A, _, K = section(d, ratio)
+        cfs = gpm / CFS_TO_GPM
+        diameter_col.append(d)
+        flow_col.append(gpm)
+        cfs_col.append(cfs)
+        # Q = (1/n) * A * R^(2/3) * S^(1/2)  →  S = (Q * n / (A * R^(2/3)))^2
+        slopes.append(math.pow((cfs * rough) / K, 2))
+        velocities.append(cfs / A)
+        ratio_col.append(ratio)
+    return {
+        "pipe_diameter_in": diameter_col,
+        "target_flow_gpm": flow_col,
+        "target_flow_cfs": cfs_col,
+        "required_slope_ft_per_ft": slopes,
+        "resulting_velocity_fps": velocities,
+        "depth_ratio": ratio_col,
+    }
+
+
+def _flow_ratio(y: float) -> tuple:
+    """Q/Q_full at d/D = y and its derivative d(Q/Q_full)/dy, for any circular pipe."""
+    theta = 2 * math.acos(1 - 2 * y)
+    sin_t = math.sin(theta)
+    area = (theta - sin_t) / (2 * math.pi)
+    radius = 1 - sin_t / theta
+    radius23 = math.pow(radius, _TWO_THIRDS)
+    d_area = (1 - math.cos(theta)) / (2 * math.pi)
+    d_radius = (sin_t - theta * math.cos(theta)) / (theta * theta)
+    d_theta = 2 / math.sqrt(y * (1 - y))
+    return area * radius23, (d_area * radius23 + area * _TWO_THIRDS * d_radius / math.pow(radius, 1 / 3)) * d_theta
+
+
+PEAK_FLOW_RATIO = _flow_ratio(PEAK_DEPTH_RATIO)[0]
+
+TABLE_RESOLUTION = 4096
+_RATIO_TABLE = {}
+
+
+def _ratio_table() -> dict:
+    """
+    Dimensionless partial-flow ratios, built on first use.
+
+    The grid is uniform in the central angle theta rather than in d/D: every
+    ratio is smooth in theta, while R/R_full has a square-root cusp in d/D at
+    the crown.
+    """
+    if not _RATIO_TABLE:
+        step = 2 * math.pi / TABLE_RESOLUTION
+        depth, area, radius, flow = [0.0], [0.0], [0.0], [0.0]
+        for i in range(1, TABLE_RESOLUTION + 1):
+            theta = i * step
+            sin_t = math.sin(theta)
+            depth.append((1 - math.cos(theta / 2)) / 2)
+            area.append((theta - sin_t) / (2 * math.pi))
+            radius.append(1 - sin_t / theta)
+            flow.append(area[-1] * math.pow(radius[-1], _TWO_THIRDS))
+        # Rising limb for inverse lookups, closed with the exact peak.
+        peak_theta = 2 * math.acos(1 - 2 * PEAK_DEPTH_RATIO)
+        last = int(peak_theta / step)
+        _RATIO_TABLE.update(
+            step=step,
+            depth=depth,
+            area=area,
+            radius=radius,
+            flow=flow,
+            velocity=[q / a if a > 0 else 0.0 for q, a in zip(flow, area)],
+            rising_theta=[i * step for i in range(last + 1)] + [peak_theta],
+            rising_flow=flow[: last + 1] + [PEAK_FLOW_RATIO],
+        )
+    return _RATIO_TABLE
+
+
+def _rising_bracket(flow_ratio: float) -> tuple:
+    """Table cell (low, high) holding the d/D for 0 < Q/Q_full < peak, plus the interpolated d/D."""
+    table = _ratio_table()
+    flows, thetas = table["rising_flow"], table["rising_theta"]
+    cell = bisect_left(flows, flow_ratio)
+    q_low = flows[cell - 1]
+    theta = thetas[cell - 1] + (thetas[cell] - thetas[cell - 1]) * (flow_ratio - q_low) / (flows[cell] - q_low)
+    low = (1 - math.cos(thetas[cell - 1] / 2)) / 2
+    high = (1 - math.cos(thetas[cell] / 2)) / 2
+    return low, high, (1 - math.cos(theta / 2)) / 2
 
+
+def partial_flow_ratios(depth_ratio: float) -> dict:
+    """
+    Look up A/A_full, R/R_full, Q/Q_full and V/V_full at a depth ratio from the precomputed table.
+
+    Linear interpolation on a 4096-step grid. Against the exact geometry the
+    absolute error is below 2e-6 for every ratio, and the relative error is
+    below 5e-5 for d/D >= 0.01.
+
+    Args:
+        depth_ratio: Flow depth as fraction of diameter (d/D), 0.0–1.0
+
+    Returns:
+        dict with area_ratio, radius_ratio, flow_ratio, velocity_ratio
+    """
+    if not 0.0 <= depth_ratio <= 1.0:
+        raise ValueError("depth_ratio must be between 0.0 and 1.0")
+    table = _ratio_table()
+    position = 2 * math.acos(1 - 2 * depth_ratio) / table["step"]
+    i = min(int(position), TABLE_RESOLUTION - 1)
+    t = position - i
+    return {
+        key: table[column][i] + (table[column][i + 1] - table[column][i]) * t
+        for key, column in (
+            ("area_ratio", "area"),
+            ("radius_ratio", "radius"),
+            ("flow_ratio", "flow"),
+            ("velocity_ratio", "velocity"),
+        )
+    }
+
+
+def depth_ratio_from_flow_ratio(flow_ratio: float) -> float:
+    """
+    Look up the d/D that carries a given Q/Q_full, on the rising limb of the curve.
+
+    Interpolated from the precomputed table. The d/D error is below 1e-6 up to
+    Q/Q_full = 1.07 and about 1e-5 at the flat peak (Q/Q_full ~ 1.076). At or
+    above the peak the pipe is surcharged and 1.0 is returned.
+    """
+    if flow_ratio <= 0:
+        return 0.0
+    if flow_ratio >= PEAK_FLOW_RATIO:
+        return 1.0
+    return _rising_bracket(flow_ratio)[2]
+
+
+def _solve_depth_ratio(flow_ratio: float, guess: float | None = None, tol: float = 1e-10) -> tuple:
+    """
+    Solve Q/Q_full -> d/D on the rising limb with a bracketed (safeguarded) Newton iteration.
+
+    Returns (depth_ratio, iterations). Flows at or above the peak return d/D = 1.0.
+    """
+    if flow_ratio <= 0:
+        return 0.0, 0
+    if flow_ratio >= PEAK_FLOW_RATIO:
+        return 1.0, 0
+    low, high, interpolated = _rising_bracket(flow_ratio)
+    if guess is None or not low < guess < high:
+        guess = interpolated
+    y = min(max(guess, low + 1e-15), high)
+    for iteration in range(1, 60):
+        q, dq = _flow_ratio(y)
+        residual = q - flow_ratio
+        if residual > 0:
+            high = y
+        else:
+            low = y
+        step = residual / dq if dq > 0 else math.inf
+        if abs(step) < tol:
+            return y - step, iteration
+        y = y - step
+        if not low < y < high:
+            y = (low + high) / 2
+        if high - low < tol:
+            return y, iteration
+    return y, iteration
+
+
+@accepts_units(diameter_in="in", flow_gpm="gpm")
+def normal_depth_batch(diameter_in, flow_gpm, slope, n=0.013, use_table=False) -> dict:
+    """
+    Normal depth and velocity for given flows in many pipes at once.
+
+    Args:
+        diameter_in: Pipe diameter(s) in inches
+        flow_gpm: Flow(s) in GPM
+        slope: Pipe slope(s) in ft/ft (must be > 0)
+        n: Manning's roughness coefficient(s)
+        use_table: Take d/D straight from the precomputed table (depth_ratio_from_flow_ratio)
+            instead of polishing it with Newton iterations
+
+    Returns:
+        dict of equal-length, unrounded lists: pipe_diameter_in, flow_cfs, full_flow_cfs,
+        flow_ratio, depth_ratio, flow_depth_ft, velocity_fps, surcharged
+    """
+    _, (diameters, flows, slopes, ns) = _broadcast(diameter_in, flow_gpm, slope, n)
+    section = _section_lookup()
+    diameter_col, cfs_col, full_col, ratio_col = [], [], [], []
+    depth_col, depth_ft, velocity, surcharged = [], [], [], []
+    previous = None
+    for d, gpm, s, rough in zip(diameters, flows, slopes, ns):
+        if s <= 0:
+            raise ValueError("slope must be greater than 0 for a normal-depth solution")
+        A_full, _, K_full = section(d)
+        q = gpm / CFS_TO_GPM
+        q_full = K_full * math.sqrt(s) / rough
+        ratio = q / q_full
+        # Neighbouring segments usually flow at similar depths; the last answer is the first guess.
+        if use_table:
+            y = depth_ratio_from_flow_ratio(ratio)
+        else:
+            y, _ = _solve_depth_ratio(ratio, previous)
+        previous = y if 0 < y < 1 else None
+        area = _section(d, y)[0] if 0 < y < 1 else A_full
+        diameter_col.append(d)
+        cfs_col.append(q)
+        full_col.append(q_full)
+        ratio_col.append(ratio)
+        depth_col.append(y)
+        depth_ft.append(y * (d / 12))
+        velocity.append(q / area if q > 0 else 0.0)
+        surcharged.append(ratio > PEAK_FLOW_RATIO)
+    return {
+        "pipe_diameter_in": diameter_col,
+        "flow_cfs": cfs_col,
+        "full_flow_cfs": full_col,
+        "flow_ratio": ratio_col,
+        "depth_ratio": depth_col,
+        "flow_depth_ft": depth_ft,
+        "velocity_fps": velocity,
+        "surcharged": surcharged,
+    }
+
+
+@accepts_units(diameter_in="in", flow_gpm="gpm")
+def normal_depth(diameter_in: float, flow_gpm: float, slope: float, n: float = 0.013) -> dict:
+    """
+    Solve for the flow depth and velocity of a given flow in a pipe at a given slope.
+
+    Args:
+        diameter_in: Pipe diameter in inches
+        flow_gpm: Flow in GPM
+        slope: Pipe slope in ft/ft
+        n: Manning's roughness coefficient
+
+    Returns:
+        dict with depth ratio, flow depth, velocity and capacity used
+    """
+    batch = normal_depth_batch(diameter_in, flow_gpm, slope, n)
+    velocity = batch["velocity_fps"][0]
+    depth_ft = batch["flow_depth_ft"][0]
+
+    return {
+        "pipe_diameter_in": diameter_in,
+        "slope_ft_per_ft": slope,
+        "mannings_n": n,
+        "flow_gpm": flow_gpm,
+        "flow_cfs": round(batch["flow_cfs"][0], 4),
+        "full_flow_cfs": round(batch["full_flow_cfs"][0], 4),
+        "capacity_used_pct": round(batch["flow_ratio"][0] * 100, 1),
+        "depth_ratio": round(batch["depth_ratio"][0], 4),
+        "flow_depth_ft": round(depth_ft, 3),
+        "flow_depth_in": round(depth_ft * 12, 2),
+        "velocity_fps": round(velocity, 3),
+        "surcharged": batch["surcharged"][0],
+        "meets_min_velocity": velocity >= 2.0,
+        "meets_recommended_velocity": velocity >= 2.5,
+    }
+
+
+@accepts_units(diameter_in="in")
 def pipe_flow_full(diameter_in: float, slope: float, n: float = 0.013) -> dict:
     """
     Calculate full-pipe flow capacity and velocity using Manning's equation.
@@ -33,14 +501,8 @@ def pipe_flow_full(diameter_in: float, slope: float, n: float = 0.013) -> dict:
     Returns:
         dict with flow_cfs, flow_gpm, velocity_fps, area_sf, hydraulic_radius_ft
     """
-    D = diameter_in / 12  # diameter in feet
-    r = D / 2
-    A = math.pi * r * r  # cross-sectional area
-    P = math.pi * D       # wetted perimeter
-    R = A / P             # hydraulic radius = D/4
-
-    Q = (1.0 / n) * A * math.pow(R, 2.0/3.0) * math.pow(slope, 0.5)
-    V = Q / A
+    batch = pipe_flow_full_batch(diameter_in, slope, n)
+    Q = batch["flow_cfs"][0]
 
     return {
         "pipe_diameter_in": diameter_in,
@@ -48,14 +510,15 @@ def pipe_flow_full(diameter_in: float, slope: float, n: float = 0.013) -> dict:
         "slope_pct": round(slope * 100, 4),
         "mannings_n": n,
         "flow_cfs": round(Q, 4),
-        "flow_gpm": round(Q * 448.831, 1),
-        "flow_mgd": round(Q * 0.646317, 4),
-        "velocity_fps": round(V, 3),
-        "area_sf": round(A, 5),
-        "hydraulic_radius_ft": round(R, 5),
+        "flow_gpm": round(batch["flow_gpm"][0], 1),
+        "flow_mgd": round(batch["flow_mgd"][0], 4),
+        "velocity_fps": round(batch["velocity_fps"][0], 3),
+        "area_sf": round(batch["area_sf"][0], 5),
+        "hydraulic_radius_ft": round(batch["hydraulic_radius_ft"][0], 5),
     }
 
 
+@accepts_units(diameter_in="in")
 def pipe_flow_partial(
     diameter_in: float, slope: float,
     depth_ratio: float = 0.8, n: float = 0.013,
@@ -72,28 +535,10 @@ def pipe_flow_partial(
     Returns:
         dict with partial and full flow/velocity for comparison
     """
-    if not 0.01 <= depth_ratio <= 1.0:
-        raise ValueError("depth_ratio must be between 0.01 and 1.0")
-
-    D = diameter_in / 12
-    r = D / 2
-
-    # Full pipe
-    A_full = math.pi * r * r
-    R_full = D / 4
-    Q_full = (1.0 / n) * A_full * math.pow(R_full, 2.0/3.0) * math.pow(slope, 0.5)
-    V_full = Q_full / A_full
-
-    # Partial flow using central angle
-    theta = 2 * math.acos(1 - 2 * depth_ratio)
-    A_p = (r * r / 2) * (theta - math.sin(theta))
-    P_p = r * theta
-    R_p = A_p / P_p if P_p > 0 else 0
-
-    Q_p = (1.0 / n) * A_p * math.pow(R_p, 2.0/3.0) * math.pow(slope, 0.5)
-    V_p = Q_p / A_p if A_p > 0 else 0
-
-    depth_ft = depth_ratio * D
+    batch = pipe_flow_partial_batch(diameter_in, slope, depth_ratio, n)
+    Q_p = batch["partial_flow_cfs"][0]
+    Q_full = batch["full_flow_cfs"][0]
+    depth_ft = batch["flow_depth_ft"][0]
 
     return {
         "pipe_diameter_in": diameter_in,
@@ -103,20 +548,21 @@ def pipe_flow_partial(
         "flow_depth_in": round(depth_ft * 12, 2),
         "partial": {
             "flow_cfs": round(Q_p, 4),
-            "flow_gpm": round(Q_p * 448.831, 1),
-            "velocity_fps": round(V_p, 3),
-            "area_sf": round(A_p, 5),
+            "flow_gpm": round(Q_p * CFS_TO_GPM, 1),
+            "velocity_fps": round(batch["partial_velocity_fps"][0], 3),
+            "area_sf": round(batch["partial_area_sf"][0], 5),
         },
         "full_pipe": {
             "flow_cfs": round(Q_full, 4),
-            "flow_gpm": round(Q_full * 448.831, 1),
-            "velocity_fps": round(V_full, 3),
+            "flow_gpm": round(Q_full * CFS_TO_GPM, 1),
+            "velocity_fps": round(batch["full_velocity_fps"][0], 3),
         },
-        "meets_min_velocity": V_p >= 2.0,
-        "meets_recommended_velocity": V_p >= 2.5,
+        "meets_min_velocity": batch["meets_min_velocity"][0],
+        "meets_recommended_velocity": batch["meets_recommended_velocity"][0],
     }
 
 
+@accepts_units(diameter_in="in")
 def minimum_slope(
     diameter_in: float, target_velocity_fps: float = 2.5,
     n: float = 0.011,
@@ -133,11 +579,7 @@ def minimum_slope(
     Returns:
         dict with minimum slope and equivalent drop values
     """
-    D = diameter_in / 12
-    R = D / 4  # hydraulic radius for full pipe
-
-    # S = (V * n / R^(2/3))^2
-    min_slope = math.pow((target_velocity_fps * n) / math.pow(R, 2.0/3.0), 2)
+    min_slope = minimum_slope_batch(diameter_in, target_velocity_fps, n)["minimum_slope_ft_per_ft"][0]
     drop_per_100ft = min_slope * 100
     drop_per_100ft_in = drop_per_100ft * 12
 
@@ -153,6 +595,7 @@ def minimum_slope(
     }
 
 
+@accepts_units(diameter_in="in", target_flow_gpm="gpm")
 def flow_to_slope(
     diameter_in: float, target_flow_gpm: float,
     n: float = 0.013, depth_ratio: float = 1.0,
@@ -169,29 +612,15 @@ def flow_to_slope(
     Returns:
         dict with required slope and resulting velocity
     """
-    target_cfs = target_flow_gpm / 448.831
-    D = diameter_in / 12
-    r = D / 2
-
-    if depth_ratio >= 1.0:
-        A = math.pi * r * r
-        R = D / 4
-    else:
-        theta = 2 * math.acos(1 - 2 * depth_ratio)
-        A = (r * r / 2) * (theta - math.sin(theta))
-        P = r * theta
-        R = A / P
-
-    # Q = (1/n) * A * R^(2/3) * S^(1/2)  →  S = (Q * n / (A * R^(2/3)))^2
-    required_slope = math.pow((target_cfs * n) / (A * math.pow(R, 2.0/3.0)), 2)
-    velocity = target_cfs / A
+    batch = flow_to_slope_batch(diameter_in, target_flow_gpm, n, depth_ratio)
+    required_slope = batch["required_slope_ft_per_ft"][0]
 
     return {
         "pipe_diameter_in": diameter_in,
         "target_flow_gpm": target_flow_gpm,
-        "target_flow_cfs": round(target_cfs, 4),
+        "target_flow_cfs": round(batch["target_flow_cfs"][0], 4),
         "required_slope_ft_per_ft": round(required_slope, 6),
         "required_slope_pct": round(required_slope * 100, 4),
-        "resulting_velocity_fps": round(velocity, 3),
+        "resulting_velocity_fps": round(batch["resulting_velocity_fps"][0], 3),
         "depth_ratio": depth_ratio,
     }
@@ -0,0 +1,351 @@
+"""
+Gravity Pipe Sizing Optimizer
+Searches the regional pipe catalog (every material and size × candidate slopes)
+for the cheapest pipe that carries a design flow within velocity, d/D and cover
+limits. Installed cost is pipe material plus trench excavation, bedding and
+import backfill from the trench takeoff in trench.py.
+"""
+import math
+
+from ..calculations.quantity import accepts_units
+from ..estimating.estimating_tools import get_rates
+from .hydraulics import CFS_TO_GPM, MANNINGS_N, _flow_ratio, _section_lookup, _solve_depth_ratio, pipe_flow_full_batch
+from .sewer_network import MAX_DEPTH_RATIO, MAX_VELOCITY_FPS, MIN_VELOCITY_FPS
+from .trench import SPOIL_TONS_PER_CY, _trench_quantities
+
+DEFAULT_SLOPES = (0.0005, 0.001, 0.002, 0.003, 0.004, 0.005, 0.0075, 0.01, 0.015, 0.02, 0.03, 0.05)
+DEFAULT_MIN_COVER_FT = 3.0
+DEFAULT_EXCAVATION_COST_CY = 14.00  # all-in excavate, load and haul off
+TRENCH_CLEARANCE_FT = 2.0  # bottom width = pipe OD + 1 ft each side
+
+# Approximate wall thickness (in) used to turn nominal size into outside diameter.
+# RCP follows the ASTM C76 Wall B rule of thumb: D/12 + 1 in.
+_WALL_IN = {"pvc": 0.5, "hdpe": 0.4, "dip": 0.5}
+
+
+def _outside_diameter_in(material: str, diameter_in: float) -> float:
+    if material == "rcp":
+        return diameter_in + 2 * (diameter_in / 12 + 1)
+    return diameter_in + 2 * _WALL_IN.get(material, 0.5)
+
+
+def pipe_catalog(
+    region: str = "national",
+    materials=None,
+    min_diameter_in: float = 0,
+    max_diameter_in: float = 0,
+) -> dict:
+    """
+    Parse a region's pipe price list into a sizing catalog.
+
+    Args:
+        region: Rate table key (see get_regions)
+        materials: Optional catalog prefixes or base materials to keep (e.g. ["pvc_sdr35", "rcp"] or ["pvc"])
+        min_diameter_in: Smallest nominal size to keep (e.g. 8 for sanitary mains)
+        max_diameter_in: Largest nominal size to keep (0 = no limit)
+
+    Returns:
+        dict of equal-length lists: key, material, diameter_in, outside_diameter_in,
+        mannings_n, cost_per_lf, description
+    """
+    wanted = {str(m).strip().lower() for m in materials} if materials else None
+    catalog = {k: [] for k in ("key", "material", "diameter_in", "outside_diameter_in", "mannings_n",
+                               "cost_per_lf", "description")}
+    for key, entry in sorted(get_rates(region)["materials"].get("pipe", {}).items()):
+        prefix, _, size = key.rpartition("_")
+        material = prefix.split("_")[0]
+        if not size.isdigit() or material not in MANNINGS_N or str(entry.get("unit", "LF")).upper() != "LF":
+            continue
+        if wanted is not None and prefix not in wanted and material not in wanted:
+            continue
+        diameter = float(size)
+        if diameter < min_diameter_in or (max_diameter_in and diameter > max_diameter_in):
+            continue
+        catalog["key"].append(key)
+        catalog["material"].append(material)
+        catalog["diameter_in"].append(diameter)
+        catalog["outside_diameter_in"].append(_outside_diameter_in(material, diameter))
+        catalog["mannings_n"].append(MANNINGS_N[material])
+        catalog["cost_per_lf"].append(float(entry["cost"]))
+        catalog["description"].append(entry.get("description", key))
+    return catalog
+
+
+def _candidate_grid(catalog: dict, slopes) -> dict:
+    """Cross every catalog pipe with every slope and run full-pipe Manning's over the grid in one batch."""
+    slopes = [float(s) for s in slopes]
+    if not slopes or min(slopes) <= 0:
+        raise ValueError("Candidate slopes must all be greater than 0")
+    pipe_index = [i for i in range(len(catalog["key"])) for _ in slopes]
+    slope_col = slopes * len(catalog["key"])
+    full = pipe_flow_full_batch(
+        [catalog["diameter_in"][i] for i in pipe_index], slope_col, [catalog["mannings_n"][i] for i in pipe_index]
+    )
+    return {"pipe": pipe_index, "slope": slope_col, "full_flow_cfs": full["flow_cfs"]}
+
+
+def _unit_prices(region: str, excavation_cost_cy: float) -> dict:
+    aggregate = get_rates(region)["materials"].get("aggregate", {})
+    return {
+        "excavation_cy": float(excavation_cost_cy),
+        "bedding_ton": float(aggregate.get("crushed_rock_34", {}).get("cost", 0.0)),
+        "backfill_ton": float(aggregate.get("pit_run", {}).get("cost", 0.0)),
+    }
+
+
+def _size_segment(
+    catalog: dict,
+    grid: dict,
+    prices: dict,
+    flow_gpm: float,
+    length_ft: float,
+    ground_slope: float,
+    limits: dict,
+) -> tuple:
+    """
+    Evaluate one design flow against the whole candidate grid.
+
+    Returns (evaluated candidates sorted by cost, infeasible counts by reason).
+    Candidates whose flow ratio already exceeds the d/D limit are rejected
+    before the depth solve.
+    """
+    q = flow_gpm / CFS_TO_GPM
+    section = _section_lookup()
+    feasible, rejected = [], {}
+    previous = None
+    for j, i in enumerate(grid["pipe"]):
+        slope = grid["slope"][j]
+        ratio = q / grid["full_flow_cfs"][j]
+        reason = None
+        if ratio > limits["max_flow_ratio"]:
+            reason = "over_design_depth"
+        else:
+            y, _ = _solve_depth_ratio(ratio, previous)
+            previous = y
+            velocity = q / section(catalog["diameter_in"][i], y)[0] if q > 0 else 0.0
+            if velocity < limits["min_velocity_fps"]:
+                reason = "low_velocity"
+            elif velocity > limits["max_velocity_fps"]:
+                reason = "high_velocity"
+        od_in = catalog["outside_diameter_in"][i]
+        # The shallow end of the run sits at minimum cover; the other end is deeper by the
+        # grade difference between pipe and ground.
+        shallow_ft = limits["min_cover_ft"] + (od_in + limits["bedding_depth_in"]) / 12
+        fall_ft = abs(slope - ground_slope) * length_ft
+        if reason is None and limits["max_trench_depth_ft"] and shallow_ft + fall_ft > limits["max_trench_depth_ft"]:
+            reason = "too_deep"
+        if reason is not None:
+            rejected[reason] = rejected.get(reason, 0) + 1
+            continue
+        width_ft = od_in / 12 + TRENCH_CLEARANCE_FT
+        depth_ft = shallow_ft + fall_ft / 2
+        _, excav_cy, _, _, bedding_tons, backfill_cy, _, _ = _trench_quantities(
+            length_ft, width_ft, depth_ft, od_in, limits["bedding_depth_in"], 0, True
+        )
+        pipe_cost = catalog["cost_per_lf"][i] * length_ft
+        trench_cost = (
+            excav_cy * prices["excavation_cy"]
+            + bedding_tons * prices["bedding_ton"]
+            + backfill_cy * SPOIL_TONS_PER_CY * prices["backfill_ton"]
+        )
+        feasible.append({
+            "pipe": i,
+            "slope": slope,
+            "depth_ratio": y,
+            "velocity_fps": velocity,
+            "capacity_gpm": grid["full_flow_cfs"][j] * CFS_TO_GPM,
+            "trench_width_ft": width_ft,
+            "avg_trench_depth_ft": depth_ft,
+            "max_trench_depth_ft": shallow_ft + fall_ft,
+            "excavation_cy": excav_cy,
+            "bedding_tons": bedding_tons,
+            "backfill_cy": backfill_cy,
+            "pipe_cost": pipe_cost,
+            "trench_cost": trench_cost,
+            "total_cost": pipe_cost + trench_cost,
+        })
+    feasible.sort(key=lambda c: (c["total_cost"], catalog["diameter_in"][c["pipe"]], -c["slope"]))
+    return feasible, rejected
+
+
+def _describe(catalog: dict, candidate: dict, length_ft: float) -> dict:
+    i = candidate["pipe"]
+    return {
+        "catalog_key": catalog["key"][i],
+        "description": catalog["description"][i],
+        "material": catalog["material"][i],
+        "diameter_in": catalog["diameter_in"][i],
+        "slope_ft_per_ft": candidate["slope"],
+        "slope_pct": round(candidate["slope"] * 100, 3),
+        "mannings_n": catalog["mannings_n"][i],
+        "capacity_gpm": round(candidate["capacity_gpm"], 1),
+        "depth_ratio": round(candidate["depth_ratio"], 3),
+        "velocity_fps": round(candidate["velocity_fps"], 2),
+        "trench_width_ft": round(candidate["trench_width_ft"], 2),
+        "avg_trench_depth_ft": round(candidate["avg_trench_depth_ft"], 2),
+        "max_trench_depth_ft": round(candidate["max_trench_depth_ft"], 2),
+        "excavation_cy": round(candidate["excavation_cy"], 2),
+        "bedding_tons": round(candidate["bedding_tons"], 2),
+        "backfill_cy": round(candidate["backfill_cy"], 2),
+        "pipe_cost": round(candidate["pipe_cost"], 2),
+        "trench_cost": round(candidate["trench_cost"], 2),
+        "total_cost": round(candidate["total_cost"], 2),
+        "cost_per_lf": round(candidate["total_cost"] / length_ft, 2),
+    }
+
+
+def _prepare(region, materials, slopes, min_diameter_in, max_velocity_fps, min_velocity_fps, max_depth_ratio,
+             min_cover_ft, max_trench_depth_ft, bedding_depth_in, excavation_cost_cy):
+    catalog = pipe_catalog(region, materials, min_diameter_in)
+    if not catalog["key"]:
+        raise ValueError(f"No pipe in the '{region}' catalog matches materials={materials}")
+    if not 0 < max_depth_ratio < 1:
+        raise ValueError("max_depth_ratio must be between 0 and 1")
+    limits = {
+        "max_flow_ratio": _flow_ratio(max_depth_ratio)[0],
+        "min_velocity_fps": min_velocity_fps,
+        "max_velocity_fps": max_velocity_fps,
+        "min_cover_ft": min_cover_ft,
+        "max_trench_depth_ft": max_trench_depth_ft,
+        "bedding_depth_in": bedding_depth_in,
+    }
+    grid = _candidate_grid(catalog, DEFAULT_SLOPES if slopes is None else slopes)
+    return catalog, grid, limits, _unit_prices(region, excavation_cost_cy)
+
+
+@accepts_units(flow_gpm="gpm", length_ft="ft", min_cover_ft="ft", max_trench_depth_ft="ft",
+               min_diameter_in="in", bedding_depth_in="in")
+def size_pipe(
+    flow_gpm: float,
+    length_ft: float = 100.0,
+    region: str = "national",
+    materials=None,
+    slopes=None,
+    min_velocity_fps: float = MIN_VELOCITY_FPS,
+    max_velocity_fps: float = MAX_VELOCITY_FPS,
+    max_depth_ratio: float = MAX_DEPTH_RATIO,
+    min_cover_ft: float = DEFAULT_MIN_COVER_FT,
+    ground_slope: float = 0.0,
+    max_trench_depth_ft: float = 0,
+    min_diameter_in: float = 0,
+    bedding_depth_in: float = 6,
+    excavation_cost_cy: float = DEFAULT_EXCAVATION_COST_CY,
+    alternatives: int = 5,
+) -> dict:
+    """
+    Find the cheapest catalog pipe and slope that carries a design flow.
+
+    Args:
+        flow_gpm: Design (peak) flow in GPM
+        length_ft: Run length in feet, used for installed cost and trench depth
+        region: Rate table key for pipe and aggregate prices
+        materials: Optional catalog prefixes or materials to consider (default: all)
+        slopes: Candidate slopes in ft/ft (default: DEFAULT_SLOPES)
+        min_velocity_fps: Self-cleaning velocity at design flow (2.0 sanitary, 2.5 storm)
+        max_velocity_fps: Scour velocity limit
+        max_depth_ratio: Maximum d/D at design flow
+        min_cover_ft: Minimum cover over the pipe crown
+        ground_slope: Ground surface slope along the run in ft/ft (falling downstream)
+        max_trench_depth_ft: Reject candidates deeper than this at the deep end (0 = no limit)
+        min_diameter_in: Smallest nominal size allowed
+        bedding_depth_in: Bedding depth in inches
+        excavation_cost_cy: All-in excavation and haul-off price per CY
+        alternatives: Number of next-cheapest feasible options to return
+
+    Returns:
+        dict with the best candidate, ranked alternatives and candidate counts
+    """
+    if flow_gpm <= 0:
+        raise ValueError("flow_gpm must be greater than 0")
+    if length_ft <= 0:
+        raise ValueError("length_ft must be greater than 0")
+    catalog, grid, limits, prices = _prepare(
+        region, materials, slopes, min_diameter_in, max_velocity_fps, min_velocity_fps, max_depth_ratio,
+        min_cover_ft, max_trench_depth_ft, bedding_depth_in, excavation_cost_cy,
+    )
+    feasible, rejected = _size_segment(catalog, grid, prices, flow_gpm, length_ft, ground_slope, limits)
+    return {
+        "flow_gpm": flow_gpm,
+        "length_ft": length_ft,
+        "region": region,
+        "best": _describe(catalog, feasible[0], length_ft) if feasible else None,
+        "alternatives": [_describe(catalog, c, length_ft) for c in feasible[1: 1 + max(0, int(alternatives))]],
+        "candidates_evaluated": len(grid["pipe"]),
+        "feasible_count": len(feasible),
+        "rejected": rejected,
+    }
+
+
+@accepts_units(min_cover_ft="ft", max_trench_depth_ft="ft", min_diameter_in="in", bedding_depth_in="in")
+def size_pipe_batch(
+    segments: list,
+    region: str = "national",
+    materials=None,
+    slopes=None,
+    min_velocity_fps: float = MIN_VELOCITY_FPS,
+    max_velocity_fps: float = MAX_VELOCITY_FPS,
+    max_depth_ratio: float = MAX_DEPTH_RATIO,
+    min_cover_ft: float = DEFAULT_MIN_COVER_FT,
+    max_trench_depth_ft: float = 0,
+    min_diameter_in: float = 0,
+    bedding_depth_in: float = 6,
+    excavation_cost_cy: float = DEFAULT_EXCAVATION_COST_CY,
+) -> dict:
+    """
+    Size every segment of a network against one shared candidate grid.
+
+    The catalog and full-pipe capacities are built once; each segment only
+    solves depths for the candidates its flow does not already rule out.
+    Flows from analyze_sewer_network can be fed straight in.
+
+    Args:
+        segments: List of dicts with id, flow_gpm, length_ft and optional ground_slope
+        (remaining args as in size_pipe)
+
+    Returns:
+        dict of equal-length, unrounded lists per segment (catalog_key, material, diameter_in,
+        slope_ft_per_ft, depth_ratio, velocity_fps, total_cost; None where nothing fits),
+        the ids that could not be sized, and the total installed cost
+    """
+    catalog, grid, limits, prices = _prepare(
+        region, materials, slopes, min_diameter_in, max_velocity_fps, min_velocity_fps, max_depth_ratio,
+        min_cover_ft, max_trench_depth_ft, bedding_depth_in, excavation_cost_cy,
+    )
+    columns = {k: [] for k in ("id", "flow_gpm", "length_ft", "catalog_key", "material", "diameter_in",
+                               "slope_ft_per_ft", "depth_ratio", "velocity_fps", "total_cost")}
+    unsized = []
+    for segment in segments:
+        seg_id = str(segment["id"])
+        flow = float(segment["flow_gpm"])
+        length = float(segment["length_ft"])
+        if length <= 0:
+            raise ValueError(f"Segment '{seg_id}' must have a positive length_ft")
+        best = None
+        if flow > 0:
+            feasible, _ = _size_segment(
+                catalog, grid, prices, flow, length, float(segment.get("ground_slope", 0) or 0), limits
+            )
+            best = feasible[0] if feasible else None
+        columns["id"].append(seg_id)
+        columns["flow_gpm"].append(flow)
+        columns["length_ft"].append(length)
+        if best is None:
+            unsized.append(seg_id)
+            for key in ("catalog_key", "material", "diameter_in", "slope_ft_per_ft", "depth_ratio",
+                        "velocity_fps", "total_cost"):
+                columns[key].append(None)
+            continue
+        i = best["pipe"]
+        columns["catalog_key"].append(catalog["key"][i])
+        columns["material"].append(catalog["material"][i])
+        columns["diameter_in"].append(catalog["diameter_in"][i])
+        columns["slope_ft_per_ft"].append(best["slope"])
+        columns["depth_ratio"].append(best["depth_ratio"])
+        columns["velocity_fps"].append(best["velocity_fps"])
+        columns["total_cost"].append(best["total_cost"])
+    return {
+        "segments": columns,
+        "unsized": unsized,
+        "candidates_per_segment": len(grid["pipe"]),
+        "total_cost": math.fsum(c for c in columns["total_cost"] if c is not None),
+    }
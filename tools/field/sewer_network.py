@@ -0,0 +1,199 @@
+"""
+Gravity Sewer Network Analysis
+Accumulates flows through a network of manholes and pipe segments in
+topological order, then checks every segment for capacity, d/D, velocity and
+surcharge with the Manning's kernels in hydraulics.py.
+"""
+import math
+from array import array
+
+from .hydraulics import CFS_TO_GPM, MANNINGS_N, PEAK_FLOW_RATIO, _section, _solve_depth_ratio, pipe_flow_full_batch
+
+# Design limits (ASCE MOP 36 / 10 States Standards)
+MAX_DEPTH_RATIO = 0.75
+MIN_VELOCITY_FPS = 2.0
+MAX_VELOCITY_FPS = 10.0
+
+
+def _segment_n(segment: dict) -> float:
+    if segment.get("n"):
+        return float(segment["n"])
+    material = str(segment.get("material") or "concrete").strip().lower().replace(" ", "_")
+    if material not in MANNINGS_N:
+        raise ValueError(f"Unknown pipe material '{segment.get('material')}'. Use one of: {', '.join(MANNINGS_N)}")
+    return MANNINGS_N[material]
+
+
+def _topological_segments(node_count: int, upstream: array, downstream: array) -> tuple:
+    """Kahn's algorithm over a CSR adjacency (segments leaving each node)."""
+    out_count = array("l", [0]) * (node_count + 1)
+    in_degree = array("l", [0]) * node_count
+    for up, down in zip(upstream, downstream):
+        out_count[up + 1] += 1
+        in_degree[down] += 1
+    offsets = out_count
+    for node in range(node_count):
+        offsets[node + 1] += offsets[node]
+    cursor = array("l", offsets)
+    out_segments = array("l", [0]) * len(upstream)
+    for segment, up in enumerate(upstream):
+        out_segments[cursor[up]] = segment
+        cursor[up] += 1
+
+    ready = [node for node in range(node_count) if in_degree[node] == 0]
+    order = []
+    head = 0
+    while head < len(ready):
+        node = ready[head]
+        head += 1
+        for slot in range(offsets[node], offsets[node + 1]):
+            segment = out_segments[slot]
+            order.append(segment)
+            down = downstream[segment]
+            in_degree[down] -= 1
+            if in_degree[down] == 0:
+                ready.append(down)
+    if len(order) != len(upstream):
+        raise ValueError("Sewer network contains a loop; gravity networks must flow downstream only")
+    return order, offsets
+
+
+def analyze_sewer_network(
+    manholes: list,
+    segments: list,
+    max_depth_ratio: float = MAX_DEPTH_RATIO,
+    min_velocity_fps: float = MIN_VELOCITY_FPS,
+    max_velocity_fps: float = MAX_VELOCITY_FPS,
+    critical_count: int = 10,
+) -> dict:
+    """
+    Analyze a gravity sewer network segment by segment.
+
+    Args:
+        manholes: List of dicts with id and optional inflow_gpm (local load entering at that manhole)
+        segments: List of dicts with id, upstream, downstream (manhole ids), diameter_in, length_ft,
+            upstream_invert, downstream_invert, and material (MANNINGS_N key) or n
+        max_depth_ratio: Design d/D limit (default 0.75)
+        min_velocity_fps: Self-cleaning velocity (default 2.0 ft/s)
+        max_velocity_fps: Scour velocity limit (default 10.0 ft/s)
+        critical_count: Number of most-utilized segments to report
+
+    Returns:
+        dict with per-segment arrays, outfall flows, critical segments and a summary.
+        Where a manhole has several outlets its flow is split evenly between them.
+    """
+    node_index = {}
+    inflow_gpm = array("d")
+    for manhole in manholes:
+        node_id = str(manhole["id"])
+        if node_id in node_index:
+            raise ValueError(f"Duplicate manhole id '{node_id}'")
+        node_index[node_id] = len(inflow_gpm)
+        inflow_gpm.append(float(manhole.get("inflow_gpm", 0) or 0))
+
+    def node_of(segment: dict, key: str) -> int:
+        node_id = str(segment[key])
+        if node_id not in node_index:
+            node_index[node_id] = len(inflow_gpm)
+            inflow_gpm.append(0.0)
+        return node_index[node_id]
+
+    upstream = array("l", (node_of(segment, "upstream") for segment in segments))
+    downstream = array("l", (node_of(segment, "downstream") for segment in segments))
+    node_count = len(inflow_gpm)
+    order, offsets = _topological_segments(node_count, upstream, downstream)
+
+    # Accumulate flows downstream: a node's total leaves evenly through its outlets.
+    node_total = array("d", inflow_gpm)
+    flow_gpm = array("d", [0.0]) * len(segments)
+    for segment in order:
+        up = upstream[segment]
+        flow = node_total[up] / (offsets[up + 1] - offsets[up])
+        flow_gpm[segment] = flow
+        node_total[downstream[segment]] += flow
+
+    diameters = [float(segment["diameter_in"]) for segment in segments]
+    slopes = []
+    for segment in segments:
+        length = float(segment["length_ft"])
+        if length <= 0:
+            raise ValueError(f"Segment '{segment['id']}' must have a positive length_ft")
+        slopes.append((float(segment["upstream_invert"]) - float(segment["downstream_invert"])) / length)
+    ns = [_segment_n(segment) for segment in segments]
+    capacity = pipe_flow_full_batch(diameters, [max(s, 0.0) for s in slopes], ns)
+
+    depth_ratio, velocity, utilization, surcharged, flags = [], [], [], [], []
+    for i, flow in enumerate(flow_gpm):
+        q = flow / CFS_TO_GPM
+        q_full = capacity["flow_cfs"][i]
+        ratio = q / q_full if q_full > 0 else (math.inf if q > 0 else 0.0)
+        y, _ = _solve_depth_ratio(ratio)
+        area = _section(diameters[i], y)[0] if 0 < y < 1 else capacity["area_sf"][i]
+        v = q / area if q > 0 else 0.0
+        segment_flags = []
+        if slopes[i] <= 0:
+            segment_flags.append("adverse_or_flat_slope")
+        if ratio > PEAK_FLOW_RATIO:
+            segment_flags.append("surcharged")
+        elif y > max_depth_ratio:
+            segment_flags.append("over_design_depth")
+        if q > 0 and v < min_velocity_fps:
+            segment_flags.append("low_velocity")
+        if v > max_velocity_fps:
+            segment_flags.append("high_velocity")
+        depth_ratio.append(y)
+        velocity.append(v)
+        utilization.append(ratio)
+        surcharged.append(ratio > PEAK_FLOW_RATIO)
+        flags.append(segment_flags)
+
+    ids = [str(segment["id"]) for segment in segments]
+    ranked = sorted(range(len(segments)), key=lambda i: utilization[i], reverse=True)
+    critical = [
+        {
+            "id": ids[i],
+            "flow_gpm": round(flow_gpm[i], 1),
+            "capacity_gpm": round(capacity["flow_gpm"][i], 1),
+            "utilization": round(utilization[i], 3) if math.isfinite(utilization[i]) else None,
+            "depth_ratio": round(depth_ratio[i], 3),
+            "velocity_fps": round(velocity[i], 2),
+            "flags": flags[i],
+        }
+        for i in ranked[: max(0, int(critical_count))]
+    ]
+
+    node_ids = {index: node_id for node_id, index in node_index.items()}
+    outfalls = [
+        {"manhole": node_ids[node], "flow_gpm": round(node_total[node], 1)}
+        for node in range(node_count)
+        if offsets[node + 1] == offsets[node] and node_total[node] > 0
+    ]
+
+    return {
+        "segment_order": [ids[i] for i in order],
+        "segments": {
+            "id": ids,
+            "flow_gpm": list(flow_gpm),
+            "capacity_gpm": capacity["flow_gpm"],
+            "slope_ft_per_ft": slopes,
+            "mannings_n": ns,
+            # Flat or adverse segments carrying flow have infinite utilization; None keeps the result valid JSON.
+            "utilization": [ratio if math.isfinite(ratio) else None for ratio in utilization],
+            "depth_ratio": depth_ratio,
+            "velocity_fps": velocity,
+            "surcharged": surcharged,
+            "flags": flags,
+        },
+        "outfalls": outfalls,
+        "critical_segments": critical,
+        "summary": {
+            "manhole_count": node_count,
+            "segment_count": len(segments),
+            "surcharged_count": sum(surcharged),
+            "over_design_depth_count": sum(1 for f in flags if "over_design_depth" in f),
+            "low_velocity_count": sum(1 for f in flags if "low_velocity" in f),
+            "high_velocity_count": sum(1 for f in flags if "high_velocity" in f),
+            "adverse_slope_count": sum(1 for f in flags if "adverse_or_flat_slope" in f),
+            "total_outfall_flow_gpm": round(sum(o["flow_gpm"] for o in outfalls), 1),
+        },
+    }
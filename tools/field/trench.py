@@ -1,34 +1,37 @@
 """
 Trench & Excavation Calculation Tools
 Volume takeoff, backfill quantities, spoil haul, pipe bedding, and thrust blocks.
+Profile takeoffs stream station/elevation points and report quantities by reach.
 """
+import csv
+import inspect
+import io
 import math
+from pathlib import Path
 
+from ..calculations.quantity import accepts_units
+from ..calculations.unit_converter import ASPHALT_DENSITY_LBCF, CRUSHED_ROCK_TONS_PER_CY, SOIL_TONS_PER_CY
+from .hydraulics import _broadcast
+from .safety import OSHA_SLOPES
 
-def trench_volume(
+BEDDING_TONS_PER_CY = CRUSHED_ROCK_TONS_PER_CY
+SPOIL_TONS_PER_CY = SOIL_TONS_PER_CY
+PROTECTIVE_DEPTH_FT = 4.0  # OSHA 1926.652: no protective system required at or above this depth
+THRUST_BLOCK_THICKNESS_FT = 1.5  # assume 18" thick
+CONCRETE_PRICES_PER_CY = {3000: 166, 4000: 180, 5000: 195}
+
+
+def _trench_quantities(
     length_ft: float,
     width_ft: float,
     depth_ft: float,
-    pipe_od_in: float = 0,
-    bedding_depth_in: float = 6,
-    swell_pct: float = 25,
-    import_backfill: bool = True,
-) -> dict:
-    """
-    Calculate trench excavation, backfill, and spoil volumes.
-
-    Args:
-        length_ft: Trench length in linear feet
-        width_ft: Trench width in feet (bottom)
-        depth_ft: Trench depth in feet
-        pipe_od_in: Pipe outside diameter in inches (for void deduction)
-        bedding_depth_in: Bedding depth below pipe centerline in inches
-        swell_pct: Soil volume increase when excavated (%, typical: 25)
-        import_backfill: True if using import material for backfill
-
-    Returns:
-        dict with excavation_cy, backfill_cy, bedding_cy, spoil_cy
-    """
+    pipe_od_in: float,
+    bedding_depth_in: float,
+    swell_pct: float,
+    import_backfill: bool,
+) -> tuple:
+    """Unrounded (excavation cf, excavation cy, pipe void cy, bedding cy, bedding tons, backfill cy,
+    spoil cy, spoil tons) for a rectangular trench."""
     excav_cf = length_ft * width_ft * depth_ft
     excav_cy = excav_cf / 27
 
@@ -41,7 +44,7 @@ def trench_volume(
     bedding_ft = bedding_depth_in / 12
     bedding_cf = length_ft * width_ft * bedding_ft
     bedding_cy = bedding_cf / 27
-    bedding_tons = bedding_cy * 1.35  # approx for crushed rock
+    bedding_tons = bedding_cy * BEDDING_TONS_PER_CY
 
     # Net backfill needed (after pipe and bedding placed)
     backfill_cy = max(0, excav_cy - pipe_void_cy - bedding_cy)
@@ -55,7 +58,39 @@ def trench_volume(
         # Only pipe void + bedding volume goes to spoil (excess native)
         spoil_cy = (pipe_void_cy + bedding_cy) * (1 + swell)
 
-    spoil_tons = spoil_cy * 1.4  # approximate
+    spoil_tons = spoil_cy * SPOIL_TONS_PER_CY
+    return excav_cf, excav_cy, pipe_void_cy, bedding_cy, bedding_tons, backfill_cy, spoil_cy, spoil_tons
+
+
+@accepts_units(length_ft="ft", width_ft="ft", depth_ft="ft", pipe_od_in="in", bedding_depth_in="in")
+def trench_volume(
+    length_ft: float,
+    width_ft: float,
+    depth_ft: float,
+    pipe_od_in: float = 0,
+    bedding_depth_in: float = 6,
+    swell_pct: float = 25,
+    import_backfill: bool = True,
+) -> dict:
+    """
+    Calculate trench excavation, backfill, and spoil volumes.
+
+    Args:
+        length_ft: Trench length in linear feet
+        width_ft: Trench width in feet (bottom)
+        depth_ft: Trench depth in feet
+        pipe_od_in: Pipe outside diameter in inches (for void deduction)
+        bedding_depth_in: Bedding depth below pipe centerline in inches
+        swell_pct: Soil volume increase when excavated (%, typical: 25)
+        import_backfill: True if using import material for backfill
+
+    Returns:
+        dict with excavation_cy, backfill_cy, bedding_cy, spoil_cy
+    """
+    (excav_cf, excav_cy, pipe_void_cy, bedding_cy,
+     bedding_tons, backfill_cy, spoil_cy, spoil_tons) = _trench_quantities(
+        length_ft, width_ft, depth_ft, pipe_od_in, bedding_depth_in, swell_pct, import_backfill
+    )
 
     return {
         "length_ft": length_ft,
@@ -75,6 +110,221 @@ def trench_volume(
     }
 
 
+def _profile_point(raw) -> tuple:
+    """Normalize a (station, ground, invert[, soil]) tuple or dict into a tuple."""
+    if isinstance(raw, dict):
+        station = raw["station"]
+        ground = raw.get("ground_elev", raw.get("ground"))
+        invert = raw.get("invert_elev", raw.get("invert"))
+        soil = raw.get("soil_type", raw.get("soil"))
+    else:
+        station, ground, invert, *rest = raw
+        soil = rest[0] if rest else None
+    return float(station), float(ground), float(invert), str(soil or "").strip().upper()
+
+
+def _new_reach(station: float, soil: str) -> dict:
+    return {
+        "start_station": station, "end_station": station, "soil_type": soil, "excavation_cf": 0.0,
+        "depth_length": 0.0, "max_depth_ft": 0.0, "max_top_width_ft": 0.0, "protective_system_required": False,
+    }
+
+
+def _add_run(reach: dict, length_ft: float, d0: float, d1: float, bottom_width_ft: float, h_ratio: float) -> None:
+    """Integrate one straight run exactly: section area is quadratic in depth, which is linear in station."""
+    cuts = [0.0, 1.0]
+    if h_ratio and (d0 - PROTECTIVE_DEPTH_FT) * (d1 - PROTECTIVE_DEPTH_FT) < 0:
+        cuts.insert(1, (PROTECTIVE_DEPTH_FT - d0) / (d1 - d0))
+    for t0, t1 in zip(cuts, cuts[1:]):
+        a = d0 + (d1 - d0) * t0
+        b = d0 + (d1 - d0) * t1
+        mid = (a + b) / 2
+        # Walls are laid back only where the trench is deeper than PROTECTIVE_DEPTH_FT.
+        lay_back = h_ratio if mid > PROTECTIVE_DEPTH_FT else 0.0
+        simpson = sum(weight * d * (bottom_width_ft + lay_back * d) for weight, d in ((1, a), (4, mid), (1, b)))
+        reach["excavation_cf"] += length_ft * (t1 - t0) * simpson / 6
+    deepest = max(d0, d1)
+    sloped = deepest > PROTECTIVE_DEPTH_FT
+    reach["depth_length"] += length_ft * (d0 + d1) / 2
+    reach["max_depth_ft"] = max(reach["max_depth_ft"], deepest)
+    reach["max_top_width_ft"] = max(
+        reach["max_top_width_ft"], bottom_width_ft + (2 * h_ratio * deepest if sloped else 0.0)
+    )
+    reach["protective_system_required"] = reach["protective_system_required"] or sloped
+
+
+def _close_reach(
+    reach: dict,
+    bottom_width_ft: float,
+    pipe_od_in: float,
+    bedding_depth_in: float,
+    swell_pct: float,
+    import_backfill: bool,
+) -> dict:
+    length_ft = reach["end_station"] - reach["start_station"]
+    excav_cy = reach["excavation_cf"] / 27
+    pipe_void_cy = math.pi * (pipe_od_in / 24) ** 2 * length_ft / 27
+    bedding_cy = length_ft * bottom_width_ft * (bedding_depth_in / 12) / 27
+    backfill_cy = max(0, excav_cy - pipe_void_cy - bedding_cy)
+    swell = swell_pct / 100
+    spoil_cy = (excav_cy if import_backfill else pipe_void_cy + bedding_cy) * (1 + swell)
+    return {
+        "start_station": reach["start_station"],
+        "end_station": reach["end_station"],
+        "length_ft": round(length_ft, 2),
+        "soil_type": reach["soil_type"],
+        "avg_depth_ft": round(reach["depth_length"] / length_ft, 2),
+        "max_depth_ft": round(reach["max_depth_ft"], 2),
+        "max_top_width_ft": round(reach["max_top_width_ft"], 2),
+        "protective_system_required": reach["protective_system_required"],
+        "excavation_cy": round(excav_cy, 2),
+        "pipe_void_cy": round(pipe_void_cy, 3),
+        "bedding_cy": round(bedding_cy, 2),
+        "bedding_tons": round(bedding_cy * BEDDING_TONS_PER_CY, 2),
+        "backfill_cy": round(backfill_cy, 2),
+        "spoil_cy": round(spoil_cy, 2),
+        "spoil_tons_approx": round(spoil_cy * SPOIL_TONS_PER_CY, 1),
+    }
+
+
+@accepts_units(bottom_width_ft="ft", pipe_od_in="in", bedding_depth_in="in", reach_length_ft="ft")
+def iter_trench_reaches(
+    points,
+    bottom_width_ft: float,
+    pipe_od_in: float = 0,
+    bedding_depth_in: float = 6,
+    swell_pct: float = 25,
+    import_backfill: bool = True,
+    soil_type: str = "B",
+    method: str = "slope",
+    reach_length_ft: float = 100,
+):
+    """
+    Stream trench quantities reach by reach along a station/elevation profile.
+
+    Points are consumed one at a time, so alignments of any length run in
+    constant memory. Ground and invert vary linearly between points; the trench
+    bottom sits bedding_depth_in below the invert. Deeper than 4 ft the walls
+    are laid back at the OSHA Appendix B ratio for the soil type (method="slope")
+    or held vertical inside a shield or shoring (method="shield").
+
+    Args:
+        points: Iterable of (station, ground_elev, invert_elev[, soil_type]) tuples or dicts with
+            station, ground_elev, invert_elev and optional soil_type; stations must increase
+        bottom_width_ft: Trench bottom width in feet
+        pipe_od_in: Pipe outside diameter in inches (for void deduction)
+        bedding_depth_in: Bedding depth below the invert in inches
+        swell_pct: Soil volume increase when excavated (%)
+        import_backfill: True if using import material for backfill
+        soil_type: OSHA soil type for points that do not carry one
+        method: "slope" or "shield"
+        reach_length_ft: Close a reach at every multiple of this station interval (0 = only on soil changes)
+
+    Yields:
+        dict per reach with stations, soil type, depths, OSHA top width and the trench_volume quantities.
+        A new reach also starts wherever the soil type changes.
+    """
+    method = method.lower()
+    if method not in ("slope", "shield"):
+        raise ValueError(f"method must be 'slope' or 'shield', got '{method}'")
+    default_soil = soil_type.upper()
+    bedding_ft = bedding_depth_in / 12
+    close = (bottom_width_ft, pipe_od_in, bedding_depth_in, swell_pct, import_backfill)
+
+    def h_ratio(soil: str) -> float:
+        if soil not in OSHA_SLOPES:
+            raise ValueError(f"soil_type must be 'A', 'B', or 'C', got '{soil}'")
+        return OSHA_SLOPES[soil]["h_ratio"] if method == "slope" else 0.0
+
+    reach = previous = None
+    for raw in points:
+        station, ground, invert, soil = _profile_point(raw)
+        soil = soil or default_soil
+        if ground < invert:
+            raise ValueError(f"Invert is above ground at station {station}")
+        depth = ground - invert + bedding_ft
+        if previous is None:
+            h_ratio(soil)
+            reach = _new_reach(station, soil)
+            previous = (station, depth, soil)
+            continue
+        start, start_depth, reach_soil = previous
+        if station <= start:
+            raise ValueError(f"Stations must increase; got {station} after {start}")
+        # Soil applies from its station forward, so a run takes the soil of its upstream point.
+        ratio = h_ratio(reach_soil)
+        cursor, cursor_depth = start, start_depth
+        while True:
+            boundary = station
+            if reach_length_ft > 0:
+                next_mark = (math.floor(cursor / reach_length_ft + 1e-9) + 1) * reach_length_ft
+                boundary = min(station, float(next_mark))
+            boundary_depth = start_depth + (depth - start_depth) * (boundary - start) / (station - start)
+            _add_run(reach, boundary - cursor, cursor_depth, boundary_depth, bottom_width_ft, ratio)
+            reach["end_station"] = boundary
+            if boundary >= station:
+                break
+            yield _close_reach(reach, *close)
+            reach = _new_reach(boundary, reach_soil)
+            cursor, cursor_depth = boundary, boundary_depth
+        if soil != reach_soil:
+            if reach["end_station"] > reach["start_station"]:
+                yield _close_reach(reach, *close)
+            reach = _new_reach(station, soil)
+        elif reach_length_ft > 0 and abs(station / reach_length_ft - round(station / reach_length_ft)) < 1e-9:
+            yield _close_reach(reach, *close)
+            reach = _new_reach(station, soil)
+        previous = (station, depth, soil)
+    if reach is not None and reach["end_station"] > reach["start_station"]:
+        yield _close_reach(reach, *close)
+
+
+@accepts_units(bottom_width_ft="ft")
+def trench_profile(points, bottom_width_ft: float, **options) -> dict:
+    """
+    Total trench quantities along a station/elevation profile.
+
+    Args:
+        points: Profile points as accepted by iter_trench_reaches
+        bottom_width_ft: Trench bottom width in feet
+        **options: Any other iter_trench_reaches argument
+
+    Returns:
+        dict with per-reach quantities and alignment totals
+    """
+    reaches = list(iter_trench_reaches(points, bottom_width_ft, **options))
+    summed = ("length_ft", "excavation_cy", "pipe_void_cy", "bedding_cy", "bedding_tons", "backfill_cy", "spoil_cy",
+              "spoil_tons_approx")
+    totals = {key: round(math.fsum(r[key] for r in reaches), 2) for key in summed}
+    totals["max_depth_ft"] = max((r["max_depth_ft"] for r in reaches), default=0.0)
+    totals["max_top_width_ft"] = max((r["max_top_width_ft"] for r in reaches), default=0.0)
+    totals["protective_system_required"] = any(r["protective_system_required"] for r in reaches)
+    return {"reaches": reaches, "reach_count": len(reaches), "totals": totals}
+
+
+def _pipe_area_sf(pipe_diameter_in: float) -> float:
+    D_ft = pipe_diameter_in / 12
+    return math.pi * (D_ft / 2) ** 2  # pipe cross-sectional area in SF
+
+
+def _fitting(fitting_type) -> tuple:
+    """(label, angle_deg, factor) for a fitting, where thrust = factor × pressure × pipe area."""
+    fitting_type = str(fitting_type).lower()
+    if fitting_type in ("dead_end", "dead", "cap"):
+        return "Dead end / cap", 180, 1.0
+    if fitting_type == "tee":
+        return "Tee (branch)", 90, 1.0
+    try:
+        angle_deg = float(fitting_type)
+    except ValueError:
+        raise ValueError(
+            f"Unknown fitting type: {fitting_type}. "
+            "Use '90', '45', '22.5', '11.25', 'tee', or 'dead_end'"
+        )
+    return f"{angle_deg}° bend", angle_deg, 2 * math.sin(math.radians(angle_deg / 2))
+
+
+@accepts_units(pipe_diameter_in="in", test_pressure_psi="psi", soil_bearing_psf="psf")
 def thrust_block(
     pipe_diameter_in: float,
     test_pressure_psi: float,
@@ -95,35 +345,15 @@ def thrust_block(
     Returns:
         dict with thrust_lbf, bearing_area_sf, block dimensions
     """
-    D_ft = pipe_diameter_in / 12
-    A_pipe = math.pi * (D_ft / 2) ** 2  # pipe cross-sectional area in SF
+    A_pipe = _pipe_area_sf(pipe_diameter_in)
     P_psf = test_pressure_psi * 144      # convert PSI to PSF
-
-    fitting_type = str(fitting_type).lower()
-    if fitting_type in ("dead_end", "dead", "cap"):
-        thrust = P_psf * A_pipe
-        label = "Dead end / cap"
-        angle = 180
-    elif fitting_type == "tee":
-        thrust = P_psf * A_pipe
-        label = "Tee (branch)"
-        angle = 90
-    else:
-        try:
-            angle_deg = float(fitting_type)
-        except ValueError:
-            raise ValueError(
-                f"Unknown fitting type: {fitting_type}. "
-                "Use '90', '45', '22.5', '11.25', 'tee', or 'dead_end'"
-            )
-        thrust = 2 * P_psf * A_pipe * math.sin(math.radians(angle_deg / 2))
-        label = f"{angle_deg}° bend"
-        angle = angle_deg
+    label, angle, factor = _fitting(fitting_type)
+    thrust = factor * P_psf * A_pipe
 
     bearing_area_min = thrust / soil_bearing_psf
     bearing_area_design = bearing_area_min * safety_factor
     block_side = math.sqrt(bearing_area_design)
-    block_vol_cy = (bearing_area_design * 1.5) / 27  # assume 18" thick
+    block_vol_cy = (bearing_area_design * THRUST_BLOCK_THICKNESS_FT) / 27
 
     return {
         "pipe_diameter_in": pipe_diameter_in,
@@ -142,10 +372,11 @@ def thrust_block(
     }
 
 
+@accepts_units(area_sf="sf", thickness_in="in")
 def asphalt_tonnage(
     area_sf: float,
     thickness_in: float,
-    density_lbcf: float = 145,
+    density_lbcf: float = ASPHALT_DENSITY_LBCF,
     waste_pct: float = 5,
     price_per_ton: float = 90,
 ) -> dict:
@@ -182,6 +413,17 @@ def asphalt_tonnage(
     }
 
 
+def _concrete_cf(shape: str, dimensions: dict) -> float:
+    if shape == "slab":
+        return dimensions["length_ft"] * dimensions["width_ft"] * (dimensions.get("thickness_in", 6) / 12)
+    if shape == "wall":
+        return dimensions["length_ft"] * dimensions["height_ft"] * (dimensions.get("thickness_in", 12) / 12)
+    if shape in ("cylinder", "manhole", "vault"):
+        area = math.pi / 4 * (dimensions["od_ft"] ** 2 - dimensions.get("id_ft", 0) ** 2)
+        return area * dimensions["height_ft"]
+    raise ValueError(f"Unknown shape '{shape}'. Use 'slab', 'wall', or 'cylinder'.")
+
+
 def concrete_volume(
     shape: str,
     waste_pct: float = 5,
@@ -202,28 +444,9 @@ def concrete_volume(
         dict with volume_cy, volume_with_waste_cy, cost estimate
     """
     shape = shape.lower()
-    concrete_prices = {3000: 166, 4000: 180, 5000: 195}
     psi = dimensions.get("psi", 4000)
-    price_per_cy = concrete_prices.get(psi, 180)
-
-    if shape == "slab":
-        length = dimensions["length_ft"]
-        w = dimensions["width_ft"]
-        t = dimensions.get("thickness_in", 6) / 12
-        volume_cf = length * w * t
-    elif shape == "wall":
-        length = dimensions["length_ft"]
-        h = dimensions["height_ft"]
-        t = dimensions.get("thickness_in", 12) / 12
-        volume_cf = length * h * t
-    elif shape in ("cylinder", "manhole", "vault"):
-        od = dimensions["od_ft"]
-        id_ = dimensions.get("id_ft", 0)
-        h = dimensions["height_ft"]
-        area = math.pi / 4 * (od ** 2 - id_ ** 2)
-        volume_cf = area * h
-    else:
-        raise ValueError(f"Unknown shape '{shape}'. Use 'slab', 'wall', or 'cylinder'.")
+    price_per_cy = CONCRETE_PRICES_PER_CY.get(psi, 180)
+    volume_cf = _concrete_cf(shape, dimensions)
 
     vol_cy = volume_cf / 27
     vol_with_waste = vol_cy * (1 + waste_pct / 100)
@@ -240,3 +463,273 @@ def concrete_volume(
         "material_cost": round(cost, 2),
         "truck_loads_10cy": round(vol_with_waste / 10, 1),
     }
+
+
+# ─── Batch calculators ────────────────────────────────────────────────────────
+# Column-oriented versions of the calculators above for takeoff schedules.
+# Each argument takes a scalar or a list; scalars repeat down the table. Table
+# cells are rounded exactly like the scalar functions, and totals are sums of
+# the rounded cells so they foot to the table.
+
+
+def _totals(table: dict, keys: tuple) -> dict:
+    return {key: round(math.fsum(table[key]), 3) for key in keys}
+
+
+@accepts_units(length_ft="ft", width_ft="ft", depth_ft="ft", pipe_od_in="in", bedding_depth_in="in")
+def trench_volume_batch(
+    length_ft,
+    width_ft,
+    depth_ft,
+    pipe_od_in=0,
+    bedding_depth_in=6,
+    swell_pct=25,
+    import_backfill=True,
+) -> dict:
+    """
+    Trench excavation, backfill and spoil for many reaches at once.
+
+    Args:
+        (as trench_volume, each a scalar or a list)
+
+    Returns:
+        dict with count, table (one list per trench_volume output) and totals
+    """
+    count, columns = _broadcast(
+        length_ft, width_ft, depth_ft, pipe_od_in, bedding_depth_in, swell_pct, import_backfill
+    )
+    keys = ("length_ft", "width_ft", "depth_ft", "pipe_od_in", "excavation_cf", "excavation_cy", "pipe_void_cy",
+            "bedding_cy", "bedding_tons", "backfill_cy", "spoil_cy", "spoil_tons_approx")
+    table = {key: [] for key in keys}
+    for length, width, depth, od, bedding, swell, imported in zip(*columns):
+        (excav_cf, excav_cy, pipe_void_cy, bedding_cy,
+         bedding_tons, backfill_cy, spoil_cy, spoil_tons) = _trench_quantities(
+            length, width, depth, od, bedding, swell, _as_bool(imported)
+        )
+        for key, value in zip(keys, (
+            length, width, depth, od, round(excav_cf, 1), round(excav_cy, 2), round(pipe_void_cy, 3),
+            round(bedding_cy, 2), round(bedding_tons, 2), round(backfill_cy, 2), round(spoil_cy, 2),
+            round(spoil_tons, 1),
+        )):
+            table[key].append(value)
+    totals = _totals(table, ("length_ft", "excavation_cy", "pipe_void_cy", "bedding_cy", "bedding_tons",
+                             "backfill_cy", "spoil_cy", "spoil_tons_approx"))
+    return {"count": count, "table": table, "totals": totals}
+
+
+@accepts_units(pipe_diameter_in="in", test_pressure_psi="psi", soil_bearing_psf="psf")
+def thrust_block_batch(
+    pipe_diameter_in,
+    test_pressure_psi,
+    fitting_type="90",
+    soil_bearing_psf=2000,
+    safety_factor=1.5,
+) -> dict:
+    """
+    Thrust and thrust block size for a whole fittings schedule.
+
+    Args:
+        (as thrust_block, each a scalar or a list)
+
+    Returns:
+        dict with count, table (one list per thrust_block output) and totals
+    """
+    count, columns = _broadcast(pipe_diameter_in, test_pressure_psi, fitting_type, soil_bearing_psf, safety_factor)
+    keys = ("pipe_diameter_in", "pressure_psi", "fitting", "angle_deg", "thrust_lbf", "thrust_kips",
+            "bearing_area_min_sf", "bearing_area_design_sf", "approx_square_block_ft", "concrete_volume_cy_18in_thick")
+    table = {key: [] for key in keys}
+    fittings = {}
+    for diameter, pressure, fitting, bearing, factor_of_safety in zip(*columns):
+        if fitting not in fittings:
+            fittings[fitting] = _fitting(fitting)
+        label, angle, factor = fittings[fitting]
+        thrust = factor * (pressure * 144) * _pipe_area_sf(diameter)
+        area_min = thrust / bearing
+        area_design = area_min * factor_of_safety
+        for key, value in zip(keys, (
+            diameter, pressure, label, angle, round(thrust, 0), round(thrust / 1000, 2), round(area_min, 3),
+            round(area_design, 3), round(math.sqrt(area_design), 2),
+            round(area_design * THRUST_BLOCK_THICKNESS_FT / 27, 3),
+        )):
+            table[key].append(value)
+    totals = _totals(table, ("thrust_lbf", "bearing_area_design_sf", "concrete_volume_cy_18in_thick"))
+    return {"count": count, "table": table, "totals": totals}
+
+
+@accepts_units(area_sf="sf", thickness_in="in")
+def asphalt_tonnage_batch(
+    area_sf,
+    thickness_in,
+    density_lbcf=ASPHALT_DENSITY_LBCF,
+    waste_pct=5,
+    price_per_ton=90,
+) -> dict:
+    """
+    Asphalt tonnage and cost for many paving or trench patch areas.
+
+    Args:
+        (as asphalt_tonnage, each a scalar or a list)
+
+    Returns:
+        dict with count, table (one list per asphalt_tonnage output) and totals
+    """
+    count, columns = _broadcast(area_sf, thickness_in, density_lbcf, waste_pct, price_per_ton)
+    keys = ("area_sf", "thickness_in", "volume_cf", "net_tons", "tons_with_waste", "price_per_ton", "material_cost")
+    table = {key: [] for key in keys}
+    for area, thickness, density, waste, price in zip(*columns):
+        volume_cf = area * (thickness / 12)
+        tons_net = volume_cf * density / 2000
+        tons_with_waste = tons_net * (1 + waste / 100)
+        for key, value in zip(keys, (
+            area, thickness, round(volume_cf, 1), round(tons_net, 2), round(tons_with_waste, 2), price,
+            round(tons_with_waste * price, 2),
+        )):
+            table[key].append(value)
+    totals = _totals(table, ("area_sf", "net_tons", "tons_with_waste", "material_cost"))
+    return {"count": count, "table": table, "totals": totals}
+
+
+@accepts_units(length_ft="ft", width_ft="ft", height_ft="ft", thickness_in="in", od_ft="ft", id_ft="ft")
+def concrete_volume_batch(
+    shape,
+    waste_pct=5,
+    psi=4000,
+    length_ft=None,
+    width_ft=None,
+    height_ft=None,
+    thickness_in=None,
+    od_ft=None,
+    id_ft=None,
+) -> dict:
+    """
+    Concrete volume and cost for a schedule of slabs, walls and cylinders.
+
+    Args:
+        shape: "slab", "wall", or "cylinder" per row
+        waste_pct: Waste factor percentage
+        psi: Concrete strength (3000, 4000 or 5000)
+        length_ft, width_ft, height_ft, thickness_in, od_ft, id_ft: Dimensions used by each
+            row's shape (see concrete_volume); None takes the shape's default
+
+    Returns:
+        dict with count, table (one list per concrete_volume output) and totals
+    """
+    names = ("length_ft", "width_ft", "height_ft", "thickness_in", "od_ft", "id_ft")
+    count, columns = _broadcast(shape, waste_pct, psi, length_ft, width_ft, height_ft, thickness_in, od_ft, id_ft)
+    keys = ("shape", "net_volume_cy", "volume_with_waste_cy", "concrete_psi", "price_per_cy", "material_cost",
+            "truck_loads_10cy")
+    table = {key: [] for key in keys}
+    for row_shape, waste, strength, *sizes in zip(*columns):
+        row_shape = str(row_shape).lower()
+        strength = int(strength)
+        dimensions = {name: value for name, value in zip(names, sizes) if value is not None}
+        try:
+            vol_cy = _concrete_cf(row_shape, dimensions) / 27
+        except KeyError as missing:
+            raise ValueError(f"Row {len(table['shape']) + 1}: {row_shape} needs {missing.args[0]}")
+        vol_with_waste = vol_cy * (1 + waste / 100)
+        price_per_cy = CONCRETE_PRICES_PER_CY.get(strength, 180)
+        for key, value in zip(keys, (
+            row_shape, round(vol_cy, 3), round(vol_with_waste, 3), strength, price_per_cy,
+            round(vol_with_waste * price_per_cy, 2), round(vol_with_waste / 10, 1),
+        )):
+            table[key].append(value)
+    totals = _totals(table, ("net_volume_cy", "volume_with_waste_cy", "material_cost", "truck_loads_10cy"))
+    return {"count": count, "table": table, "totals": totals}
+
+
+BATCH_CALCULATORS = {
+    "trench_volume": trench_volume_batch,
+    "thrust_block": thrust_block_batch,
+    "asphalt_tonnage": asphalt_tonnage_batch,
+    "concrete_volume": concrete_volume_batch,
+}
+
+
+def _as_bool(value) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() not in ("", "0", "false", "no", "n")
+    return bool(value)
+
+
+def _cell(value):
+    """Parse a CSV cell: blank -> None, numbers -> float, anything else stays text."""
+    text = value.strip() if isinstance(value, str) else value
+    if text in ("", None):
+        return None
+    try:
+        return float(text)
+    except (TypeError, ValueError):
+        return text
+
+
+def read_table_csv(text: str) -> dict:
+    """
+    Parse CSV text into columns keyed by header.
+
+    Blank cells become None; numeric cells become floats. The argument is
+    always parsed as CSV text, never opened as a path.
+    """
+    reader = csv.DictReader(io.StringIO(str(text).strip()))
+    columns = {name.strip(): [] for name in reader.fieldnames or [] if name and name.strip()}
+    for row in reader:
+        for name in columns:
+            columns[name].append(_cell(row.get(name)))
+    return columns
+
+
+def read_table_csv_file(path: Path) -> dict:
+    """Read a CSV file into columns keyed by header (see read_table_csv)."""
+    return read_table_csv(Path(path).read_text(encoding="utf-8-sig"))
+
+
+def quantity_table(calculator: str, columns: dict = None, rows: list = None, csv_text: str = None) -> dict:
+    """
+    Run a batch calculator over a table given as columns, rows or CSV.
+
+    Columns that match the calculator's arguments feed it; blank cells take the
+    argument's default. Any other columns (ids, stations, notes) are carried
+    through to the output table untouched.
+
+    Args:
+        calculator: "trench_volume", "thrust_block", "asphalt_tonnage", or "concrete_volume"
+        columns: Dict of equal-length lists keyed by column name
+        rows: List of dicts, one per row
+        csv_text: CSV text with a header row (use read_table_csv_file for files)
+
+    Returns:
+        dict with calculator, count, table and totals
+    """
+    if calculator not in BATCH_CALCULATORS:
+        raise ValueError(f"Unknown calculator '{calculator}'. Use one of: {', '.join(BATCH_CALCULATORS)}")
+    if csv_text is not None:
+        columns = read_table_csv(csv_text)
+    elif rows is not None:
+        names = list(dict.fromkeys(name for row in rows for name in row))
+        columns = {name: [row.get(name) for row in rows] for name in names}
+    if not columns:
+        raise ValueError("Provide the table as columns, rows, or csv_text")
+    sizes = {len(values) for values in columns.values()}
+    if len(sizes) != 1:
+        raise ValueError("All columns must have the same number of rows")
+    count = sizes.pop()
+    if not count:
+        raise ValueError("The table has no rows")
+
+    function = BATCH_CALCULATORS[calculator]
+    arguments, passthrough = {}, {}
+    parameters = inspect.signature(function).parameters
+    for name, values in columns.items():
+        if name not in parameters:
+            passthrough[name] = list(values)
+            continue
+        default = parameters[name].default
+        if default is inspect.Parameter.empty and any(value is None for value in values):
+            raise ValueError(f"Column '{name}' is required in every row")
+        arguments[name] = [default if value is None else value for value in values]
+    missing = [name for name, p in parameters.items() if p.default is inspect.Parameter.empty and name not in arguments]
+    if missing:
+        raise ValueError(f"{calculator} table is missing required column(s): {', '.join(missing)}")
+    result = function(**arguments)
+    result["table"] = {**passthrough, **result["table"]}
+    return {"calculator": calculator, **result}
@@ -5,16 +5,25 @@ This package converts local HeavyBid exports into normalized JSON assets that
 openmud can consume without exposing private bid data publicly.
 """
 
+from .inventory import build_source_inventory
 from .discover import build_discovery_manifest
-from .schema_registry import build_schema_registry
-from .extract import extract_structured_assets
+from .schema_registry import build_schema_registry, load_schema_registry
+from .extract import extract_structured_assets, iter_structured_records
 from .binary_decoder import decode_binary_tables
-from .importer import build_heavybid_snapshot
+from .record_decoder import compile_record_layout, iter_table_records
+from .importer import STAGES, build_heavybid_snapshot, run_heavybid_pipeline
 
 __all__ = [
+    "build_source_inventory",
     "build_discovery_manifest",
     "build_schema_registry",
+    "load_schema_registry",
     "extract_structured_assets",
+    "iter_structured_records",
     "decode_binary_tables",
+    "compile_record_layout",
+    "iter_table_records",
     "build_heavybid_snapshot",
+    "run_heavybid_pipeline",
+    "STAGES",
 ]
@@ -0,0 +1,52 @@
+"""
+Run the HeavyBid importer from the command line.
+
+    python -m tools.heavybid --source ~/Downloads/Heavybid
+    python -m tools.heavybid --only binary
+    python -m tools.heavybid --from structured --no-write
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from .importer import STAGES, build_heavybid_snapshot, run_heavybid_pipeline
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m tools.heavybid", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--source", help="HeavyBid source directory (defaults to OPENMUD_HEAVYBID_SOURCE_DIR)")
+    parser.add_argument("--only", nargs="+", choices=list(STAGES), help="Re-run only these stages")
+    parser.add_argument(
+        "--from", dest="start_from", choices=list(STAGES), help="Re-run this stage and everything after it"
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and do not update the stage cache")
+    parser.add_argument("--no-write", action="store_true", help="Do not write JSON artifacts")
+    args = parser.parse_args(argv)
+
+    write_outputs = not args.no_write
+    use_cache = not args.no_cache
+    if args.only or args.start_from:
+        run = run_heavybid_pipeline(
+            args.source,
+            write_outputs=write_outputs,
+            only=args.only,
+            start_from=args.start_from,
+            use_cache=use_cache,
+        )
+        timings, total = run["timings"], run["total_seconds"]
+    else:
+        snapshot = build_heavybid_snapshot(args.source, write_outputs=write_outputs, use_cache=use_cache)
+        timings, total = snapshot["pipeline"]["timings"], snapshot["pipeline"]["total_seconds"]
+        for key, value in snapshot["counts"].items():
+            print(f"{key:>18}: {value}")
+
+    for record in timings:
+        status = "cached" if record["cached"] else "ran"
+        print(f"{record['stage']:>18}: {record['seconds']:.3f}s ({status})")
+    print(f"{'total':>18}: {total:.3f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,13 +1,25 @@
 from __future__ import annotations
 
+import mmap
 import re
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
 from typing import Any, Dict, List
 
+from .inventory import build_source_inventory, directory_subdirs, file_entry
 from .paths import BINARY_ROOT, resolve_source_dir, write_json
+from .record_decoder import (
+    RECORD_TABLES,
+    compile_record_layout,
+    describe_layout,
+    iter_table_records,
+    locate_records,
+    normalize_biditem_row,
+)
 from .schema_registry import build_schema_registry
 
+BINARY_TABLES_PATH = BINARY_ROOT / "binary-tables.json"
 
 TARGET_TABLES = [
     "BIDITEM",
@@ -22,12 +34,15 @@ TARGET_TABLES = [
 ]
 
 
-def _extract_ascii_tokens(data: bytes, *, min_len: int = 4, limit: int = 120) -> List[str]:
-    text = "".join(chr(byte) if 32 <= byte < 127 else " " for byte in data)
-    tokens = re.findall(r"[A-Za-z0-9_#/\".\-]{%d,}" % min_len, text)
+ASCII_TOKEN_CHARS = rb"[A-Za-z0-9_#/\".\-]"
+
+
+def _extract_ascii_tokens(data: bytes | mmap.mmap, *, min_len: int = 4, limit: int = 120) -> List[str]:
+    pattern = re.compile(ASCII_TOKEN_CHARS + rb"{%d,}" % min_len)
     seen = set()
     unique = []
-    for token in tokens:
+    for match in pattern.finditer(data):
+        token = match.group().decode("ascii")
         if token in seen:
             continue
         seen.add(token)
@@ -49,21 +64,55 @@ def _extract_biditem_candidates(tokens: List[str]) -> List[Dict[str, str]]:
     return candidates[:60]
 
 
-def _read_table_snapshot(dat_path: Path, hdr_path: Path | None) -> Dict[str, Any]:
-    dat_bytes = dat_path.read_bytes()
-    hdr_bytes = hdr_path.read_bytes() if hdr_path and hdr_path.exists() else b""
-    header_ints = [
-        int.from_bytes(dat_bytes[idx: idx + 4], "little", signed=False)
-        for idx in range(0, min(64, len(dat_bytes)), 4)
+def _read_header_ints(data: bytes | mmap.mmap, size: int) -> List[int]:
+    return [
+        int.from_bytes(data[idx: idx + 4], "little", signed=False)
+        for idx in range(0, min(64, size), 4)
     ]
+
+
+def _read_table_snapshot(dat_path: Path, hdr_path: Path | None, *, dat_size: int, hdr_size: int = 0) -> Dict[str, Any]:
+    header_ints: List[int] = []
+    ascii_tokens: List[str] = []
+    if dat_size:
+        # Map the table instead of reading it: the regex scan walks the pages
+        # lazily and stops at the token limit, so large tables stay on disk.
+        with dat_path.open("rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            header_ints = _read_header_ints(view, dat_size)
+            ascii_tokens = _extract_ascii_tokens(view)
     return {
         "dat_file": str(dat_path),
-        "hdr_file": str(hdr_path) if hdr_path and hdr_path.exists() else "",
-        "dat_size": len(dat_bytes),
-        "hdr_size": len(hdr_bytes),
+        "hdr_file": str(hdr_path) if hdr_path else "",
+        "dat_size": dat_size,
+        "hdr_size": hdr_size,
         "header_ints": header_ints,
         "estimated_record_count": header_ints[0] if header_ints else 0,
-        "ascii_tokens": _extract_ascii_tokens(dat_bytes),
+        "ascii_tokens": ascii_tokens,
+    }
+
+
+def _biditem_from_record(
+    row: Dict[str, Any],
+    estimate_code: str,
+    dat_path: Path,
+    confidence: str,
+) -> Dict[str, Any] | None:
+    item = normalize_biditem_row(row)
+    if not item["item_code"] and not item["description"]:
+        return None
+    return {
+        "estimate_code": estimate_code,
+        "item_code": item["item_code"],
+        "description_hint": item["description"],
+        "quantity": item["quantity"],
+        "unit": item["unit"],
+        "unit_price": item["unit_price"],
+        "amount": item["amount"],
+        "direct_cost": item["direct_cost"],
+        "manhours": item["manhours"],
+        "source_kind": "binary_biditem_record",
+        "source_file": str(dat_path),
+        "confidence": confidence,
     }
 
 
@@ -71,42 +120,101 @@ def decode_binary_tables(
     source_dir: str | None = None,
     *,
     write_outputs: bool = False,
+    registry: Dict[str, Any] | None = None,
+    inventory: Dict[str, Any] | None = None,
 ) -> Dict[str, Any]:
     source = resolve_source_dir(source_dir)
+    if inventory is None:
+        inventory = build_source_inventory(source)
     est_root = source / "EST"
-    registry = build_schema_registry(source_dir)
+    if registry is None:
+        registry = build_schema_registry(str(source), inventory=inventory)
     registry_lookup = {table["name"]: table for table in registry["tables"]}
-    estimate_dirs = sorted([path for path in est_root.iterdir() if path.is_dir()], key=lambda p: p.name.lower())
+    layouts = {}
+    for table_name in RECORD_TABLES:
+        table_meta = registry_lookup.get(table_name, {})
+        layout = compile_record_layout(table_meta.get("int_metadata") or {}, table_meta.get("fields", []))
+        if layout:
+            layouts[table_name] = layout
+    estimate_dirs = sorted(directory_subdirs(inventory, est_root), key=lambda p: p.name.lower())
 
     decoded_estimates = []
     merged_bid_hints = []
     for estimate_dir in estimate_dirs:
         tables = []
         for table_name in TARGET_TABLES:
-            dat_path = estimate_dir / f"{table_name}.DAT"
-            hdr_path = estimate_dir / f"{table_name}.HDR"
-            if not dat_path.exists():
+            dat_entry = file_entry(inventory, estimate_dir / f"{table_name}.DAT")
+            if dat_entry is None:
                 continue
-            snapshot = _read_table_snapshot(dat_path, hdr_path if hdr_path.exists() else None)
+            dat_path = dat_entry["path"]
+            hdr_entry = file_entry(inventory, estimate_dir / f"{table_name}.HDR")
+            snapshot = _read_table_snapshot(
+                dat_path,
+                hdr_entry["path"] if hdr_entry else None,
+                dat_size=dat_entry["size"],
+                hdr_size=hdr_entry["size"] if hdr_entry else 0,
+            )
             table_payload = {
                 "table": table_name,
                 "schema_field_count": len(registry_lookup.get(table_name, {}).get("fields", [])),
                 "shadow_table": registry_lookup.get(table_name, {}).get("shadow_table", ""),
                 **snapshot,
             }
+            layout = layouts.get(table_name)
+            decoded_items = []
+            if layout:
+                location = locate_records(layout, snapshot["dat_size"], snapshot["header_ints"])
+                rows = iter_table_records(
+                    dat_path,
+                    layout,
+                    data_offset=location["data_offset"],
+                    record_count=location["record_count"],
+                )
+                if table_name == "BIDITEM" and location["confidence"] == "high":
+                    # Priced items only when the layout accounts for the whole file;
+                    # rows read at a guessed offset fall back to the ASCII hints below.
+                    record_count = 0
+                    sample_records = []
+                    for row in rows:
+                        record_count += 1
+                        if len(sample_records) < 25:
+                            sample_records.append(row)
+                        item = _biditem_from_record(row, estimate_dir.name, dat_path, location["confidence"])
+                        if item:
+                            decoded_items.append(item)
+                else:
+                    # Other tables only report a count and a sample, so decode just the sample.
+                    record_count = location["record_count"]
+                    sample_records = list(islice(rows, 25))
+                    rows.close()
+                table_payload.update(
+                    {
+                        "record_layout": describe_layout(layout),
+                        "record_location": location,
+                        "decoded_record_count": record_count,
+                        "sample_records": sample_records,
+                    }
+                )
             if table_name == "BIDITEM":
-                table_payload["decoded_rows"] = _extract_biditem_candidates(snapshot["ascii_tokens"])
-                for hint in table_payload["decoded_rows"]:
-                    merged_bid_hints.append(
-                        {
-                            "estimate_code": estimate_dir.name,
-                            "item_code": hint["item_code"],
-                            "description_hint": hint["description_hint"],
-                            "source_kind": "binary_biditem",
-                            "source_file": str(dat_path),
-                            "confidence": "low",
-                        }
-                    )
+                if decoded_items:
+                    table_payload["decoded_rows"] = [
+                        {"item_code": item["item_code"], "description_hint": item["description_hint"]}
+                        for item in decoded_items[:60]
+                    ]
+                    merged_bid_hints.extend(decoded_items)
+                else:
+                    table_payload["decoded_rows"] = _extract_biditem_candidates(snapshot["ascii_tokens"])
+                    for hint in table_payload["decoded_rows"]:
+                        merged_bid_hints.append(
+                            {
+                                "estimate_code": estimate_dir.name,
+                                "item_code": hint["item_code"],
+                                "description_hint": hint["description_hint"],
+                                "source_kind": "binary_biditem",
+                                "source_file": str(dat_path),
+                                "confidence": "low",
+                            }
+                        )
             tables.append(table_payload)
         if tables:
             decoded_estimates.append(
@@ -123,6 +231,6 @@ def decode_binary_tables(
         "merged_bid_hints": merged_bid_hints,
     }
     if write_outputs:
-        write_json(BINARY_ROOT / "binary-tables.json", payload)
+        write_json(BINARY_TABLES_PATH, payload)
         write_json(BINARY_ROOT / "binary-biditem-hints.json", merged_bid_hints)
     return payload
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import json
+import mmap
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List
+
+from .paths import _atomic_writer
+
+
+BID_ITEM_COLUMNS_FILE = "bid_items.columns"
+COLUMNAR_MAGIC = b"OMCOL001"
+_PREFIX = struct.Struct("<8sI4x")
+_ALIGN = 8
+
+NUMERIC_COLUMNS = [
+    "quantity",
+    "unit_price",
+    "amount",
+    "direct_cost",
+    "indirect_cost",
+    "markup",
+    "manhours",
+    "crew_hours",
+]
+STRING_COLUMNS = [
+    "estimate_code",
+    "project_name",
+    "item_code",
+    "revenue_code",
+    "cost_code_1",
+    "cost_code_2",
+    "description",
+    "unit",
+    "crew_code",
+    "notes",
+    "source_kind",
+    "source_file",
+    "confidence",
+]
+
+# Stored little-endian; the reader refuses to map the file on big-endian hosts
+# rather than silently byte-swapping every column.
+_CODE_TYPE = "I" if array("I").itemsize == 4 else "L"
+
+
+def _as_float(value: Any) -> float:
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _pad(length: int) -> bytes:
+    return b"\x00" * (-length % _ALIGN)
+
+
+def _encode_strings(values: Iterable[Any]) -> tuple[array, array, bytes]:
+    """Dictionary-encode a string column into (codes, dictionary offsets, utf-8 blob)."""
+    lookup: Dict[str, int] = {"": 0}
+    codes = array(_CODE_TYPE)
+    offsets = array(_CODE_TYPE, [0, 0])
+    blob = bytearray()
+    for value in values:
+        text = "" if value is None else str(value)
+        code = lookup.get(text)
+        if code is None:
+            code = lookup[text] = len(lookup)
+            blob += text.encode("utf-8")
+            offsets.append(len(blob))
+        codes.append(code)
+    return codes, offsets, bytes(blob)
+
+
+def write_columnar_bid_items(rows: Iterable[Dict[str, Any]], target: Path) -> Path:
+    """
+    Write bid items as one memory-mappable file of aligned column blocks.
+
+    Numeric columns are float64 arrays and string columns are uint32 codes into
+    a per-column dictionary, so readers can ``mmap`` the file without parsing it.
+    Keys outside ``NUMERIC_COLUMNS`` and ``STRING_COLUMNS`` are not stored.
+    """
+    rows = rows if isinstance(rows, list) else list(rows)
+    blocks: List[bytes] = []
+    layout: Dict[str, Any] = {"row_count": len(rows), "numeric": {}, "strings": {}}
+    cursor = 0
+
+    def add_block(payload: bytes) -> Dict[str, int]:
+        nonlocal cursor
+        entry = {"offset": cursor, "length": len(payload)}
+        blocks.append(payload + _pad(len(payload)))
+        cursor += len(blocks[-1])
+        return entry
+
+    for name in NUMERIC_COLUMNS:
+        column = array("d", (_as_float(row.get(name)) for row in rows))
+        if sys.byteorder != "little":
+            column.byteswap()
+        layout["numeric"][name] = add_block(column.tobytes())
+
+    for name in STRING_COLUMNS:
+        codes, offsets, blob = _encode_strings(row.get(name) for row in rows)
+        if sys.byteorder != "little":
+            codes.byteswap()
+            offsets.byteswap()
+        layout["strings"][name] = {
+            "codes": add_block(codes.tobytes()),
+            "offsets": add_block(offsets.tobytes()),
+            "blob": add_block(blob),
+            "cardinality": len(offsets) - 1,
+        }
+
+    header = json.dumps(layout, separators=(",", ":")).encode("utf-8")
+    header += b" " * (-(_PREFIX.size + len(header)) % _ALIGN)
+    with _atomic_writer(target, "wb") as handle:
+        handle.write(_PREFIX.pack(COLUMNAR_MAGIC, len(header)))
+        handle.write(header)
+        for block in blocks:
+            handle.write(block)
+    return target
+
+
+def open_columnar_bid_items(path: Path) -> Dict[str, Any] | None:
+    """Map a columnar bid item file and expose its columns as zero-copy ``memoryview`` casts."""
+    if sys.byteorder != "little" or not path.exists():
+        return None
+    with path.open("rb") as handle:
+        if handle.seek(0, 2) < _PREFIX.size:
+            return None
+        mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, header_length = _PREFIX.unpack_from(mapped, 0)
+    if magic != COLUMNAR_MAGIC:
+        mapped.close()
+        return None
+    layout = json.loads(bytes(mapped[_PREFIX.size: _PREFIX.size + header_length]))
+    base = _PREFIX.size + header_length
+    view = memoryview(mapped)
+
+    def block(entry: Dict[str, int]) -> memoryview:
+        return view[base + entry["offset"]: base + entry["offset"] + entry["length"]]
+
+    return {
+        "path": path,
+        "row_count": layout["row_count"],
+        "numeric": {name: block(entry).cast("d") for name, entry in layout["numeric"].items()},
+        "codes": {name: block(entry["codes"]).cast(_CODE_TYPE) for name, entry in layout["strings"].items()},
+        "dictionaries": {
+            name: {"offsets": block(entry["offsets"]).cast(_CODE_TYPE), "blob": block(entry["blob"]), "cache": {}}
+            for name, entry in layout["strings"].items()
+        },
+        "_view": view,
+        "_mmap": mapped,
+    }
+
+
+def close_columnar(store: Dict[str, Any]) -> None:
+    for column in store["numeric"].values():
+        column.release()
+    for column in store["codes"].values():
+        column.release()
+    for dictionary in store["dictionaries"].values():
+        dictionary["offsets"].release()
+        dictionary["blob"].release()
+    store["_view"].release()
+    store["_mmap"].close()
+
+
+def dictionary_value(store: Dict[str, Any], column: str, code: int) -> str:
+    dictionary = store["dictionaries"][column]
+    cache = dictionary["cache"]
+    text = cache.get(code)
+    if text is None:
+        offsets = dictionary["offsets"]
+        text = cache[code] = str(dictionary["blob"][offsets[code]: offsets[code + 1]], "utf-8")
+    return text
+
+
+def matching_codes(store: Dict[str, Any], column: str, predicate: Callable[[str], bool]) -> set:
+    """Evaluate ``predicate`` once per distinct value instead of once per row."""
+    cardinality = len(store["dictionaries"][column]["offsets"]) - 1
+    return {code for code in range(cardinality) if predicate(dictionary_value(store, column, code))}
+
+
+def select_rows(store: Dict[str, Any], column: str, codes: set) -> List[int]:
+    return [index for index, code in enumerate(store["codes"][column]) if code in codes]
+
+
+def row_at(store: Dict[str, Any], index: int) -> Dict[str, Any]:
+    row: Dict[str, Any] = {}
+    for name, codes in store["codes"].items():
+        row[name] = dictionary_value(store, name, codes[index])
+    for name, column in store["numeric"].items():
+        row[name] = column[index]
+    return row
+
+
+def iter_columnar_rows(store: Dict[str, Any], indices: Iterable[int] | None = None) -> Iterator[Dict[str, Any]]:
+    for index in range(store["row_count"]) if indices is None else indices:
+        yield row_at(store, index)
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+
+DIGEST_SIZE = 16
+DEDUPE_SPILL_THRESHOLD = 250_000
+_FIELD_SEPARATOR = b"\x1f"
+
+
+def record_digest(collection: str, record: Dict[str, Any], keys: List[str]) -> bytes:
+    """Fixed-size blake2b digest of a record's signature fields, scoped to its collection."""
+    digest = hashlib.blake2b(collection.encode("utf-8"), digest_size=DIGEST_SIZE)
+    for key in keys:
+        digest.update(_FIELD_SEPARATOR)
+        digest.update(str(record.get(key) or "").strip().encode("utf-8"))
+    return digest.digest()
+
+
+def new_digest_set(spill_threshold: int = DEDUPE_SPILL_THRESHOLD, spill_dir: Path | None = None) -> Dict[str, Any]:
+    return {"memory": set(), "threshold": spill_threshold, "spill_dir": spill_dir, "db": None, "path": None}
+
+
+def _spill(state: Dict[str, Any]) -> None:
+    handle = tempfile.NamedTemporaryFile(
+        prefix="heavybid-dedupe-", suffix=".sqlite", dir=state["spill_dir"], delete=False
+    )
+    handle.close()
+    db = sqlite3.connect(handle.name)
+    db.execute("PRAGMA journal_mode=OFF")
+    db.execute("PRAGMA synchronous=OFF")
+    db.execute("CREATE TABLE seen (digest BLOB PRIMARY KEY) WITHOUT ROWID")
+    db.executemany("INSERT INTO seen VALUES (?)", ((digest,) for digest in state["memory"]))
+    state["memory"] = set()
+    state["db"] = db
+    state["path"] = Path(handle.name)
+
+
+def digest_set_add(state: Dict[str, Any], digest: bytes) -> bool:
+    """Add ``digest`` and return True when it had not been seen before."""
+    db = state["db"]
+    if db is not None:
+        return db.execute("INSERT OR IGNORE INTO seen VALUES (?)", (digest,)).rowcount == 1
+    memory = state["memory"]
+    if digest in memory:
+        return False
+    memory.add(digest)
+    if len(memory) > state["threshold"]:
+        _spill(state)
+    return True
+
+
+def close_digest_set(state: Dict[str, Any]) -> None:
+    if state["db"] is not None:
+        state["db"].close()
+        state["db"] = None
+    if state["path"] is not None:
+        state["path"].unlink(missing_ok=True)
+        state["path"] = None
+    state["memory"] = set()
+
+
+def new_dedupe_stats() -> Dict[str, Any]:
+    return {"seen": 0, "unique": 0, "duplicates": 0, "by_collection": {}, "by_source_kind": {}, "spilled": False}
+
+
+def dedupe_stream(
+    records: Iterable[Tuple[str, Dict[str, Any]]],
+    keys_by_collection: Dict[str, List[str]],
+    *,
+    spill_threshold: int = DEDUPE_SPILL_THRESHOLD,
+    spill_dir: Path | None = None,
+    stats: Dict[str, Any] | None = None,
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Drop repeated ``(collection, record)`` pairs from a record stream as it flows.
+
+    Collections without signature keys pass through untouched. Signatures are
+    kept as 16-byte digests in memory and moved to a temporary SQLite table
+    once more than ``spill_threshold`` are held. Duplicate counts per
+    collection and per ``source_kind`` accumulate in ``stats`` when given.
+    """
+    stats = stats if stats is not None else new_dedupe_stats()
+    seen = new_digest_set(spill_threshold, spill_dir)
+    try:
+        for collection, record in records:
+            keys = keys_by_collection.get(collection)
+            if keys is None:
+                yield collection, record
+                continue
+            stats["seen"] += 1
+            if digest_set_add(seen, record_digest(collection, record, keys)):
+                stats["unique"] += 1
+                yield collection, record
+                continue
+            stats["duplicates"] += 1
+            stats["by_collection"][collection] = stats["by_collection"].get(collection, 0) + 1
+            source_kind = str(record.get("source_kind") or "unknown")
+            stats["by_source_kind"][source_kind] = stats["by_source_kind"].get(source_kind, 0) + 1
+    finally:
+        stats["spilled"] = stats["spilled"] or seen["db"] is not None
+        close_digest_set(seen)
@@ -2,10 +2,13 @@ from __future__ import annotations
 
 from collections import Counter
 from pathlib import Path
-from typing import Any, Dict, Iterable, List
+from typing import Any, Dict, List
 
+from .inventory import build_source_inventory, directory_files, directory_subdirs, iter_tree_files
 from .paths import MANIFEST_ROOT, resolve_source_dir, write_json
 
+DISCOVERY_MANIFEST_PATH = MANIFEST_ROOT / "discovery-manifest.json"
+
 
 def _safe_rel(path: Path, root: Path) -> str:
     try:
@@ -14,15 +17,9 @@ def _safe_rel(path: Path, root: Path) -> str:
         return str(path)
 
 
-def _list_estimate_dirs(est_root: Path) -> List[Path]:
-    if not est_root.exists():
-        return []
+def list_estimate_dirs(inventory: Dict[str, Any], est_root: Path) -> List[Path]:
     return sorted(
-        [
-            path
-            for path in est_root.iterdir()
-            if path.is_dir() and any(child.is_file() for child in path.iterdir())
-        ],
+        [path for path in directory_subdirs(inventory, est_root) if directory_files(inventory, path)],
         key=lambda p: p.name.lower(),
     )
 
@@ -31,22 +28,19 @@ def _top_items(counter: Counter[str], limit: int = 25) -> List[Dict[str, Any]]:
     return [{"name": name, "count": count} for name, count in counter.most_common(limit)]
 
 
-def _iter_files(root: Path) -> Iterable[Path]:
-    for path in root.rglob("*"):
-        if path.is_file():
-            yield path
-
-
 def build_discovery_manifest(
     source_dir: str | None = None,
     *,
     write_outputs: bool = False,
+    inventory: Dict[str, Any] | None = None,
 ) -> Dict[str, Any]:
     source = resolve_source_dir(source_dir)
+    if inventory is None:
+        inventory = build_source_inventory(source)
     est_root = source / "EST"
     hcss_root = source / "HCSS"
     calc_root = hcss_root / "CalcTemplates"
-    estimate_dirs = _list_estimate_dirs(est_root)
+    estimate_dirs = list_estimate_dirs(inventory, est_root)
 
     extension_counts: Counter[str] = Counter()
     estimate_file_names: Counter[str] = Counter()
@@ -54,23 +48,19 @@ def build_discovery_manifest(
     workbook_exports: Counter[str] = Counter()
     calc_templates: Counter[str] = Counter()
 
-    for file_path in _iter_files(source):
-        extension = file_path.suffix.lower() or "<none>"
-        extension_counts[extension] += 1
+    for entry in iter_tree_files(inventory, source):
+        extension_counts[entry["suffix"].lower() or "<none>"] += 1
 
     for estimate_dir in estimate_dirs:
-        for file_path in estimate_dir.iterdir():
-            if not file_path.is_file():
-                continue
-            estimate_file_names[file_path.name] += 1
-            if file_path.suffix.lower() == ".xml":
-                xml_exports[file_path.name] += 1
-            if file_path.suffix.lower() == ".xlsx":
-                workbook_exports[file_path.name] += 1
-
-    if calc_root.exists():
-        for file_path in _iter_files(calc_root):
-            calc_templates[file_path.suffix.lower() or "<none>"] += 1
+        for entry in directory_files(inventory, estimate_dir):
+            estimate_file_names[entry["name"]] += 1
+            if entry["suffix"].lower() == ".xml":
+                xml_exports[entry["name"]] += 1
+            if entry["suffix"].lower() == ".xlsx":
+                workbook_exports[entry["name"]] += 1
+
+    for entry in iter_tree_files(inventory, calc_root):
+        calc_templates[entry["suffix"].lower() or "<none>"] += 1
 
     manifest = {
         "source_dir": str(source),
@@ -83,11 +73,10 @@ def build_discovery_manifest(
         "calc_template_extensions": _top_items(calc_templates, 20),
         "calc_template_directories": [
             _safe_rel(path, source)
-            for path in sorted(calc_root.iterdir(), key=lambda p: p.name.lower())
-            if path.is_dir()
-        ] if calc_root.exists() else [],
+            for path in sorted(directory_subdirs(inventory, calc_root), key=lambda p: p.name.lower())
+        ],
     }
 
     if write_outputs:
-        write_json(MANIFEST_ROOT / "discovery-manifest.json", manifest)
+        write_json(DISCOVERY_MANIFEST_PATH, manifest)
     return manifest
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
+import json
 import re
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Iterable, List
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
 from xml.etree import ElementTree as ET
 from zipfile import ZipFile
 
-from .paths import NORMALIZED_ROOT, resolve_source_dir, write_json
+from .dedupe import dedupe_stream, new_dedupe_stats
+from .inventory import build_source_inventory, directory_files, directory_subdirs
+from .paths import NORMALIZED_ROOT, read_jsonl, resolve_source_dir, write_json, write_jsonl
 
 XML_NS = {
     "a": "http://schemas.openxmlformats.org/spreadsheetml/2006/main",
@@ -270,18 +273,6 @@ def _normalize_etaa_cost_codes(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
     return items
 
 
-def _dedupe_records(records: Iterable[Dict[str, Any]], keys: List[str]) -> List[Dict[str, Any]]:
-    seen = set()
-    unique = []
-    for record in records:
-        signature = tuple(_safe_text(record.get(key)) for key in keys)
-        if signature in seen:
-            continue
-        seen.add(signature)
-        unique.append(record)
-    return unique
-
-
 def _summarize_bid(payload: Dict[str, Any]) -> Dict[str, Any]:
     project_data = payload.get("project_data", {})
     return {
@@ -297,187 +288,230 @@ def _summarize_bid(payload: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def extract_structured_assets(
+STRUCTURED_SUMMARY_PATH = NORMALIZED_ROOT / "heavybid-summary.json"
+STRUCTURED_COLLECTIONS = {
+    "bids": "bids",
+    "bid_items": "structured_bid_items",
+    "crew_library": "crew_library",
+    "labor_rates": "labor_rates",
+    "equipment_rates": "equipment_rates",
+    "material_library": "material_library",
+    "vendors": "vendors",
+    "codebooks": "codebooks",
+    "formulas": "formulas",
+}
+DEDUPE_KEYS = {
+    "bids": ["estimate_code", "project_name", "source_kind"],
+    "crew_library": ["estimate_code", "crew_code"],
+    "labor_rates": ["estimate_code", "labor_code"],
+    "equipment_rates": ["estimate_code", "equipment_code"],
+    "material_library": ["estimate_code", "resource_code"],
+    "vendors": ["estimate_code", "vendor_code", "vendor_name"],
+}
+
+
+def _iter_estimate_records(estimate_dir: Path, inventory: Dict[str, Any]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    estimate_files = [entry["path"] for entry in directory_files(inventory, estimate_dir)]
+    xml_files = [path for path in estimate_files if path.name.endswith(".xml")]
+    xml_files += [path for path in estimate_files if path.name.endswith(".XML")]
+    for xml_file in xml_files:
+        upper_name = xml_file.name.upper()
+        if upper_name.startswith("BIDFORM"):
+            parsed = _parse_job_xml(xml_file)
+            yield "bids", {
+                "estimate_code": parsed.get("estimate_code") or parsed.get("code"),
+                "project_name": parsed.get("description", ""),
+                "company": parsed.get("company", ""),
+                "bid_total": round(parsed.get("job_total", 0.0), 2),
+                "cost_total": round(parsed.get("total_cost", 0.0), 2),
+                "direct_cost_total": round(parsed.get("direct_cost", 0.0), 2),
+                "balanced_total": round(parsed.get("balanced_total", 0.0), 2),
+                "source_kind": "bidform",
+                "source_file": parsed.get("source_file", ""),
+            }
+            for item in _normalize_bid_items(parsed, "bidform"):
+                yield "bid_items", item
+        elif upper_name.startswith("ETA_BUDGETREVIEW"):
+            parsed = _parse_job_xml(xml_file)
+            yield "bids", {
+                "estimate_code": parsed.get("estimate_code") or parsed.get("code"),
+                "project_name": parsed.get("description", ""),
+                "company": parsed.get("company", ""),
+                "bid_total": round(parsed.get("job_total", 0.0), 2),
+                "source_kind": "budget_review",
+                "source_file": parsed.get("source_file", ""),
+            }
+            for item in _normalize_bid_items(parsed, "budget_review"):
+                yield "bid_items", item
+        elif upper_name == "ETAACCTDATA.XML":
+            parsed = parse_etaa_account_xml(xml_file)
+            yield "bids", _summarize_bid(parsed)
+            for item in _normalize_etaa_cost_codes(parsed):
+                yield "bid_items", item
+
+    for workbook_path in [path for path in estimate_files if path.name.endswith(".xlsx")]:
+        workbook = parse_workbook(workbook_path)
+        sheet = workbook["sheets"][0] if workbook["sheets"] else {"records": []}
+        rows = sheet.get("records", [])
+        estimate_code = workbook["estimate_code"]
+        workbook_name = workbook["workbook_name"].lower()
+
+        if workbook_name == "crew.xlsx":
+            for row in rows:
+                yield "crew_library", {
+                    "estimate_code": estimate_code,
+                    "crew_code": _safe_text(row.get("Crew Code")),
+                    "description": _safe_text(row.get("Description")),
+                    "calendar": _safe_text(row.get("Calendar")),
+                    "notes": _safe_text(row.get("Notes")),
+                    "header": _safe_text(row.get("Header (Y/N)")),
+                    "dispatcher_type": _safe_text(row.get("HCSS Dispatcher Type")),
+                    "source_file": workbook["source_file"],
+                }
+        elif workbook_name == "labor.xlsx":
+            for row in rows:
+                yield "labor_rates", {
+                    "estimate_code": estimate_code,
+                    "labor_code": _safe_text(row.get("Labor Code")),
+                    "description": _safe_text(row.get("Description")),
+                    "rate": round(_safe_float(row.get("Rate")), 4),
+                    "tax_percent": round(_safe_float(row.get("Tax Percent")), 4),
+                    "fringe": round(_safe_float(row.get("Fringe $")), 4),
+                    "unit": _safe_text(row.get("Unit")),
+                    "overtime_rule": _safe_text(row.get("Overtime Rule")),
+                    "dispatcher_type": _safe_text(row.get("Dispatcher Type")),
+                    "dispatcher_subtype": _safe_text(row.get("Dispatcher Subtype")),
+                    "schedule_code": _safe_text(row.get("Schedule Code")),
+                    "source_file": workbook["source_file"],
+                }
+        elif workbook_name == "equipment.xlsx":
+            for row in rows:
+                yield "equipment_rates", {
+                    "estimate_code": estimate_code,
+                    "equipment_code": _safe_text(row.get("Equipment Code")),
+                    "description": _safe_text(row.get("Description")),
+                    "units": _safe_text(row.get("Units")),
+                    "rent_type": _safe_text(row.get("Type Rent")),
+                    "rent_rate": round(_safe_float(row.get("Rent Rate")), 4),
+                    "eoe_total_per_hour": round(_safe_float(row.get("EOE Total $/HR")), 4),
+                    "operator_code": _safe_text(row.get("Operator")),
+                    "header": _safe_text(row.get("Header (Y/N)")),
+                    "source_file": workbook["source_file"],
+                }
+        elif workbook_name == "local material.xlsx":
+            for row in rows:
+                yield "material_library", {
+                    "estimate_code": estimate_code,
+                    "resource_code": _safe_text(row.get("Local Resource Code")),
+                    "description": _safe_text(row.get("Description")),
+                    "unit": _safe_text(row.get("Unit")),
+                    "cost": round(_safe_float(row.get("Cost")), 4),
+                    "job_cost_code_1": _safe_text(row.get("Job Cost Code 1")),
+                    "job_cost_description": _safe_text(row.get("Job Cost Description")),
+                    "quote_folder": _safe_text(row.get("Quote Folder")),
+                    "source_file": workbook["source_file"],
+                }
+        elif workbook_name == "local vendors.xlsx":
+            for row in rows:
+                yield "vendors", {
+                    "estimate_code": estimate_code,
+                    "quote_folder": _safe_text(row.get("Quote Folder")),
+                    "vendor_code": _safe_text(row.get("Vendor Code")),
+                    "vendor_name": _safe_text(row.get("Vendor Name")),
+                    "city": _safe_text(row.get("City")),
+                    "state": _safe_text(row.get("State")),
+                    "phone": _safe_text(row.get("Phone")),
+                    "email": _safe_text(row.get("Email")),
+                    "source_file": workbook["source_file"],
+                }
+        elif workbook_name in {"activity codebook.xlsx", "material codebook.xlsx", "crew resources.xlsx"}:
+            for row in rows:
+                row_copy = dict(row)
+                row_copy["estimate_code"] = estimate_code
+                row_copy["workbook_name"] = workbook["workbook_name"]
+                row_copy["source_file"] = workbook["source_file"]
+                yield "codebooks", row_copy
+
+
+def iter_structured_records(
     source_dir: str | None = None,
     *,
-    write_outputs: bool = False,
-) -> Dict[str, Any]:
+    inventory: Dict[str, Any] | None = None,
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Yield ``(collection, record)`` pairs estimate by estimate, then the calc template formulas.
+
+    Only one estimate's parsed XML and workbooks are alive at a time, so a
+    consumer that writes or indexes records as they arrive never holds the
+    whole archive in memory. Records are not deduplicated here.
+    """
     source = resolve_source_dir(source_dir)
+    if inventory is None:
+        inventory = build_source_inventory(source)
     est_root = source / "EST"
     calc_root = source / "HCSS" / "CalcTemplates"
 
-    bids: List[Dict[str, Any]] = []
-    bid_items: List[Dict[str, Any]] = []
-    crew_library: List[Dict[str, Any]] = []
-    labor_rates: List[Dict[str, Any]] = []
-    equipment_rates: List[Dict[str, Any]] = []
-    material_library: List[Dict[str, Any]] = []
-    vendors: List[Dict[str, Any]] = []
-    codebooks: List[Dict[str, Any]] = []
-    formulas: List[Dict[str, Any]] = []
-
-    for estimate_dir in sorted([path for path in est_root.iterdir() if path.is_dir()], key=lambda p: p.name.lower()):
-        for xml_file in sorted(estimate_dir.glob("*.xml")) + sorted(estimate_dir.glob("*.XML")):
-            upper_name = xml_file.name.upper()
-            if upper_name.startswith("BIDFORM"):
-                parsed = _parse_job_xml(xml_file)
-                bids.append(
-                    {
-                        "estimate_code": parsed.get("estimate_code") or parsed.get("code"),
-                        "project_name": parsed.get("description", ""),
-                        "company": parsed.get("company", ""),
-                        "bid_total": round(parsed.get("job_total", 0.0), 2),
-                        "cost_total": round(parsed.get("total_cost", 0.0), 2),
-                        "direct_cost_total": round(parsed.get("direct_cost", 0.0), 2),
-                        "balanced_total": round(parsed.get("balanced_total", 0.0), 2),
-                        "source_kind": "bidform",
-                        "source_file": parsed.get("source_file", ""),
-                    }
-                )
-                bid_items.extend(_normalize_bid_items(parsed, "bidform"))
-            elif upper_name.startswith("ETA_BUDGETREVIEW"):
-                parsed = _parse_job_xml(xml_file)
-                bids.append(
-                    {
-                        "estimate_code": parsed.get("estimate_code") or parsed.get("code"),
-                        "project_name": parsed.get("description", ""),
-                        "company": parsed.get("company", ""),
-                        "bid_total": round(parsed.get("job_total", 0.0), 2),
-                        "source_kind": "budget_review",
-                        "source_file": parsed.get("source_file", ""),
-                    }
-                )
-                bid_items.extend(_normalize_bid_items(parsed, "budget_review"))
-            elif upper_name == "ETAACCTDATA.XML":
-                parsed = parse_etaa_account_xml(xml_file)
-                bids.append(_summarize_bid(parsed))
-                bid_items.extend(_normalize_etaa_cost_codes(parsed))
-
-        for workbook_path in sorted(estimate_dir.glob("*.xlsx")):
-            workbook = parse_workbook(workbook_path)
-            sheet = workbook["sheets"][0] if workbook["sheets"] else {"records": []}
-            rows = sheet.get("records", [])
-            estimate_code = workbook["estimate_code"]
-            workbook_name = workbook["workbook_name"].lower()
-
-            if workbook_name == "crew.xlsx":
-                for row in rows:
-                    crew_library.append(
-                        {
-                            "estimate_code": estimate_code,
-                            "crew_code": _safe_text(row.get("Crew Code")),
-                            "description": _safe_text(row.get("Description")),
-                            "calendar": _safe_text(row.get("Calendar")),
-                            "notes": _safe_text(row.get("Notes")),
-                            "header": _safe_text(row.get("Header (Y/N)")),
-                            "dispatcher_type": _safe_text(row.get("HCSS Dispatcher Type")),
-                            "source_file": workbook["source_file"],
-                        }
-                    )
-            elif workbook_name == "labor.xlsx":
-                for row in rows:
-                    labor_rates.append(
-                        {
-                            "estimate_code": estimate_code,
-                            "labor_code": _safe_text(row.get("Labor Code")),
-                            "description": _safe_text(row.get("Description")),
-                            "rate": round(_safe_float(row.get("Rate")), 4),
-                            "tax_percent": round(_safe_float(row.get("Tax Percent")), 4),
-                            "fringe": round(_safe_float(row.get("Fringe $")), 4),
-                            "unit": _safe_text(row.get("Unit")),
-                            "overtime_rule": _safe_text(row.get("Overtime Rule")),
-                            "dispatcher_type": _safe_text(row.get("Dispatcher Type")),
-                            "dispatcher_subtype": _safe_text(row.get("Dispatcher Subtype")),
-                            "schedule_code": _safe_text(row.get("Schedule Code")),
-                            "source_file": workbook["source_file"],
-                        }
-                    )
-            elif workbook_name == "equipment.xlsx":
-                for row in rows:
-                    equipment_rates.append(
-                        {
-                            "estimate_code": estimate_code,
-                            "equipment_code": _safe_text(row.get("Equipment Code")),
-                            "description": _safe_text(row.get("Description")),
-                            "units": _safe_text(row.get("Units")),
-                            "rent_type": _safe_text(row.get("Type Rent")),
-                            "rent_rate": round(_safe_float(row.get("Rent Rate")), 4),
-                            "eoe_total_per_hour": round(_safe_float(row.get("EOE Total $/HR")), 4),
-                            "operator_code": _safe_text(row.get("Operator")),
-                            "header": _safe_text(row.get("Header (Y/N)")),
-                            "source_file": workbook["source_file"],
-                        }
-                    )
-            elif workbook_name == "local material.xlsx":
-                for row in rows:
-                    material_library.append(
-                        {
-                            "estimate_code": estimate_code,
-                            "resource_code": _safe_text(row.get("Local Resource Code")),
-                            "description": _safe_text(row.get("Description")),
-                            "unit": _safe_text(row.get("Unit")),
-                            "cost": round(_safe_float(row.get("Cost")), 4),
-                            "job_cost_code_1": _safe_text(row.get("Job Cost Code 1")),
-                            "job_cost_description": _safe_text(row.get("Job Cost Description")),
-                            "quote_folder": _safe_text(row.get("Quote Folder")),
-                            "source_file": workbook["source_file"],
-                        }
-                    )
-            elif workbook_name == "local vendors.xlsx":
-                for row in rows:
-                    vendors.append(
-                        {
-                            "estimate_code": estimate_code,
-                            "quote_folder": _safe_text(row.get("Quote Folder")),
-                            "vendor_code": _safe_text(row.get("Vendor Code")),
-                            "vendor_name": _safe_text(row.get("Vendor Name")),
-                            "city": _safe_text(row.get("City")),
-                            "state": _safe_text(row.get("State")),
-                            "phone": _safe_text(row.get("Phone")),
-                            "email": _safe_text(row.get("Email")),
-                            "source_file": workbook["source_file"],
-                        }
-                    )
-            elif workbook_name in {"activity codebook.xlsx", "material codebook.xlsx", "crew resources.xlsx"}:
-                for row in rows:
-                    row_copy = dict(row)
-                    row_copy["estimate_code"] = estimate_code
-                    row_copy["workbook_name"] = workbook["workbook_name"]
-                    row_copy["source_file"] = workbook["source_file"]
-                    codebooks.append(row_copy)
-
-    if calc_root.exists():
-        for calc_dir in sorted([path for path in calc_root.iterdir() if path.is_dir()], key=lambda p: p.name.lower()):
-            for template in sorted(calc_dir.iterdir(), key=lambda p: p.name.lower()):
-                if not template.is_file():
-                    continue
-                parsed = parse_formula_template(template)
-                parsed["template_group"] = calc_dir.name
-                formulas.append(parsed)
-
-    payload = {
+    for estimate_dir in sorted(directory_subdirs(inventory, est_root), key=lambda p: p.name.lower()):
+        yield from _iter_estimate_records(estimate_dir, inventory)
+
+    for calc_dir in sorted(directory_subdirs(inventory, calc_root), key=lambda p: p.name.lower()):
+        for entry in sorted(directory_files(inventory, calc_dir), key=lambda item: item["name"].lower()):
+            parsed = parse_formula_template(entry["path"])
+            parsed["template_group"] = calc_dir.name
+            yield "formulas", parsed
+
+
+def extract_structured_assets(
+    source_dir: str | None = None,
+    *,
+    write_outputs: bool = False,
+    inventory: Dict[str, Any] | None = None,
+) -> Dict[str, Any]:
+    source = resolve_source_dir(source_dir)
+    payload: Dict[str, Any] = {
         "generated_at": datetime.utcnow().isoformat() + "Z",
         "source_dir": str(source),
-        "bids": _dedupe_records(bids, ["estimate_code", "project_name", "source_kind"]),
-        "bid_items": bid_items,
-        "crew_library": _dedupe_records(crew_library, ["estimate_code", "crew_code"]),
-        "labor_rates": _dedupe_records(labor_rates, ["estimate_code", "labor_code"]),
-        "equipment_rates": _dedupe_records(equipment_rates, ["estimate_code", "equipment_code"]),
-        "material_library": _dedupe_records(material_library, ["estimate_code", "resource_code"]),
-        "vendors": _dedupe_records(vendors, ["estimate_code", "vendor_code", "vendor_name"]),
-        "codebooks": codebooks,
-        "formulas": formulas,
     }
+    payload.update({key: [] for key in STRUCTURED_COLLECTIONS})
+    stats = new_dedupe_stats()
+    records = iter_structured_records(str(source), inventory=inventory)
+    for collection, record in dedupe_stream(records, DEDUPE_KEYS, stats=stats):
+        payload[collection].append(record)
+    payload["dedupe"] = stats
 
     if write_outputs:
-        write_json(NORMALIZED_ROOT / "bids.json", payload["bids"])
-        write_json(NORMALIZED_ROOT / "bid_items.json", payload["bid_items"])
-        write_json(NORMALIZED_ROOT / "crew_library.json", payload["crew_library"])
-        write_json(NORMALIZED_ROOT / "labor_rates.json", payload["labor_rates"])
-        write_json(NORMALIZED_ROOT / "equipment_rates.json", payload["equipment_rates"])
-        write_json(NORMALIZED_ROOT / "material_library.json", payload["material_library"])
-        write_json(NORMALIZED_ROOT / "vendors.json", payload["vendors"])
-        write_json(NORMALIZED_ROOT / "codebooks.json", payload["codebooks"])
-        write_json(NORMALIZED_ROOT / "formulas.json", payload["formulas"])
-        write_json(NORMALIZED_ROOT / "heavybid-summary.json", payload)
+        write_normalized_collections(payload, STRUCTURED_COLLECTIONS, STRUCTURED_SUMMARY_PATH)
+    return payload
+
+
+def write_normalized_collections(
+    payload: Dict[str, Any],
+    collections: Dict[str, str],
+    summary_path: Path,
+    *,
+    linked: Dict[str, str] | None = None,
+) -> None:
+    """
+    Write each row collection once as JSONL, plus a small JSON summary pointing at them.
+
+    ``linked`` maps keys to files another stage already wrote; those keys are
+    left out of the summary and only referenced in its ``artifacts`` map.
+    """
+    linked = linked or {}
+    artifacts = dict(linked)
+    for key, name in collections.items():
+        target = write_jsonl(NORMALIZED_ROOT / f"{name}.jsonl", payload.get(key, []))
+        artifacts[key] = target.name
+    summary = {key: value for key, value in payload.items() if key not in collections and key not in linked}
+    summary.setdefault("counts", {key: len(payload.get(key, [])) for key in collections})
+    summary["artifacts"] = artifacts
+    write_json(summary_path, summary)
+
+
+def load_normalized_collections(summary_path: Path) -> Dict[str, Any]:
+    """Rebuild a payload written by write_normalized_collections, reading each JSONL collection back."""
+    payload = json.loads(summary_path.read_text(encoding="utf-8"))
+    payload.pop("counts", None)
+    for key, name in payload.pop("artifacts", {}).items():
+        payload[key] = list(read_jsonl(summary_path.parent / name))
     return payload
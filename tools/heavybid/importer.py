@@ -1,13 +1,32 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
-from typing import Any, Dict, List
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
 
+from . import binary_decoder, discover, extract, schema_registry
 from .binary_decoder import decode_binary_tables
+from .columnar import BID_ITEM_COLUMNS_FILE, write_columnar_bid_items
 from .discover import build_discovery_manifest
-from .extract import extract_structured_assets
-from .paths import NORMALIZED_ROOT, ensure_output_dirs, resolve_source_dir, write_json
-from .schema_registry import build_schema_registry
+from .extract import (
+    STRUCTURED_COLLECTIONS,
+    extract_structured_assets,
+    load_normalized_collections,
+    write_normalized_collections,
+)
+from .inventory import (
+    build_source_inventory,
+    directory_files,
+    directory_subdirs,
+    fingerprint_entries,
+    iter_tree_files,
+)
+from .paths import CACHE_ROOT, NORMALIZED_ROOT, ensure_output_dirs, resolve_source_dir, write_json
+from .schema_registry import build_schema_registry, schema_fingerprint
 
 
 def _merge_bid_items(
@@ -36,10 +55,12 @@ def _merge_bid_items(
                 "estimate_code": hint.get("estimate_code", ""),
                 "item_code": hint.get("item_code", ""),
                 "description": hint.get("description_hint", ""),
-                "quantity": 0.0,
-                "unit": "",
-                "unit_price": 0.0,
-                "amount": 0.0,
+                "quantity": hint.get("quantity", 0.0),
+                "unit": hint.get("unit", ""),
+                "unit_price": hint.get("unit_price", 0.0),
+                "amount": hint.get("amount", 0.0),
+                "direct_cost": hint.get("direct_cost", 0.0),
+                "manhours": hint.get("manhours", 0.0),
                 "source_kind": hint.get("source_kind", "binary_biditem"),
                 "source_file": hint.get("source_file", ""),
                 "confidence": hint.get("confidence", "low"),
@@ -90,25 +111,78 @@ def _build_private_kb(structured: Dict[str, Any], formulas: List[Dict[str, Any]]
     return entries
 
 
-def build_heavybid_snapshot(
-    source_dir: str | None = None,
-    *,
-    write_outputs: bool = True,
-) -> Dict[str, Any]:
-    source = resolve_source_dir(source_dir)
-    ensure_output_dirs()
+STAGE_CACHE_VERSION = 2
+
+
+def _estimate_files(inventory: Dict[str, Any], source: Path, suffixes: tuple) -> List[Dict[str, Any]]:
+    est_root = source / "EST"
+    return [
+        entry
+        for estimate_dir in directory_subdirs(inventory, est_root)
+        for entry in directory_files(inventory, estimate_dir)
+        if entry["name"].endswith(suffixes)
+    ]
+
+
+def _discovery_inputs(context: Dict[str, Any]) -> str:
+    return fingerprint_entries(context["source"], iter_tree_files(context["inventory"]))
+
+
+def _schema_inputs(context: Dict[str, Any]) -> str:
+    return schema_fingerprint(context["source"], context["inventory"])
+
+
+def _structured_inputs(context: Dict[str, Any]) -> str:
+    source, inventory = context["source"], context["inventory"]
+    entries = _estimate_files(inventory, source, (".xml", ".XML", ".xlsx"))
+    entries += list(iter_tree_files(inventory, source / "HCSS" / "CalcTemplates"))
+    return fingerprint_entries(source, entries)
+
+
+def _binary_inputs(context: Dict[str, Any]) -> str:
+    source = context["source"]
+    return fingerprint_entries(source, _estimate_files(context["inventory"], source, (".DAT", ".HDR")))
+
 
-    discovery = build_discovery_manifest(str(source), write_outputs=write_outputs)
-    schema = build_schema_registry(str(source), write_outputs=write_outputs)
-    structured = extract_structured_assets(str(source), write_outputs=write_outputs)
-    binary = decode_binary_tables(str(source), write_outputs=write_outputs)
+def _run_discovery(context: Dict[str, Any], upstream: Dict[str, Any]) -> Dict[str, Any]:
+    return build_discovery_manifest(
+        str(context["source"]), write_outputs=context["write_outputs"], inventory=context["inventory"]
+    )
+
+
+def _run_schema(context: Dict[str, Any], upstream: Dict[str, Any]) -> Dict[str, Any]:
+    return build_schema_registry(
+        str(context["source"]), write_outputs=context["write_outputs"], inventory=context["inventory"]
+    )
+
+
+def _run_structured(context: Dict[str, Any], upstream: Dict[str, Any]) -> Dict[str, Any]:
+    return extract_structured_assets(
+        str(context["source"]), write_outputs=context["write_outputs"], inventory=context["inventory"]
+    )
+
+
+def _run_binary(context: Dict[str, Any], upstream: Dict[str, Any]) -> Dict[str, Any]:
+    return decode_binary_tables(
+        str(context["source"]),
+        write_outputs=context["write_outputs"],
+        registry=upstream["schema"],
+        inventory=context["inventory"],
+    )
+
+
+def _run_snapshot(context: Dict[str, Any], upstream: Dict[str, Any]) -> Dict[str, Any]:
+    discovery = upstream["discovery"]
+    schema = upstream["schema"]
+    structured = upstream["structured"]
+    binary = upstream["binary"]
 
     merged_bid_items = _merge_bid_items(structured.get("bid_items", []), binary.get("merged_bid_hints", []))
     private_kb = _build_private_kb(structured, structured.get("formulas", []))
 
     snapshot = {
         "generated_at": datetime.utcnow().isoformat() + "Z",
-        "source_dir": str(source),
+        "source_dir": str(context["source"]),
         "discovery": discovery,
         "schema": {
             "table_count": schema.get("table_count", 0),
@@ -125,6 +199,7 @@ def build_heavybid_snapshot(
             "formulas": len(structured.get("formulas", [])),
             "binary_estimates": len(binary.get("decoded_estimates", [])),
         },
+        "dedupe": structured.get("dedupe", {}),
         "bids": structured.get("bids", []),
         "bid_items": merged_bid_items,
         "crew_library": structured.get("crew_library", []),
@@ -137,9 +212,253 @@ def build_heavybid_snapshot(
         "binary": binary,
         "private_kb": private_kb,
     }
-
-    if write_outputs:
-        write_json(NORMALIZED_ROOT / "bid_items.json", merged_bid_items)
-        write_json(NORMALIZED_ROOT / "private_kb.json", private_kb)
-        write_json(NORMALIZED_ROOT / "snapshot.json", snapshot)
+    if context["write_outputs"]:
+        _write_snapshot(snapshot)
     return snapshot
+
+
+def _write_snapshot(snapshot: Dict[str, Any]) -> None:
+    # Row collections go to JSONL once; snapshot.json only keeps metadata and
+    # counts. Decoded binary tables live in binary/.
+    linked = {key: f"{name}.jsonl" for key, name in STRUCTURED_COLLECTIONS.items() if key != "bid_items"}
+    linked["binary"] = "../binary/binary-tables.json"
+    linked["bid_items_columns"] = write_columnar_bid_items(
+        snapshot["bid_items"], NORMALIZED_ROOT / BID_ITEM_COLUMNS_FILE
+    ).name
+    write_normalized_collections(
+        snapshot,
+        {"bid_items": "bid_items", "private_kb": "private_kb"},
+        NORMALIZED_ROOT / "snapshot.json",
+        linked=linked,
+    )
+
+
+def _read_json(path: Path) -> Dict[str, Any]:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+# Stage graph for the importer. Each stage lists the stages it consumes, how
+# to fingerprint its own source inputs, and, for stages worth caching between
+# runs, the artifact it writes and how to load its output back from it. The
+# cache only records a fingerprint and a pointer to that artifact. Stages
+# whose dependencies are satisfied run concurrently, so structured extraction
+# and binary decoding overlap.
+STAGES: Dict[str, Dict[str, Any]] = {
+    "discovery": {
+        "deps": [],
+        "inputs": _discovery_inputs,
+        "run": _run_discovery,
+        "artifact": lambda: discover.DISCOVERY_MANIFEST_PATH,
+        "load": _read_json,
+    },
+    "schema": {
+        "deps": [],
+        "inputs": _schema_inputs,
+        "run": _run_schema,
+        "artifact": lambda: schema_registry.REGISTRY_PATH,
+        "load": _read_json,
+    },
+    "structured": {
+        "deps": [],
+        "inputs": _structured_inputs,
+        "run": _run_structured,
+        "artifact": lambda: extract.STRUCTURED_SUMMARY_PATH,
+        "load": load_normalized_collections,
+    },
+    "binary": {
+        "deps": ["schema"],
+        "inputs": _binary_inputs,
+        "run": _run_binary,
+        "artifact": lambda: binary_decoder.BINARY_TABLES_PATH,
+        "load": _read_json,
+    },
+    "snapshot": {
+        "deps": ["discovery", "schema", "structured", "binary"],
+        "inputs": None,
+        "run": _run_snapshot,
+        "artifact": None,
+        "load": None,
+    },
+}
+
+
+def _with_dependencies(names: Iterable[str]) -> set:
+    resolved = set()
+    pending = list(names)
+    while pending:
+        name = pending.pop()
+        if name in resolved:
+            continue
+        resolved.add(name)
+        pending.extend(STAGES[name]["deps"])
+    return resolved
+
+
+def _with_dependents(name: str) -> set:
+    resolved = {name}
+    changed = True
+    while changed:
+        changed = False
+        for stage, spec in STAGES.items():
+            if stage not in resolved and resolved.intersection(spec["deps"]):
+                resolved.add(stage)
+                changed = True
+    return resolved
+
+
+def _validate_stage_names(names: Iterable[str]) -> None:
+    unknown = [name for name in names if name not in STAGES]
+    if unknown:
+        raise ValueError(f"Unknown HeavyBid stage(s) {unknown}. Choose from: {list(STAGES)}")
+
+
+def _stage_fingerprint(name: str, context: Dict[str, Any], fingerprints: Dict[str, str]) -> str:
+    spec = STAGES[name]
+    parts = [str(STAGE_CACHE_VERSION), name, str(context["source"])]
+    if spec["inputs"] is not None:
+        parts.append(spec["inputs"](context))
+    parts.extend(f"{dep}={fingerprints[dep]}" for dep in spec["deps"])
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+
+def _artifact_stamp(path: Path) -> List[int]:
+    stat = path.stat()
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _load_cached_stage(name: str, fingerprint: str) -> Dict[str, Any] | None:
+    """Load a stage's output from the artifact its cache entry points at, if both are still current."""
+    path = CACHE_ROOT / f"{name}.json"
+    if not path.exists():
+        return None
+    try:
+        cached = json.loads(path.read_text(encoding="utf-8"))
+        if cached.get("fingerprint") != fingerprint:
+            return None
+        artifact = Path(cached["artifact"])
+        if _artifact_stamp(artifact) != cached.get("stamp"):
+            return None
+        return STAGES[name]["load"](artifact)
+    except (KeyError, OSError, ValueError):
+        return None
+
+
+def _execute_stage(
+    name: str,
+    context: Dict[str, Any],
+    upstream: Dict[str, Any],
+    fingerprints: Dict[str, str],
+    *,
+    force: bool,
+) -> tuple[Any, Dict[str, Any]]:
+    started = time.perf_counter()
+    spec = STAGES[name]
+    fingerprint = _stage_fingerprint(name, context, fingerprints)
+    # Only runs that write artifacts can cache: the entry points at what the stage wrote.
+    use_cache = spec["artifact"] is not None and context["use_cache"] and context["write_outputs"]
+    output = None
+    if use_cache and not force:
+        output = _load_cached_stage(name, fingerprint)
+    cached = output is not None
+    if not cached:
+        output = spec["run"](context, {dep: upstream[dep] for dep in spec["deps"]})
+        if use_cache:
+            artifact = spec["artifact"]()
+            write_json(
+                CACHE_ROOT / f"{name}.json",
+                {"fingerprint": fingerprint, "artifact": str(artifact), "stamp": _artifact_stamp(artifact)},
+            )
+    record = {
+        "stage": name,
+        "seconds": round(time.perf_counter() - started, 4),
+        "cached": cached,
+        "fingerprint": fingerprint,
+    }
+    return output, record
+
+
+def run_heavybid_pipeline(
+    source_dir: str | None = None,
+    *,
+    write_outputs: bool = True,
+    only: Iterable[str] | None = None,
+    start_from: str | None = None,
+    use_cache: bool = True,
+    max_workers: int = 2,
+) -> Dict[str, Any]:
+    """
+    Run the HeavyBid import as a stage graph.
+
+    When ``write_outputs`` is set, each cacheable stage records under
+    ``data/heavybid/cache`` a fingerprint of its source files and upstream
+    stages plus a pointer to the artifact it wrote; a later run with the same
+    fingerprint loads the stage's output back from that artifact. ``only`` runs
+    just the named stages (plus whatever they need, from cache when possible);
+    ``start_from`` forces a stage and everything downstream of it to
+    re-execute. The snapshot stage always writes the normalized artifacts
+    (snapshot.json, bid_items.jsonl, bid_items.columns) that history search
+    and the crew index read; once the run finishes, its per-stage timings are
+    added to snapshot.json under ``pipeline``.
+    """
+    only = list(only or [])
+    _validate_stage_names(only + ([start_from] if start_from else []))
+    source = resolve_source_dir(source_dir)
+    ensure_output_dirs()
+
+    started = time.perf_counter()
+    inventory = build_source_inventory(source)
+    timings = [
+        {"stage": "inventory", "seconds": round(time.perf_counter() - started, 4), "cached": False},
+    ]
+    context = {
+        "source": source,
+        "inventory": inventory,
+        "write_outputs": write_outputs,
+        "use_cache": use_cache,
+    }
+
+    targets = _with_dependencies(only) if only else set(STAGES)
+    forced = set(only) if only else set()
+    if start_from:
+        forced |= _with_dependents(start_from) & targets
+
+    results: Dict[str, Any] = {}
+    fingerprints: Dict[str, str] = {}
+    pending = [name for name in STAGES if name in targets]
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        running: Dict[Any, str] = {}
+        while pending or running:
+            for name in list(pending):
+                if all(dep in results for dep in STAGES[name]["deps"]):
+                    pending.remove(name)
+                    future = pool.submit(
+                        _execute_stage, name, context, dict(results), dict(fingerprints), force=name in forced
+                    )
+                    running[future] = name
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                results[name], record = future.result()
+                fingerprints[name] = record["fingerprint"]
+                timings.append(record)
+
+    pipeline = {"timings": timings, "total_seconds": round(time.perf_counter() - started, 4)}
+    if "snapshot" in results:
+        results["snapshot"]["pipeline"] = pipeline
+        if write_outputs:
+            # The snapshot stage wrote snapshot.json before the run finished; add the timings now.
+            summary_path = NORMALIZED_ROOT / "snapshot.json"
+            summary = json.loads(summary_path.read_text(encoding="utf-8"))
+            summary["pipeline"] = pipeline
+            write_json(summary_path, summary)
+    return {"source_dir": str(source), "stages": results, **pipeline}
+
+
+def build_heavybid_snapshot(
+    source_dir: str | None = None,
+    *,
+    write_outputs: bool = True,
+    use_cache: bool = True,
+) -> Dict[str, Any]:
+    run = run_heavybid_pipeline(source_dir, write_outputs=write_outputs, use_cache=use_cache)
+    return run["stages"]["snapshot"]
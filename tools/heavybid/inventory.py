@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List
+
+
+def build_source_inventory(source: Path) -> Dict[str, Any]:
+    """Walk the HeavyBid tree once with ``os.scandir`` and keep each file's stat result."""
+    directories: Dict[Path, Dict[str, Any]] = {}
+    file_count = 0
+    pending = [source]
+    while pending:
+        directory = pending.pop()
+        files: List[Dict[str, Any]] = []
+        subdirs: List[Path] = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(Path(entry.path))
+                    elif entry.is_file():
+                        path = Path(entry.path)
+                        stat = entry.stat()
+                        files.append(
+                            {
+                                "name": entry.name,
+                                "path": path,
+                                "suffix": path.suffix,
+                                "size": stat.st_size,
+                                "mtime_ns": stat.st_mtime_ns,
+                            }
+                        )
+        except (FileNotFoundError, PermissionError, NotADirectoryError):
+            continue
+        files.sort(key=lambda item: item["name"])
+        subdirs.sort(key=lambda path: path.name)
+        directories[directory] = {
+            "files": files,
+            "by_name": {item["name"]: item for item in files},
+            "subdirs": subdirs,
+        }
+        file_count += len(files)
+        pending.extend(reversed(subdirs))
+    return {"root": source, "directories": directories, "file_count": file_count}
+
+
+def directory_files(inventory: Dict[str, Any], directory: Path) -> List[Dict[str, Any]]:
+    return inventory["directories"].get(directory, {}).get("files", [])
+
+
+def directory_subdirs(inventory: Dict[str, Any], directory: Path) -> List[Path]:
+    return inventory["directories"].get(directory, {}).get("subdirs", [])
+
+
+def directory_exists(inventory: Dict[str, Any], directory: Path) -> bool:
+    return directory in inventory["directories"]
+
+
+def file_entry(inventory: Dict[str, Any], path: Path) -> Dict[str, Any] | None:
+    return inventory["directories"].get(path.parent, {}).get("by_name", {}).get(path.name)
+
+
+def iter_tree_files(inventory: Dict[str, Any], root: Path | None = None) -> Iterator[Dict[str, Any]]:
+    pending = [root or inventory["root"]]
+    while pending:
+        directory = pending.pop()
+        node = inventory["directories"].get(directory)
+        if node is None:
+            continue
+        yield from node["files"]
+        pending.extend(reversed(node["subdirs"]))
+
+
+def fingerprint_entries(root: Path, entries: Iterable[Dict[str, Any]]) -> str:
+    """Hash the relative path, size and mtime of inventory entries."""
+    digest = hashlib.sha256()
+    for entry in entries:
+        try:
+            relative = entry["path"].relative_to(root)
+        except ValueError:
+            relative = entry["path"]
+        digest.update(f"{relative}|{entry['size']}|{entry['mtime_ns']}\n".encode("utf-8"))
+    return digest.hexdigest()
@@ -2,8 +2,10 @@ from __future__ import annotations
 
 import json
 import os
+import tempfile
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any
+from typing import IO, Any, Dict, Iterable, Iterator
 
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
@@ -12,6 +14,7 @@ SCHEMA_ROOT = DATA_ROOT / "schema"
 MANIFEST_ROOT = DATA_ROOT / "manifests"
 NORMALIZED_ROOT = DATA_ROOT / "normalized"
 BINARY_ROOT = DATA_ROOT / "binary"
+CACHE_ROOT = DATA_ROOT / "cache"
 
 
 def default_source_dir() -> Path:
@@ -32,11 +35,70 @@ def resolve_source_dir(source_dir: str | os.PathLike[str] | None = None) -> Path
 
 
 def ensure_output_dirs() -> None:
-    for directory in (DATA_ROOT, SCHEMA_ROOT, MANIFEST_ROOT, NORMALIZED_ROOT, BINARY_ROOT):
+    for directory in (DATA_ROOT, SCHEMA_ROOT, MANIFEST_ROOT, NORMALIZED_ROOT, BINARY_ROOT, CACHE_ROOT):
         directory.mkdir(parents=True, exist_ok=True)
 
 
-def write_json(target: Path, payload: Any) -> Path:
+def _process_umask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+# Read once at import: querying the umask briefly sets it to 0, which would
+# race with stages writing files on other threads.
+_FILE_MODE = 0o666 & ~_process_umask()
+
+
+@contextmanager
+def _atomic_writer(target: Path, mode: str = "w") -> Iterator[IO[Any]]:
+    """
+    Write to a temp file beside ``target`` and rename it into place on success.
+
+    The temp file gets the usual umask-default permissions (NamedTemporaryFile
+    creates it 0600) and is flushed to disk before the rename, so readers in
+    other processes can open the artifact and a crash never leaves it half-written.
+    """
     target.parent.mkdir(parents=True, exist_ok=True)
-    target.write_text(json.dumps(payload, indent=2, sort_keys=False), encoding="utf-8")
+    handle = tempfile.NamedTemporaryFile(
+        mode,
+        encoding=None if "b" in mode else "utf-8",
+        dir=target.parent,
+        prefix=f".{target.name}.",
+        suffix=".tmp",
+        delete=False,
+    )
+    try:
+        with handle:
+            yield handle
+            handle.flush()
+            os.fsync(handle.fileno())
+            os.chmod(handle.name, _FILE_MODE)
+        os.replace(handle.name, target)
+    except BaseException:
+        Path(handle.name).unlink(missing_ok=True)
+        raise
+
+
+def write_json(target: Path, payload: Any, *, indent: int | None = 2) -> Path:
+    separators = None if indent is not None else (",", ":")
+    with _atomic_writer(target) as handle:
+        json.dump(payload, handle, indent=indent, separators=separators, sort_keys=False)
+    return target
+
+
+def write_jsonl(target: Path, rows: Iterable[Dict[str, Any]]) -> Path:
+    """Stream rows to ``target`` as compact JSON Lines, one record per line."""
+    encoder = json.JSONEncoder(separators=(",", ":"))
+    with _atomic_writer(target) as handle:
+        for row in rows:
+            handle.write(encoder.encode(row))
+            handle.write("\n")
     return target
+
+
+def read_jsonl(path: Path) -> Iterator[Dict[str, Any]]:
+    with path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            if line.strip():
+                yield json.loads(line)
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import mmap
+import struct
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List
+
+
+RECORD_TABLES = ["BIDITEM", "ESTDETL", "CREW", "LABOR"]
+
+_NAME_KEYS = ("field_name", "name", "tag")
+_TYPE_KEYS = ("field_type", "type", "data_type")
+_SIZE_KEYS = ("field_size", "field_length", "size", "length", "width")
+_OFFSET_KEYS = ("field_offset", "offset", "position")
+_HEADER_KEYS = ("header_size", "header_length", "data_offset")
+_RECORD_SIZE_KEYS = ("record_size", "record_length")
+
+_INTEGER_CODES = {1: "b", 2: "h", 4: "i", 8: "q"}
+_UNSIGNED_CODES = {1: "B", 2: "H", 4: "I", 8: "Q"}
+_FLOAT_CODES = {4: "f", 8: "d"}
+
+# Normalized field-name candidates for the columns openmud cares about. The
+# first name present in a table's layout wins.
+BIDITEM_COLUMNS = {
+    "item_code": ("biditem", "item", "code", "bid_item", "itemcode"),
+    "description": ("desc", "description", "desc1"),
+    "quantity": ("quan", "quantity", "bidquan", "qty"),
+    "unit": ("unit", "units", "um"),
+    "unit_price": ("price", "unitprice", "unit_price", "bidprice"),
+    "amount": ("total", "amount", "bidtotal", "extension"),
+    "direct_cost": ("directcost", "direct_cost", "dircost"),
+    "manhours": ("manhours", "mhrs", "man_hours"),
+}
+
+
+def _first_value(meta: Dict[str, Any], keys: tuple) -> Any:
+    for key in keys:
+        value = meta.get(key)
+        if isinstance(value, list):
+            value = value[0] if value else None
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def _as_int(value: Any) -> int:
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _as_float(value: Any) -> float:
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _decode_text(raw: bytes) -> str:
+    return raw.split(b"\x00", 1)[0].decode("latin-1").strip()
+
+
+def _field_code(field_type: str, size: int) -> tuple[str, str]:
+    kind = field_type.strip().upper()
+    if not size:
+        return "", "skip"
+    if kind in {"STRING", "CHAR", "TEXT", "VARCHAR", "ZSTRING", "LSTRING", "A", "S", "C"}:
+        return f"{size}s", "text"
+    if kind in {"INTEGER", "INT", "I", "LONG", "SHORT", "SMALLINT", "BIGINT", "AUTOINC", "AUTOINCREMENT"}:
+        code = _INTEGER_CODES.get(size)
+        return (code, "number") if code else (f"{size}x", "skip")
+    if kind in {"UNSIGNED", "UNSIGNED_BINARY", "U", "WORD", "DWORD", "DATE", "TIME", "TIMESTAMP"}:
+        code = _UNSIGNED_CODES.get(size)
+        return (code, "number") if code else (f"{size}x", "skip")
+    if kind in {"FLOAT", "DOUBLE", "REAL", "F", "D", "BFLOAT", "NUMBER", "NUMERIC"}:
+        code = _FLOAT_CODES.get(size)
+        return (code, "number") if code else (f"{size}x", "skip")
+    if kind in {"MONEY", "CURRENCY"} and size == 8:
+        return "q", "money"
+    if kind in {"LOGICAL", "BOOL", "BOOLEAN", "BIT", "L"}:
+        code = _UNSIGNED_CODES.get(size)
+        return (code, "flag") if code else (f"{size}x", "skip")
+    return f"{size}x", "skip"
+
+
+def compile_record_layout(int_meta: Dict[str, Any], tag_fields: List[str] | None = None) -> Dict[str, Any] | None:
+    """Compile an INT field layout into a fixed-width ``struct.Struct`` record decoder."""
+    fields = sorted(
+        int_meta.get("fields", []),
+        key=lambda field: (_as_int(_first_value(field, _OFFSET_KEYS)), _as_int(field.get("field_number"))),
+    )
+    tag_fields = tag_fields or []
+    if not fields:
+        return None
+
+    codes = ["<"]
+    columns: List[Dict[str, Any]] = []
+    cursor = 0
+    for index, field in enumerate(fields):
+        size = _as_int(_first_value(field, _SIZE_KEYS))
+        offset = _first_value(field, _OFFSET_KEYS)
+        if offset is not None and _as_int(offset) > cursor:
+            codes.append(f"{_as_int(offset) - cursor}x")
+            cursor = _as_int(offset)
+        code, kind = _field_code(str(_first_value(field, _TYPE_KEYS) or ""), size)
+        if not code:
+            continue
+        codes.append(code)
+        cursor += size
+        if kind == "skip":
+            continue
+        name = _first_value(field, _NAME_KEYS)
+        if not name and index < len(tag_fields):
+            name = tag_fields[index]
+        columns.append({"name": str(name or f"field_{field.get('field_number', index + 1)}"), "kind": kind})
+
+    record_size = _as_int(_first_value(int_meta.get("raw", {}), _RECORD_SIZE_KEYS))
+    if record_size > cursor:
+        codes.append(f"{record_size - cursor}x")
+    compiled = struct.Struct("".join(codes))
+    if not compiled.size or not columns:
+        return None
+
+    converters: List[Callable[[Any], Any]] = []
+    for column in columns:
+        if column["kind"] == "text":
+            converters.append(_decode_text)
+        elif column["kind"] == "money":
+            converters.append(lambda value: round(value / 10000.0, 4))
+        elif column["kind"] == "flag":
+            converters.append(bool)
+        else:
+            converters.append(lambda value: value)
+
+    return {
+        "table": str(int_meta.get("database_name", "")).upper(),
+        "struct": compiled,
+        "record_size": compiled.size,
+        "header_size": _as_int(_first_value(int_meta.get("raw", {}), _HEADER_KEYS)),
+        "columns": columns,
+        "names": [column["name"] for column in columns],
+        "converters": converters,
+    }
+
+
+def describe_layout(layout: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "table": layout["table"],
+        "format": layout["struct"].format,
+        "record_size": layout["record_size"],
+        "columns": layout["columns"],
+    }
+
+
+def locate_records(layout: Dict[str, Any], dat_size: int, header_ints: List[int]) -> Dict[str, Any]:
+    """Work out where the fixed-width records sit inside a .DAT file."""
+    record_size = layout["record_size"]
+    declared_count = header_ints[0] if header_ints else 0
+    header_size = layout["header_size"]
+    if header_size and header_size <= dat_size:
+        count = (dat_size - header_size) // record_size
+        exact = header_size + count * record_size == dat_size
+    elif declared_count and declared_count * record_size <= dat_size:
+        # The header size is inferred from the declared count, so the sizes
+        # always add up; that is a plausible fit, not an exact one.
+        count = declared_count
+        header_size = dat_size - count * record_size
+        exact = False
+    else:
+        header_size = dat_size % record_size
+        count = dat_size // record_size
+        exact = False
+    return {
+        "data_offset": header_size,
+        "record_count": count,
+        "declared_record_count": declared_count,
+        "confidence": "high" if exact else "medium",
+    }
+
+
+def iter_table_records(
+    dat_path: Path,
+    layout: Dict[str, Any],
+    *,
+    data_offset: int = 0,
+    record_count: int | None = None,
+) -> Iterator[Dict[str, Any]]:
+    """Lazily yield decoded rows from a .DAT file using ``iter_unpack`` over a mapped view."""
+    record_size = layout["record_size"]
+    names = layout["names"]
+    converters = layout["converters"]
+    with dat_path.open("rb") as handle:
+        if not handle.seek(0, 2):
+            return
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            available = (len(mapped) - data_offset) // record_size if data_offset < len(mapped) else 0
+            count = available if record_count is None else min(record_count, available)
+            view = memoryview(mapped)[data_offset: data_offset + count * record_size]
+            rows = layout["struct"].iter_unpack(view)
+            try:
+                for values in rows:
+                    yield {name: convert(value) for name, convert, value in zip(names, converters, values)}
+            finally:
+                # The unpack iterator and the view both pin the mapping; drop
+                # them before the mmap context closes.
+                del rows
+                view.release()
+
+
+def _pick(row: Dict[str, Any], candidates: tuple, lowered: Dict[str, str]) -> Any:
+    for candidate in candidates:
+        key = lowered.get(candidate)
+        if key is not None:
+            return row.get(key)
+    return None
+
+
+def normalize_biditem_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    lowered = {name.lower(): name for name in row}
+    values = {column: _pick(row, candidates, lowered) for column, candidates in BIDITEM_COLUMNS.items()}
+    quantity = _as_float(values["quantity"])
+    amount = _as_float(values["amount"])
+    unit_price = _as_float(values["unit_price"])
+    if not unit_price and quantity:
+        unit_price = amount / quantity
+    if not amount and quantity and unit_price:
+        amount = quantity * unit_price
+    return {
+        "item_code": str(values["item_code"] or "").strip(),
+        "description": str(values["description"] or "").strip(),
+        "quantity": quantity,
+        "unit": str(values["unit"] or "").strip(),
+        "unit_price": round(unit_price, 4),
+        "amount": round(amount, 2),
+        "direct_cost": round(_as_float(values["direct_cost"]), 2),
+        "manhours": round(_as_float(values["manhours"]), 2),
+    }
@@ -1,11 +1,16 @@
 from __future__ import annotations
 
+import json
 import re
 from pathlib import Path
 from typing import Any, Dict, List
 
+from .inventory import build_source_inventory, directory_files, file_entry, fingerprint_entries
 from .paths import SCHEMA_ROOT, resolve_source_dir, write_json
 
+REGISTRY_PATH = SCHEMA_ROOT / "schema-registry.json"
+_REGISTRY_CACHE: Dict[str, Dict[str, Any]] = {}
+
 
 def _coerce(value: str) -> Any:
     text = value.strip()
@@ -102,19 +107,71 @@ def parse_sql_schema(path: Path) -> Dict[str, Any]:
     return {"create_tables": tables, "shadow_tables": shadow_tables}
 
 
+def _schema_inputs(source: Path, inventory: Dict[str, Any] | None = None) -> List[Dict[str, Any]]:
+    bin_dir = source / "BIN"
+    int_dir = bin_dir / "SQL" / "INT"
+    if inventory is None:
+        inventory = build_source_inventory(bin_dir)
+    inputs = [entry for entry in directory_files(inventory, bin_dir) if entry["name"].endswith(".TAG")]
+    inputs += [entry for entry in directory_files(inventory, int_dir) if entry["name"].endswith(".INT")]
+    sql_entry = file_entry(inventory, bin_dir / "NewSQL22.sp")
+    if sql_entry:
+        inputs.append(sql_entry)
+    return inputs
+
+
+def schema_fingerprint(source: Path, inventory: Dict[str, Any] | None = None) -> str:
+    """Hash the name, size and mtime of every BIN file the registry is parsed from."""
+    return fingerprint_entries(source / "BIN", _schema_inputs(source, inventory))
+
+
+def load_schema_registry(source_dir: str | None = None, *, fingerprint: str | None = None) -> Dict[str, Any] | None:
+    """Return the cached registry for ``source_dir`` if its BIN files have not changed."""
+    source = resolve_source_dir(source_dir)
+    fingerprint = fingerprint or schema_fingerprint(source)
+    cached = _REGISTRY_CACHE.get(str(source))
+    if cached and cached.get("fingerprint") == fingerprint:
+        return cached
+    if not REGISTRY_PATH.exists():
+        return None
+    try:
+        stored = json.loads(REGISTRY_PATH.read_text(encoding="utf-8"))
+    except ValueError:
+        return None
+    if stored.get("source_dir") != str(source) or stored.get("fingerprint") != fingerprint:
+        return None
+    _REGISTRY_CACHE[str(source)] = stored
+    return stored
+
+
+def _write_registry(registry: Dict[str, Any]) -> None:
+    write_json(REGISTRY_PATH, registry)
+    for table in registry["tables"]:
+        write_json(SCHEMA_ROOT / "tables" / f"{table['name'].lower()}.json", table)
+
+
 def build_schema_registry(
     source_dir: str | None = None,
     *,
     write_outputs: bool = False,
+    use_cache: bool = True,
+    inventory: Dict[str, Any] | None = None,
 ) -> Dict[str, Any]:
     source = resolve_source_dir(source_dir)
-    bin_dir = source / "BIN"
-    int_dir = bin_dir / "SQL" / "INT"
-    sql_path = bin_dir / "NewSQL22.sp"
-
-    tag_map = {path.stem.upper(): parse_tag_file(path) for path in bin_dir.glob("*.TAG")}
-    int_map = {path.stem.upper(): parse_int_file(path) for path in int_dir.glob("*.INT")} if int_dir.exists() else {}
-    sql_map = parse_sql_schema(sql_path) if sql_path.exists() else {"create_tables": {}, "shadow_tables": []}
+    inputs = _schema_inputs(source, inventory)
+    fingerprint = fingerprint_entries(source / "BIN", inputs)
+    if use_cache:
+        cached = load_schema_registry(str(source), fingerprint=fingerprint)
+        if cached is not None:
+            if write_outputs:
+                _write_registry(cached)
+            return cached
+
+    input_paths = [entry["path"] for entry in inputs]
+    tag_map = {path.stem.upper(): parse_tag_file(path) for path in input_paths if path.suffix == ".TAG"}
+    int_map = {path.stem.upper(): parse_int_file(path) for path in input_paths if path.suffix == ".INT"}
+    sql_paths = [path for path in input_paths if path.name == "NewSQL22.sp"]
+    sql_map = parse_sql_schema(sql_paths[0]) if sql_paths else {"create_tables": {}, "shadow_tables": []}
     shadow_lookup = {name.replace("Z_", "", 1): name for name in sql_map.get("shadow_tables", [])}
 
     all_tables = sorted(set(tag_map) | set(int_map) | set(sql_map.get("create_tables", {}).keys()) | set(shadow_lookup))
@@ -136,12 +193,12 @@ def build_schema_registry(
 
     registry = {
         "source_dir": str(source),
+        "fingerprint": fingerprint,
         "table_count": len(tables),
         "tables": tables,
     }
+    _REGISTRY_CACHE[str(source)] = registry
 
     if write_outputs:
-        write_json(SCHEMA_ROOT / "schema-registry.json", registry)
-        for table in tables:
-            write_json(SCHEMA_ROOT / "tables" / f"{table['name'].lower()}.json", table)
+        _write_registry(registry)
     return registry
@@ -4,5 +4,16 @@ Build construction schedules with phases and dates.
 """
 
 from .schedule_tools import build_schedule, parse_phases
+from .cpm import cpm_schedule, working_dates
+from .leveling import level_resources
+from .production import production_activities, production_schedule
 
-__all__ = ["build_schedule", "parse_phases"]
+__all__ = [
+    "build_schedule",
+    "parse_phases",
+    "cpm_schedule",
+    "working_dates",
+    "level_resources",
+    "production_activities",
+    "production_schedule",
+]
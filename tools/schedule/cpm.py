@@ -0,0 +1,249 @@
+"""
+openmud CPM Scheduling
+Critical path method over activities with durations in working days and
+finish-to-start, start-to-start, finish-to-finish and start-to-finish links
+with lags. A topological sort orders the network once, so the forward and
+backward passes are each O(activities + links).
+
+Offsets count working days from the project start: an activity with early
+start 0 and duration 3 works days 0, 1 and 2 and has early finish 3. Calendar
+dates come from mapping offsets onto the working days of a calendar that skips
+non-work weekdays and holidays.
+"""
+
+import math
+from collections import deque
+from datetime import date, datetime, timedelta
+from typing import Iterable, List, Optional
+
+LINK_TYPES = ("FS", "SS", "FF", "SF")
+DEFAULT_WORKDAYS = (0, 1, 2, 3, 4)  # Monday–Friday
+_WEEKDAY_NAMES = {"mon": 0, "tue": 1, "wed": 2, "thu": 3, "fri": 4, "sat": 5, "sun": 6}
+
+
+def _as_date(value) -> date:
+    if value is None:
+        return datetime.now().date()
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(str(value), "%Y-%m-%d").date()
+
+
+def _workday_set(workdays) -> frozenset:
+    if workdays is None:
+        return frozenset(DEFAULT_WORKDAYS)
+    days = set()
+    for day in workdays:
+        days.add(_WEEKDAY_NAMES[str(day).strip().lower()[:3]] if isinstance(day, str) else int(day) % 7)
+    if not days:
+        raise ValueError("workdays must include at least one day of the week")
+    return frozenset(days)
+
+
+def working_dates(start_date, count: int, workdays=None, holidays: Optional[Iterable] = None) -> List[date]:
+    """
+    The first ``count`` working days on or after ``start_date``.
+
+    Args:
+        start_date: ISO date string, date, or None for today
+        count: Number of working days to return
+        workdays: Weekdays worked, as 0–6 (Monday = 0) or names like "mon" (default Monday–Friday)
+        holidays: Dates (ISO strings or dates) that are never worked
+
+    Returns:
+        List of dates, one per working-day offset
+    """
+    allowed = _workday_set(workdays)
+    closed = {_as_date(day) for day in holidays or ()}
+    day = _as_date(start_date)
+    dates = []
+    one_day = timedelta(days=1)
+    while len(dates) < count:
+        if day.weekday() in allowed and day not in closed:
+            dates.append(day)
+        day += one_day
+    return dates
+
+
+def _links(activity: dict) -> list:
+    """Normalize an activity's predecessors to (id, type, lag) tuples."""
+    links = []
+    for link in activity.get("predecessors") or []:
+        if isinstance(link, dict):
+            pred = link.get("id", link.get("activity"))
+            kind = str(link.get("type", "FS")).upper()
+            lag = link.get("lag", 0)
+        else:
+            pred, kind, lag = link, "FS", 0
+        if kind not in LINK_TYPES:
+            raise ValueError(f"Unknown link type '{kind}' on activity '{activity.get('id')}'. Use {LINK_TYPES}")
+        links.append((str(pred), kind, int(math.ceil(float(lag)))))
+    return links
+
+
+def _topological_order(count: int, successors: list, indegree: list, ids: list) -> list:
+    """Kahn's algorithm; raises ValueError naming the activities caught in a dependency loop."""
+    ready = deque(i for i in range(count) if indegree[i] == 0)
+    remaining = list(indegree)
+    order = []
+    while ready:
+        i = ready.popleft()
+        order.append(i)
+        for j, _, _ in successors[i]:
+            remaining[j] -= 1
+            if remaining[j] == 0:
+                ready.append(j)
+    if len(order) < count:
+        looped = sorted(ids[i] for i in range(count) if remaining[i] > 0)
+        raise ValueError(f"Dependency loop among activities: {looped[:10]}")
+    return order
+
+
+def _network(activities: list) -> tuple:
+    """
+    Validate activities and index their links.
+
+    Returns:
+        (ids, durations, predecessors, successors, topological order); links are
+        (activity index, type, lag) tuples
+    """
+    if not activities:
+        raise ValueError("activities must contain at least one activity")
+    ids = [str(activity.get("id", "")).strip() for activity in activities]
+    index = {}
+    for i, activity_id in enumerate(ids):
+        if not activity_id:
+            raise ValueError(f"Activity {i} has no id")
+        if activity_id in index:
+            raise ValueError(f"Duplicate activity id '{activity_id}'")
+        index[activity_id] = i
+    count = len(ids)
+    durations = []
+    for activity in activities:
+        duration = float(activity.get("duration", activity.get("duration_days", 0)) or 0)
+        if duration < 0:
+            raise ValueError(f"Activity '{activity.get('id')}' has a negative duration")
+        durations.append(int(math.ceil(duration)))
+
+    predecessors = [[] for _ in range(count)]
+    successors = [[] for _ in range(count)]
+    indegree = [0] * count
+    for j, activity in enumerate(activities):
+        for pred_id, kind, lag in _links(activity):
+            i = index.get(pred_id)
+            if i is None:
+                raise ValueError(f"Activity '{ids[j]}' depends on unknown activity '{pred_id}'")
+            predecessors[j].append((i, kind, lag))
+            successors[i].append((j, kind, lag))
+            indegree[j] += 1
+    order = _topological_order(count, successors, indegree, ids)
+    return ids, durations, predecessors, successors, order
+
+
+def cpm_schedule(
+    activities: list,
+    start_date=None,
+    workdays=None,
+    holidays: Optional[Iterable] = None,
+) -> dict:
+    """
+    Forward and backward pass CPM with total/free float and the critical path.
+
+    Args:
+        activities: List of dicts: {"id", "name", "duration" (working days),
+            "predecessors": ["A", {"id": "B", "type": "SS", "lag": 2}, ...]};
+            bare ids are finish-to-start with no lag, negative lags are leads
+        start_date: Project start, ISO date string or None for today
+        workdays: Weekdays worked (default Monday–Friday)
+        holidays: Non-working dates
+
+    Returns:
+        dict with project start/finish dates, duration in working and calendar
+        days, per-activity early/late dates and working-day offsets, total and
+        free float, and the critical path in schedule order
+    """
+    ids, durations, predecessors, successors, order = _network(activities)
+    count = len(ids)
+
+    es = [0] * count
+    ef = [0] * count
+    for j in order:
+        d = durations[j]
+        start = 0
+        for i, kind, lag in predecessors[j]:
+            if kind == "FS":
+                bound = ef[i] + lag
+            elif kind == "SS":
+                bound = es[i] + lag
+            elif kind == "FF":
+                bound = ef[i] + lag - d
+            else:
+                bound = es[i] + lag - d
+            if bound > start:
+                start = bound
+        es[j] = start
+        ef[j] = start + d
+    finish = max(ef)
+
+    lf = [finish] * count
+    ls = [0] * count
+    free = [0] * count
+    for i in reversed(order):
+        d = durations[i]
+        late = finish
+        slack = finish - ef[i]
+        for j, kind, lag in successors[i]:
+            if kind == "FS":
+                bound, gap = ls[j] - lag, es[j] - lag - ef[i]
+            elif kind == "SS":
+                bound, gap = ls[j] - lag + d, es[j] - lag - es[i]
+            elif kind == "FF":
+                bound, gap = lf[j] - lag, ef[j] - lag - ef[i]
+            else:
+                bound, gap = lf[j] - lag + d, ef[j] - lag - es[i]
+            if bound < late:
+                late = bound
+            if gap < slack:
+                slack = gap
+        lf[i] = late
+        ls[i] = late - d
+        free[i] = slack
+
+    start_day = _as_date(start_date)
+    calendar = working_dates(start_day, finish + 1, workdays, holidays)
+    rows = []
+    critical_path = []
+    for i in sorted(order, key=lambda k: (es[k], ef[k])):
+        d = durations[i]
+        total_float = ls[i] - es[i]
+        critical = total_float <= 0
+        if critical:
+            critical_path.append(ids[i])
+        rows.append({
+            "id": ids[i],
+            "name": activities[i].get("name", ids[i]),
+            "duration_days": d,
+            "es": es[i],
+            "ef": ef[i],
+            "ls": ls[i],
+            "lf": lf[i],
+            "early_start": calendar[es[i]].isoformat(),
+            "early_finish": calendar[ef[i] - 1 if d else ef[i]].isoformat(),
+            "late_start": calendar[ls[i]].isoformat(),
+            "late_finish": calendar[lf[i] - 1 if d else lf[i]].isoformat(),
+            "total_float": total_float,
+            "free_float": free[i],
+            "critical": critical,
+        })
+    finish_date = calendar[finish - 1 if finish else 0]
+    return {
+        "project_start": calendar[0].isoformat(),
+        "project_finish": finish_date.isoformat(),
+        "duration_workdays": finish,
+        "duration_calendar_days": (finish_date - calendar[0]).days + 1,
+        "activity_count": count,
+        "activities": rows,
+        "critical_path": critical_path,
+    }
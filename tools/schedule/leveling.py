@@ -0,0 +1,299 @@
+"""
+openmud Resource Leveling
+Resource-constrained scheduling with a serial schedule generation scheme: a
+CPM pass ranks activities by a priority rule, then each activity, once all its
+predecessors are placed, starts on the earliest working day that satisfies its
+links and leaves every resource it uses within capacity.
+
+Each capacity-limited resource keeps its daily usage in a segment tree with
+the max and min of every span and lazy range adds. Finding the next window
+with room alternates two O(log horizon) descents, the first day with room and
+the first overloaded day after it, so saturated stretches are skipped without
+being rescanned. Histograms and the daily cost curve are built from
+difference arrays (+use at start, -use at finish) and a single prefix sum.
+"""
+
+import heapq
+from typing import Iterable, Optional
+
+from ..calculations.bid_tools import crew_day_cost
+from .cpm import _as_date, _network, cpm_schedule, working_dates
+
+PRIORITY_RULES = ("lft", "lst", "float", "est", "spt")
+
+
+def _priority_key(rule: str, row: dict) -> tuple:
+    if rule == "lft":
+        return (row["lf"], row["ls"])
+    if rule == "lst":
+        return (row["ls"], row["lf"])
+    if rule == "float":
+        return (row["total_float"], row["ls"])
+    if rule == "est":
+        return (row["es"], row["ls"])
+    return (row["duration_days"], row["ls"])
+
+
+def _day_cost(resource: str, spec) -> float:
+    """A resource unit's cost per working day: a number, a crew_day_cost result, or crew_day_cost inputs."""
+    if isinstance(spec, dict):
+        if "total_day_cost" in spec:
+            return float(spec["total_day_cost"])
+        if "labor_items" in spec or "equipment_items" in spec:
+            return crew_day_cost(
+                spec.get("labor_items") or [],
+                spec.get("equipment_items") or [],
+                spec.get("small_tools_consumables", 150),
+                spec.get("overhead_burden_pct", 25.0),
+            )["total_day_cost"]
+        raise ValueError(f"Cost for resource '{resource}' needs total_day_cost or labor_items/equipment_items")
+    return float(spec or 0)
+
+
+def _demands(activity: dict, capacities: dict) -> list:
+    """An activity's (resource, units) requirements, checked against capacity."""
+    demands = []
+    for resource, units in (activity.get("resources") or {}).items():
+        units = int(units)
+        if units <= 0:
+            continue
+        capacity = capacities.get(resource)
+        if capacity is not None and units > capacity:
+            raise ValueError(
+                f"Activity '{activity.get('id')}' needs {units} {resource} but only {capacity} are available"
+            )
+        demands.append((resource, units))
+    return demands
+
+
+class _Profile:
+    """Daily usage of one resource as a max/min segment tree with lazy range adds."""
+
+    __slots__ = ("size", "high", "low", "pending")
+
+    def __init__(self, size: int, values: Optional[list] = None):
+        values = values or []
+        n = 1
+        while n < max(size, len(values)):
+            n *= 2
+        self.size = n
+        self.high = [0] * (2 * n)
+        self.low = [0] * (2 * n)
+        self.pending = [0] * (2 * n)
+        for day, units in enumerate(values):
+            self.high[n + day] = self.low[n + day] = units
+        for node in range(n - 1, 0, -1):
+            self.high[node] = max(self.high[2 * node], self.high[2 * node + 1])
+            self.low[node] = min(self.low[2 * node], self.low[2 * node + 1])
+
+    def _apply(self, node: int, units: int) -> None:
+        self.high[node] += units
+        self.low[node] += units
+        self.pending[node] += units
+
+    def _push(self, node: int) -> None:
+        units = self.pending[node]
+        if units:
+            self._apply(2 * node, units)
+            self._apply(2 * node + 1, units)
+            self.pending[node] = 0
+
+    def _add(self, node: int, lo: int, hi: int, start: int, stop: int, units: int) -> None:
+        if stop <= lo or hi <= start:
+            return
+        if start <= lo and hi <= stop:
+            self._apply(node, units)
+            return
+        self._push(node)
+        mid = (lo + hi) // 2
+        self._add(2 * node, lo, mid, start, stop, units)
+        self._add(2 * node + 1, mid, hi, start, stop, units)
+        self.high[node] = max(self.high[2 * node], self.high[2 * node + 1])
+        self.low[node] = min(self.low[2 * node], self.low[2 * node + 1])
+
+    def _first(self, node: int, lo: int, hi: int, start: int, limit: int, over: bool) -> int:
+        """First day at or after ``start`` whose usage is over ``limit`` (or within it), else -1."""
+        if hi <= start or (self.high[node] <= limit if over else self.low[node] > limit):
+            return -1
+        if hi - lo == 1:
+            return lo
+        self._push(node)
+        mid = (lo + hi) // 2
+        found = self._first(2 * node, lo, mid, start, limit, over)
+        return found if found >= 0 else self._first(2 * node + 1, mid, hi, start, limit, over)
+
+    def values(self) -> list:
+        for node in range(1, self.size):
+            self._push(node)
+        return self.high[self.size:]
+
+    def add(self, start: int, stop: int, units: int) -> "_Profile":
+        """Use ``units`` on days [start, stop); returns the profile, regrown if the window runs past it."""
+        profile = self if stop <= self.size else _Profile(2 * stop, self.values())
+        profile._add(1, 0, profile.size, start, stop, units)
+        return profile
+
+    def fit(self, start: int, duration: int, limit: int) -> int:
+        """Earliest start at or after ``start`` whose ``duration`` days all have usage within ``limit``."""
+        while start < self.size:
+            room = self._first(1, 0, self.size, start, limit, False)
+            if room < 0:
+                return self.size  # days past the profile are unused
+            start = room
+            conflict = self._first(1, 0, self.size, start, limit, True)
+            if conflict < 0 or conflict >= start + duration:
+                return start
+            start = conflict + 1
+        return start
+
+
+def level_resources(
+    activities: list,
+    capacities: dict,
+    start_date=None,
+    workdays=None,
+    holidays: Optional[Iterable] = None,
+    priority: str = "lft",
+    resource_costs: Optional[dict] = None,
+) -> dict:
+    """
+    Resource-leveled schedule via a priority-rule serial schedule generation scheme.
+
+    Args:
+        activities: CPM activities (see cpm_schedule) with optional "resources":
+            {"excavator_crew": 1, "paving_crew": 1} units used on every working day
+        capacities: Units available per resource, e.g. {"excavator_crew": 2, "paving_crew": 1};
+            resources not listed are tracked in the histograms but never limit the schedule
+        start_date: Project start, ISO date string or None for today
+        workdays: Weekdays worked (default Monday–Friday)
+        holidays: Non-working dates
+        priority: Rule ranking eligible activities: "lft" (latest finish, default), "lst"
+            (latest start), "float" (total float), "est" (early start), "spt" (shortest first)
+        resource_costs: Day cost per unit of each resource: a number, a crew_day_cost result,
+            or {"labor_items", "equipment_items", ...} inputs for crew_day_cost
+
+    Returns:
+        dict with leveled and unleveled durations, per-activity leveled dates and delay
+        against the CPM early start, daily resource histograms with capacity and peak,
+        and daily and cumulative cost curves with one entry per working day
+    """
+    rule = str(priority).lower()
+    if rule not in PRIORITY_RULES:
+        raise ValueError(f"Unknown priority rule '{priority}'. Use {PRIORITY_RULES}")
+    capacities = {resource: int(units) for resource, units in (capacities or {}).items()}
+    ids, durations, predecessors, successors, _ = _network(activities)
+    count = len(ids)
+    demands = [_demands(activity, capacities) for activity in activities]
+    cpm = cpm_schedule(activities, start_date=start_date, workdays=workdays, holidays=holidays)
+    rows = {row["id"]: row for row in cpm["activities"]}
+    keys = [_priority_key(rule, rows[activity_id]) + (i,) for i, activity_id in enumerate(ids)]
+
+    resources = sorted(set(capacities) | {resource for needs in demands for resource, _ in needs})
+    horizon = 2 * cpm["duration_workdays"] + 1
+    profiles = {resource: _Profile(horizon) for resource in capacities}
+    waiting = [len(links) for links in predecessors]
+    eligible = [keys[i] for i in range(count) if not waiting[i]]
+    heapq.heapify(eligible)
+    starts = [0] * count
+    finishes = [0] * count
+    while eligible:
+        j = heapq.heappop(eligible)[-1]
+        d = durations[j]
+        start = 0
+        for i, kind, lag in predecessors[j]:
+            if kind == "FS":
+                bound = finishes[i] + lag
+            elif kind == "SS":
+                bound = starts[i] + lag
+            elif kind == "FF":
+                bound = finishes[i] + lag - d
+            else:
+                bound = starts[i] + lag - d
+            if bound > start:
+                start = bound
+        limited = [(resource, units) for resource, units in demands[j] if resource in profiles] if d else []
+        if limited:
+            settled = False
+            while not settled:
+                settled = True
+                for resource, units in limited:
+                    fit = profiles[resource].fit(start, d, capacities[resource] - units)
+                    if fit != start:
+                        start, settled = fit, False
+            for resource, units in limited:
+                profiles[resource] = profiles[resource].add(start, start + d, units)
+        starts[j] = start
+        finishes[j] = start + d
+        for k, _, _ in successors[j]:
+            waiting[k] -= 1
+            if not waiting[k]:
+                heapq.heappush(eligible, keys[k])
+    finish = max(finishes)
+
+    costs = {resource: _day_cost(resource, spec) for resource, spec in (resource_costs or {}).items()}
+    usage = {resource: [0] * (finish + 1) for resource in resources}
+    spend = [0.0] * (finish + 1)
+    for j in range(count):
+        if not durations[j]:
+            continue
+        for resource, units in demands[j]:
+            usage[resource][starts[j]] += units
+            usage[resource][finishes[j]] -= units
+            cost = units * costs.get(resource, 0.0)
+            spend[starts[j]] += cost
+            spend[finishes[j]] -= cost
+
+    histograms = {}
+    for resource in resources:
+        level, daily = 0, []
+        for change in usage[resource][:finish]:
+            level += change
+            daily.append(level)
+        histograms[resource] = {
+            "capacity": capacities.get(resource),
+            "daily_units": daily,
+            "peak": max(daily, default=0),
+            "unit_days": sum(daily),
+        }
+    daily_cost, cumulative_cost = [], []
+    rate = total = 0.0
+    for change in spend[:finish]:
+        rate += change
+        total += rate
+        daily_cost.append(round(rate, 2))
+        cumulative_cost.append(round(total, 2))
+
+    calendar = working_dates(_as_date(start_date), finish + 1, workdays, holidays)
+    leveled = []
+    for j in sorted(range(count), key=lambda k: (starts[k], finishes[k])):
+        d = durations[j]
+        early = rows[ids[j]]["es"]
+        leveled.append({
+            "id": ids[j],
+            "name": activities[j].get("name", ids[j]),
+            "duration_days": d,
+            "start": starts[j],
+            "finish": finishes[j],
+            "start_date": calendar[starts[j]].isoformat(),
+            "finish_date": calendar[finishes[j] - 1 if d else finishes[j]].isoformat(),
+            "early_start": early,
+            "delay_days": starts[j] - early,
+            "resources": dict(demands[j]),
+        })
+    finish_date = calendar[finish - 1 if finish else 0]
+    return {
+        "project_start": calendar[0].isoformat(),
+        "project_finish": finish_date.isoformat(),
+        "duration_workdays": finish,
+        "duration_calendar_days": (finish_date - calendar[0]).days + 1,
+        "unleveled_duration_workdays": cpm["duration_workdays"],
+        "priority_rule": rule,
+        "activity_count": count,
+        "activities": leveled,
+        "dates": [day.isoformat() for day in calendar[:finish]],
+        "histograms": histograms,
+        "resource_day_costs": {resource: round(cost, 2) for resource, cost in costs.items()},
+        "daily_cost": daily_cost,
+        "cumulative_cost": cumulative_cost,
+        "total_cost": cumulative_cost[-1] if cumulative_cost else 0.0,
+    }
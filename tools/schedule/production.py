@@ -0,0 +1,147 @@
+"""
+openmud Production Scheduling
+Activity durations from historical production: each bid item's quantity is
+matched to HeavyBid units-per-manhour benchmarks, turned into a daily rate for
+its crew, and priced with production_rate before the activities go through CPM.
+"""
+
+import math
+from typing import List, Optional
+
+from ..calculations.bid_tools import production_rate
+from ..estimating.estimating_tools import get_crew_cost, get_production_benchmarks
+from .schedule_tools import build_schedule
+
+DEFAULT_CREW_SIZE = 4
+DEFAULT_HOURS_PER_DAY = 10
+
+
+def production_activities(
+    bid_items: List[dict],
+    crew_size: int = DEFAULT_CREW_SIZE,
+    crew_rate_per_hr: float = 0,
+    hours_per_day: float = DEFAULT_HOURS_PER_DAY,
+    sequential: bool = True,
+) -> dict:
+    """
+    Turn bid items into CPM activities with production-driven durations.
+
+    All benchmark lookups run as one batched pass over the bid history.
+
+    Args:
+        bid_items: List of dicts: {"id", "description", "quantity", "unit"} plus optional
+            "units_per_manhour" (skips the history lookup), "crew_code" (sizes and prices the
+            crew via get_crew_cost), "crew_size", "crew_rate_per_hr", "equipment_cost_per_day",
+            "duration" (used when no benchmark matches) and "predecessors"
+        crew_size: Default workers per crew
+        crew_rate_per_hr: Default all-in hourly rate per worker (0 for durations only)
+        hours_per_day: Working hours per day
+        sequential: Link items without predecessors finish-to-start to the previous item
+
+    Returns:
+        dict with activities ready for cpm_schedule, a production row per item
+        (benchmark, daily rate, duration, cost), unmatched item ids and total direct cost
+    """
+    if not bid_items:
+        raise ValueError("bid_items must contain at least one item")
+    lookups = [i for i, item in enumerate(bid_items) if not item.get("units_per_manhour")]
+    benchmarks = dict(zip(lookups, get_production_benchmarks([
+        {"description": bid_items[i].get("description", ""), "unit": bid_items[i].get("unit", "")} for i in lookups
+    ])))
+
+    activities, production, unmatched = [], [], []
+    total_cost = 0.0
+    previous = None
+    for i, item in enumerate(bid_items):
+        activity_id = str(item.get("id") or item.get("item_code") or i + 1)
+        quantity = float(item.get("quantity", 0) or 0)
+        if item.get("units_per_manhour"):
+            units_per_manhour, source = float(item["units_per_manhour"]), "given"
+        else:
+            units_per_manhour, source = benchmarks[i].get("average_units_per_manhour", 0), "bid_history"
+        size = item.get("crew_size", crew_size)
+        rate = item.get("crew_rate_per_hr", crew_rate_per_hr)
+        equipment = item.get("equipment_cost_per_day", 0)
+        if item.get("crew_code"):
+            crew = get_crew_cost(item["crew_code"], hours_per_day=hours_per_day)
+            if "error" not in crew and crew["crew_size"]:
+                size, rate = crew["crew_size"], crew["avg_labor_rate_per_hr"]
+                equipment = crew["equipment_daily"]
+
+        row = {"id": activity_id, "description": item.get("description", ""), "quantity": quantity,
+               "unit": item.get("unit", ""), "units_per_manhour": units_per_manhour, "source": source}
+        if units_per_manhour > 0 and quantity > 0:
+            per_day = units_per_manhour * size * hours_per_day
+            priced = production_rate(per_day, quantity, size, rate, hours_per_day, equipment, item.get("unit", "LF"))
+            duration = max(1, math.ceil(quantity / per_day - 1e-9))
+            total_cost += priced["total_direct_cost"]
+            row.update({
+                "crew_size": size,
+                "production_rate_per_day": round(per_day, 2),
+                "duration_days": duration,
+                "cost_per_unit": priced["cost_per_unit"],
+                "total_direct_cost": priced["total_direct_cost"],
+            })
+        else:
+            duration = max(0, math.ceil(float(item.get("duration", 1) or 0)))
+            unmatched.append(activity_id)
+            row.update({"crew_size": size, "production_rate_per_day": 0, "duration_days": duration,
+                        "cost_per_unit": 0, "total_direct_cost": 0})
+        production.append(row)
+
+        predecessors = item.get("predecessors")
+        if predecessors is None:
+            predecessors = [previous] if sequential and previous is not None else []
+        activities.append({
+            "id": activity_id,
+            "name": item.get("description") or activity_id,
+            "duration": duration,
+            "predecessors": predecessors,
+        })
+        previous = activity_id
+
+    return {
+        "activities": activities,
+        "production": production,
+        "unmatched": unmatched,
+        "total_direct_cost": round(total_cost, 2),
+    }
+
+
+def production_schedule(
+    project_name: str,
+    bid_items: List[dict],
+    start_date: Optional[str] = None,
+    workdays: Optional[list] = None,
+    holidays: Optional[list] = None,
+    **options,
+) -> dict:
+    """
+    Build a CPM schedule whose durations come from bid-history production rates.
+
+    Args:
+        project_name: Name of the project
+        bid_items: Bid items as for production_activities
+        start_date: ISO date string (YYYY-MM-DD) or None for today
+        workdays: Weekdays worked (default Monday–Friday)
+        holidays: ISO dates never worked
+        **options: crew_size, crew_rate_per_hr, hours_per_day, sequential (see production_activities)
+
+    Returns:
+        build_schedule result plus production rows, unmatched item ids and total direct cost
+    """
+    derived = production_activities(bid_items, **options)
+    result = build_schedule(
+        project_name,
+        0,
+        start_date,
+        activities=derived["activities"],
+        workdays=workdays,
+        holidays=holidays,
+    )
+    result.update({
+        "production": derived["production"],
+        "unmatched": derived["unmatched"],
+        "total_direct_cost": derived["total_direct_cost"],
+    })
+    return result
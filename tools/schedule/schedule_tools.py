@@ -6,6 +6,9 @@ Build construction schedules with phases and dates.
 from datetime import datetime, timedelta
 from typing import List, Optional
 
+from .cpm import cpm_schedule
+from .leveling import level_resources
+
 
 def parse_phases(phases_str: str) -> List[str]:
     """Parse comma-separated phase string into list."""
@@ -19,19 +22,41 @@ def build_schedule(
     duration_days: int,
     start_date: Optional[str] = None,
     phases: Optional[List[str]] = None,
+    activities: Optional[List[dict]] = None,
+    workdays: Optional[list] = None,
+    holidays: Optional[list] = None,
+    capacities: Optional[dict] = None,
+    priority: str = "lft",
+    resource_costs: Optional[dict] = None,
 ) -> dict:
     """
     Build a construction schedule with phases and dates.
 
     Args:
         project_name: Name of the project
-        duration_days: Total duration in days
+        duration_days: Total duration in days (ignored when activities are given)
         start_date: ISO date string (YYYY-MM-DD) or None for today
         phases: List of phase names or None for default
+        activities: Optional CPM network (see cpm_schedule); schedules the
+            activities on a working calendar instead of splitting duration_days evenly
+        workdays: Weekdays worked for activities (default Monday–Friday)
+        holidays: ISO dates never worked for activities
+        capacities: Units available per resource, e.g. {"excavator_crew": 2}; with activities
+            that carry "resources", levels the schedule (see level_resources)
+        priority: Leveling priority rule ("lft", "lst", "float", "est", "spt")
+        resource_costs: Day cost per resource unit for the leveled cost curve
 
     Returns:
-        dict with project_name, duration, phases (list of {phase, start, end, days}), and table_html
+        dict with project_name, duration, phases (list of {phase, start, end, days}), and table_html.
+        With activities, duration is calendar days and the dict also carries the CPM result,
+        or the leveling result (histograms, cost curves) when capacities are given.
     """
+    if activities and capacities:
+        return _build_leveled_schedule(
+            project_name, start_date, activities, workdays, holidays, capacities, priority, resource_costs
+        )
+    if activities:
+        return _build_cpm_schedule(project_name, start_date, activities, workdays, holidays)
     phases = phases or parse_phases("")
     start = datetime.strptime(start_date, "%Y-%m-%d") if start_date else datetime.now()
     duration_days = max(1, int(duration_days))
@@ -56,24 +81,83 @@ def build_schedule(
         )
         d = end + timedelta(days=1)
 
-    # Build table HTML
+    return {
+        "project_name": project_name,
+        "duration": duration_days,
+        "phases": rows,
+        "table_html": _table_html(rows),
+    }
+
+
+def _table_html(rows: List[dict], extra: Optional[tuple] = None) -> str:
+    """Phase table; ``extra`` is an optional (header, row key) column after Days."""
+    cell = '<td style="padding:10px;border-bottom:1px solid #ddd;">'
     table = (
         '<table style="width:100%;border-collapse:collapse;">'
         '<tr style="background:#f0f0f0;"><th style="padding:10px;text-align:left;">Phase</th>'
-        "<th>Start</th><th>End</th><th>Days</th></tr>"
+        "<th>Start</th><th>End</th><th>Days</th>" + (f"<th>{extra[0]}</th>" if extra else "") + "</tr>"
     )
     for r in rows:
+        phase = f"<strong>{r['phase']}</strong>" if r.get("critical") else r["phase"]
         table += (
-            f'<tr><td style="padding:10px;border-bottom:1px solid #ddd;">{r["phase"]}</td>'
-            f'<td style="padding:10px;border-bottom:1px solid #ddd;">{r["start"]}</td>'
-            f'<td style="padding:10px;border-bottom:1px solid #ddd;">{r["end"]}</td>'
-            f'<td style="padding:10px;border-bottom:1px solid #ddd;">{r["days"]}</td></tr>'
+            f"<tr>{cell}{phase}</td>"
+            f'{cell}{r["start"]}</td>'
+            f'{cell}{r["end"]}</td>'
+            f'{cell}{r["days"]}</td>'
+            + (f"{cell}{r[extra[1]]}</td>" if extra else "")
+            + "</tr>"
         )
-    table += "</table>"
+    return table + "</table>"
+
 
+def _build_cpm_schedule(project_name: str, start_date, activities: list, workdays, holidays) -> dict:
+    cpm = cpm_schedule(activities, start_date=start_date, workdays=workdays, holidays=holidays)
+    rows = [
+        {
+            "phase": activity["name"],
+            "start": datetime.strptime(activity["early_start"], "%Y-%m-%d").strftime("%m/%d/%Y"),
+            "end": datetime.strptime(activity["early_finish"], "%Y-%m-%d").strftime("%m/%d/%Y"),
+            "days": activity["duration_days"],
+            "total_float": activity["total_float"],
+            "critical": activity["critical"],
+        }
+        for activity in cpm["activities"]
+    ]
     return {
         "project_name": project_name,
-        "duration": duration_days,
+        "duration": cpm["duration_calendar_days"],
+        "phases": rows,
+        "table_html": _table_html(rows, ("Float", "total_float")),
+        "cpm": cpm,
+    }
+
+
+def _build_leveled_schedule(
+    project_name: str, start_date, activities: list, workdays, holidays, capacities, priority, resource_costs
+) -> dict:
+    leveled = level_resources(
+        activities,
+        capacities,
+        start_date=start_date,
+        workdays=workdays,
+        holidays=holidays,
+        priority=priority,
+        resource_costs=resource_costs,
+    )
+    rows = [
+        {
+            "phase": activity["name"],
+            "start": datetime.strptime(activity["start_date"], "%Y-%m-%d").strftime("%m/%d/%Y"),
+            "end": datetime.strptime(activity["finish_date"], "%Y-%m-%d").strftime("%m/%d/%Y"),
+            "days": activity["duration_days"],
+            "delay_days": activity["delay_days"],
+        }
+        for activity in leveled["activities"]
+    ]
+    return {
+        "project_name": project_name,
+        "duration": leveled["duration_calendar_days"],
         "phases": rows,
-        "table_html": table,
+        "table_html": _table_html(rows, ("Delay", "delay_days")),
+        "leveling": leveled,
     }